@@ -0,0 +1,92 @@
+# benchmarks\bench_exception_middleware.py
+"""
+Compara requests/segundo de GlobalExceptionMiddleware (ASGI puro) frente a la
+versión anterior basada en BaseHTTPMiddleware.
+
+Uso:
+    python benchmarks/bench_exception_middleware.py [--requests 5000] [--concurrency 50]
+
+Las peticiones van en proceso (httpx.ASGITransport), así que se mide solo el
+coste del stack ASGI, sin red ni servidor.
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from exponential_core.exceptions import handler
+from exponential_core.exceptions.middleware import (
+    EXCEPTION_HANDLERS,
+    GlobalExceptionMiddleware,
+)
+from exponential_core.exceptions.types import InvoiceParsingError
+
+
+class LegacyGlobalExceptionMiddleware(BaseHTTPMiddleware):
+    """Implementación previa, con la cadena de isinstance."""
+
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            for exc_type, exc_handler in EXCEPTION_HANDLERS:
+                if isinstance(exc, exc_type):
+                    return await exc_handler(request, exc)
+            return await handler.general_exception_handler(request, exc)
+
+
+def build_app(middleware_cls) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_cls)
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/error")
+    async def error():
+        raise InvoiceParsingError("No se pudo extraer el NIT")
+
+    return app
+
+
+async def run(app: FastAPI, path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                await client.get(path)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Los handlers loguean cada error; se silencian para medir solo el middleware
+    logging.getLogger("app").disabled = True
+
+    for path in ("/ok", "/error"):
+        for label, cls in (
+            ("BaseHTTPMiddleware", LegacyGlobalExceptionMiddleware),
+            ("ASGI puro", GlobalExceptionMiddleware),
+        ):
+            app = build_app(cls)
+            asyncio.run(run(app, path, 200, args.concurrency))  # calentamiento
+            rps = asyncio.run(run(app, path, args.requests, args.concurrency))
+            print(f"{path:<8} {label:<20} {rps:>10,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks\bench_money.py
+"""
+Compara la coerción de importes de TotalsSchema/VATEntrySchema con los tipos
+Money/Percent frente a la versión anterior (Decimal + before-validator
+_to_decimal por campo + redondeo _q2 en el model-validator). Ambos modelos
+tienen los mismos campos y solo hacen la coerción y el redondeo.
+
+Uso:
+    python benchmarks/bench_money.py [--rows 20000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+
+from exponential_core.utils.money import Money, Percent
+
+_DEC_Q = Decimal("0.01")
+
+
+def _legacy_to_decimal(value):
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, str):
+        return Decimal(value.strip().replace(",", "."))
+    return value
+
+
+def _q2(x: Decimal) -> Decimal:
+    return x.quantize(_DEC_Q, rounding=ROUND_HALF_UP)
+
+
+class LegacyVATEntry(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    percent: Decimal
+    taxable_base: Decimal
+    amount: Decimal
+
+    @field_validator("percent", "taxable_base", "amount", mode="before")
+    @classmethod
+    def _decimals(cls, v):
+        return _legacy_to_decimal(v)
+
+
+class LegacyTotals(BaseModel):
+    """Solo la parte de coerción y redondeo del TotalsSchema anterior."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    taxable_base: Decimal
+    vat_percent: Decimal
+    vat_amount: Decimal
+    grand_total: Decimal
+    vat_breakdown: List[LegacyVATEntry]
+
+    @field_validator("taxable_base", "vat_percent", "vat_amount", "grand_total", mode="before")
+    @classmethod
+    def _decimals(cls, v):
+        return _legacy_to_decimal(v)
+
+    @model_validator(mode="after")
+    def _round(self):
+        for f in ("taxable_base", "vat_percent", "vat_amount", "grand_total"):
+            object.__setattr__(self, f, _q2(getattr(self, f)))
+        for v in self.vat_breakdown:
+            v.percent = _q2(v.percent)
+            v.taxable_base = _q2(v.taxable_base)
+            v.amount = _q2(v.amount)
+        return self
+
+
+class MoneyVATEntry(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    percent: Percent
+    taxable_base: Money
+    amount: Money
+
+
+class MoneyTotals(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    taxable_base: Money
+    vat_percent: Percent
+    vat_amount: Money
+    grand_total: Money
+    vat_breakdown: List[MoneyVATEntry]
+
+
+def make_rows(n: int, seed: int = 7) -> List[dict]:
+    rnd = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        entries = []
+        for percent in rnd.sample([21, 10, 4, 0], rnd.randint(1, 3)):
+            base = round(rnd.uniform(1, 5000), 2)
+            entries.append(
+                {"percent": percent, "taxable_base": str(base), "amount": round(base * percent / 100, 2)}
+            )
+        base = sum(Decimal(str(e["taxable_base"])) for e in entries)
+        vat = sum(Decimal(str(e["amount"])) for e in entries)
+        rows.append(
+            {
+                "taxable_base": str(base),
+                "vat_percent": 21.0,
+                "vat_amount": float(vat),
+                "grand_total": str(base + vat),
+                "vat_breakdown": entries,
+            }
+        )
+    return rows
+
+
+def bench(model, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            model.model_validate(row)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    for label, model in (("_to_decimal + _q2", LegacyTotals), ("Money/Percent", MoneyTotals)):
+        elapsed = bench(model, rows, args.repeat)
+        print(f"{label:<20} {elapsed * 1000:>9.1f} ms  ({args.rows / elapsed:>10,.0f} totales/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,18 @@ from exponential_core.claudeai.schemas import (
     TotalsSchema,
     SecondaryTotalSchema,
     InvoiceExtractionSchema,
+    Discrepancy,
+    ValidationReport,
+    build_validation_report,
+    LineItemBatch,
+    validate_line_items_batch,
+    validate_invoice_extraction_batch,
+    InvoiceExtractionStream,
+    stream_invoice_items,
+    FieldChange,
+    Repair,
+    ReconciliationResult,
+    reconcile_invoice,
     AddressSchema,
     ContactSchema,
     PartySchema,
@@ -64,6 +76,18 @@ __all__ = [
     "TotalsSchema",
     "SecondaryTotalSchema",
     "InvoiceExtractionSchema",
+    "Discrepancy",
+    "ValidationReport",
+    "build_validation_report",
+    "LineItemBatch",
+    "validate_line_items_batch",
+    "validate_invoice_extraction_batch",
+    "InvoiceExtractionStream",
+    "stream_invoice_items",
+    "FieldChange",
+    "Repair",
+    "ReconciliationResult",
+    "reconcile_invoice",
     "AddressSchema",
     "ContactSchema",
     "PartySchema",
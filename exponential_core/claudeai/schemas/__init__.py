@@ -11,6 +11,21 @@ from .invoice_line_items import (
     TotalsSchema,
     SecondaryTotalSchema,
     InvoiceExtractionSchema,
+    Discrepancy,
+    ValidationReport,
+    build_validation_report,
+)
+from .invoice_line_items_batch import (
+    LineItemBatch,
+    validate_line_items_batch,
+    validate_invoice_extraction_batch,
+)
+from .invoice_line_items_stream import InvoiceExtractionStream, stream_invoice_items
+from .invoice_reconciliation import (
+    FieldChange,
+    Repair,
+    ReconciliationResult,
+    reconcile_invoice,
 )
 from .invoice_data import (
     AddressSchema,
@@ -53,6 +68,18 @@ __all__ = [
     "TotalsSchema",
     "SecondaryTotalSchema",
     "InvoiceExtractionSchema",
+    "Discrepancy",
+    "ValidationReport",
+    "build_validation_report",
+    "LineItemBatch",
+    "validate_line_items_batch",
+    "validate_invoice_extraction_batch",
+    "InvoiceExtractionStream",
+    "stream_invoice_items",
+    "FieldChange",
+    "Repair",
+    "ReconciliationResult",
+    "reconcile_invoice",
     "AddressSchema",
     "ContactSchema",
     "PartySchema",
@@ -2,6 +2,8 @@ from decimal import Decimal
 from typing import List, Optional
 from pydantic import BaseModel, field_validator
 
+from exponential_core.utils.money import parse_decimal
+
 
 class CompanySchema(BaseModel):
     name: str
@@ -34,7 +36,7 @@ def _to_decimal(value):
     """
     Coerce int/float/str -> Decimal safely.
     - Floats are wrapped via str() to avoid binary artifacts.
-    - Strings like '7,50' are normalized to '7.50'.
+    - Strings like '7,50' or '1.234,56' are parsed with utils.money.parse_decimal.
     """
     if value is None:
         return None
@@ -43,8 +45,7 @@ def _to_decimal(value):
     if isinstance(value, (int, float)):
         return Decimal(str(value))
     if isinstance(value, str):
-        v = value.strip().replace(",", ".")
-        return Decimal(v)
+        return parse_decimal(value)
     return value
 
 
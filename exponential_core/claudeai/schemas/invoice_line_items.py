@@ -11,10 +11,10 @@ from __future__ import annotations
 
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from exponential_core.claudeai.enums.tax_ids import CurrencyEnum
-from exponential_core.claudeai.schemas.extractor_tax_id import _to_decimal
+from exponential_core.utils.money import DecimalValue, Money, Percent
 
 
 _DEC_Q = Decimal("0.01")
@@ -27,6 +27,69 @@ def _q2(x: Decimal) -> Decimal:
     return x.quantize(_DEC_Q, rounding=ROUND_HALF_UP)
 
 
+def _expected_vat(base: Decimal, percent: Decimal) -> Decimal:
+    """Cuota de IVA esperada para una base y un porcentaje"""
+    return _q2(base * (percent / Decimal("100")))
+
+
+class Discrepancy(BaseModel):
+    """
+    Discrepancia aritmética detectada al validar una factura.
+
+    - path: ruta del campo con el valor inconsistente (ej: "items[3].vat_amount")
+    - expected: valor que cuadraría con el resto del documento
+    - actual: valor extraído
+    - delta: actual - expected (con signo)
+    - tolerance: tolerancia superada (_TOL o _TOL_TOTALS)
+    - message: el texto que se añade a `notes`
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    code: str = Field(..., description="Tipo de comprobación (ej: 'line_vat_amount')")
+    path: str
+    expected: Decimal
+    actual: Decimal
+    delta: Decimal
+    tolerance: Decimal
+    message: str
+
+
+class ValidationReport(BaseModel):
+    """
+    Resultado estructurado de las comprobaciones de una factura, para no tener
+    que volver a parsear `notes` ni revalidar el documento.
+    """
+
+    discrepancies: List[Discrepancy] = Field(default_factory=list)
+
+    @property
+    def is_consistent(self) -> bool:
+        return not self.discrepancies
+
+    def for_path(self, prefix: str) -> List[Discrepancy]:
+        """Discrepancias cuyo path empieza por `prefix` (ej: "totals.", "items[0].")"""
+        return [d for d in self.discrepancies if d.path.startswith(prefix)]
+
+
+def _line_vat_discrepancy(expected, vat_amount, path: str = "vat_amount") -> Optional[Discrepancy]:
+    diff = abs(vat_amount - expected)
+    if diff <= _TOL:
+        return None
+    return Discrepancy(
+        code="line_vat_amount",
+        path=path,
+        expected=expected,
+        actual=vat_amount,
+        delta=vat_amount - expected,
+        tolerance=_TOL,
+        message=(
+            f"IVA línea difiere de esperado: provisto={vat_amount} "
+            f"esperado={expected} (Δ={_q2(diff)})."
+        ),
+    )
+
+
 class LineItemSchema(BaseModel):
     """
     Representa un ítem/línea de factura.
@@ -46,27 +109,27 @@ class LineItemSchema(BaseModel):
     description: str
 
     # Cantidades y precios
-    quantity: Decimal = Field(..., description="Puede ser negativo para devoluciones")
+    quantity: DecimalValue = Field(..., description="Puede ser negativo para devoluciones")
     unit: Optional[str] = None
-    unit_price: Decimal = Field(..., description="Precio unitario (siempre positivo)")
+    unit_price: DecimalValue = Field(..., description="Precio unitario (siempre positivo)")
 
     # Descuentos por línea
-    discount_percent: Optional[Decimal] = None
-    discount_amount: Optional[Decimal] = None
+    discount_percent: Optional[DecimalValue] = None
+    discount_amount: Optional[DecimalValue] = None
 
     # Importes calculados
-    net_price: Optional[Decimal] = Field(
+    net_price: Optional[DecimalValue] = Field(
         None, description="Precio neto por unidad post-descuento (opcional)"
     )
-    line_total: Decimal = Field(
+    line_total: DecimalValue = Field(
         ..., description="Base imponible de la línea (pre-IVA). Negativo para créditos."
     )
 
     # IVA por línea (OBLIGATORIO - nunca null)
-    vat_percent: Decimal = Field(
+    vat_percent: DecimalValue = Field(
         ..., description="Porcentaje de IVA. 0.0 si exento, NUNCA null"
     )
-    vat_amount: Decimal = Field(
+    vat_amount: DecimalValue = Field(
         ...,
         description="Monto de IVA de la línea. 0.0 si exento, NUNCA null. Negativo para créditos.",
     )
@@ -82,25 +145,9 @@ class LineItemSchema(BaseModel):
     # Metadatos opcionales
     measurements: Optional[str] = None
     color: Optional[str] = None
-    weight_kg: Optional[Decimal] = None
+    weight_kg: Optional[DecimalValue] = None
     notes: Optional[str] = None
 
-    @field_validator(
-        "quantity",
-        "unit_price",
-        "discount_percent",
-        "discount_amount",
-        "net_price",
-        "line_total",
-        "vat_percent",
-        "vat_amount",
-        "weight_kg",
-        mode="before",
-    )
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
-
     @model_validator(mode="after")
     def _validate_line_item(self):
         """
@@ -113,33 +160,47 @@ class LineItemSchema(BaseModel):
         if self.vat_percent is None:
             object.__setattr__(self, "vat_percent", Decimal("0"))
 
-        # Calcular vat_amount esperado
-        try:
-            # Usar abs() solo para el cálculo, preservar signo de line_total
-            expected = _q2(self.line_total * (self.vat_percent / Decimal("100")))
-        except Exception:
-            return self
+        vat_amount, net_price, notes = _check_line_item(
+            self.quantity, self.line_total, self.vat_percent, self.vat_amount,
+            self.net_price, self.notes,
+        )
+        object.__setattr__(self, "vat_amount", vat_amount)
+        object.__setattr__(self, "net_price", net_price)
+        object.__setattr__(self, "notes", notes)
+        return self
 
-        if self.vat_amount is None:
-            object.__setattr__(self, "vat_amount", expected)
-        else:
-            diff = abs(self.vat_amount - expected)
-            if diff > _TOL:
-                note = (
-                    f"IVA línea difiere de esperado: provisto={self.vat_amount} "
-                    f"esperado={expected} (Δ={_q2(diff)})."
-                )
-                if self.notes:
-                    object.__setattr__(self, "notes", f"{self.notes} | {note}")
-                else:
-                    object.__setattr__(self, "notes", note)
 
-        # Calcular net_price si no existe
-        if self.net_price is None and self.quantity != 0:
-            calculated_net = _q2(self.line_total / self.quantity)
-            object.__setattr__(self, "net_price", calculated_net)
+def _check_line_item(quantity, line_total, vat_percent, vat_amount, net_price, notes):
+    """
+    Reglas de LineItemSchema._validate_line_item, compartidas con la validación
+    por lotes (invoice_line_items_batch):
+        1. Calcula vat_amount si viene vacío
+        2. Anota si difiere del esperado en más de _TOL
+        3. Calcula net_price si falta
+
+    Returns:
+        tuple: (vat_amount, net_price, notes)
+    """
+    # Calcular vat_amount esperado
+    try:
+        # Usar abs() solo para el cálculo, preservar signo de line_total
+        expected = _expected_vat(line_total, vat_percent)
+    except Exception:
+        return vat_amount, net_price, notes
 
-        return self
+    if vat_amount is None:
+        vat_amount = expected
+    else:
+        discrepancy = _line_vat_discrepancy(expected, vat_amount)
+        if discrepancy is not None:
+            note = discrepancy.message
+            notes = f"{notes} | {note}" if notes else note
+
+    # Calcular net_price si no existe
+    if net_price is None and quantity != 0:
+        net_price = _q2(line_total / quantity)
+
+    return vat_amount, net_price, notes
 
 
 class VATEntrySchema(BaseModel):
@@ -152,32 +213,36 @@ class VATEntrySchema(BaseModel):
 
     model_config = ConfigDict(extra="ignore")
 
-    percent: Decimal = Field(..., description="Porcentaje de IVA (ej: 21.0)")
-    taxable_base: Decimal = Field(
+    percent: Percent = Field(..., description="Porcentaje de IVA (ej: 21.0)")
+    taxable_base: Money = Field(
         ...,
         description="Base imponible para esta tasa. OBLIGATORIO. Puede ser negativo.",
     )
-    amount: Decimal = Field(
+    amount: Money = Field(
         ..., description="Cuota de IVA para esta tasa. Puede ser negativo."
     )
 
-    @field_validator("percent", "taxable_base", "amount", mode="before")
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
-
-    @model_validator(mode="after")
-    def _validate_vat_entry(self):
-        """Valida coherencia entre taxable_base, percent y amount"""
-        try:
-            expected_amount = _q2(self.taxable_base * (self.percent / Decimal("100")))
-            diff = abs(self.amount - expected_amount)
-            if diff > _TOL:
-                # No fallamos, solo es informativo
-                pass
-        except Exception:
-            pass
-        return self
+    # La coherencia entre taxable_base, percent y amount es informativa: no
+    # se valida aquí, se reporta en InvoiceExtractionSchema.validation_report()
+
+
+def _vat_entry_discrepancy(entry: VATEntrySchema, path: str) -> Optional[Discrepancy]:
+    expected = _expected_vat(entry.taxable_base, entry.percent)
+    diff = abs(entry.amount - expected)
+    if diff <= _TOL:
+        return None
+    return Discrepancy(
+        code="vat_entry_amount",
+        path=path,
+        expected=expected,
+        actual=entry.amount,
+        delta=entry.amount - expected,
+        tolerance=_TOL,
+        message=(
+            f"IVA de la tasa {entry.percent}% difiere de esperado: provisto={entry.amount} "
+            f"esperado={expected} (Δ={_q2(diff)})."
+        ),
+    )
 
 
 class DiscountEntrySchema(BaseModel):
@@ -186,13 +251,8 @@ class DiscountEntrySchema(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
     label: str
-    percent: Optional[Decimal] = None
-    amount: Decimal = Field(..., description="Monto del descuento (positivo)")
-
-    @field_validator("percent", "amount", mode="before")
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
+    percent: Optional[Percent] = None
+    amount: Money = Field(..., description="Monto del descuento (positivo)")
 
 
 class WithholdingEntrySchema(BaseModel):
@@ -201,13 +261,8 @@ class WithholdingEntrySchema(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
     label: str
-    percent: Optional[Decimal] = None
-    amount: Decimal = Field(..., description="Monto de la retención (positivo)")
-
-    @field_validator("percent", "amount", mode="before")
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
+    percent: Optional[Percent] = None
+    amount: Money = Field(..., description="Monto de la retención (positivo)")
 
 
 class PerceptionEntrySchema(BaseModel):
@@ -224,13 +279,8 @@ class PerceptionEntrySchema(BaseModel):
     label: str = Field(
         ..., description="Etiqueta (ej: 'IIBB CABA', 'Percepción ARBA', 'SIRCREB')"
     )
-    percent: Optional[Decimal] = None
-    amount: Decimal = Field(..., description="Monto de la percepción (positivo)")
-
-    @field_validator("percent", "amount", mode="before")
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
+    percent: Optional[Percent] = None
+    amount: Money = Field(..., description="Monto de la percepción (positivo)")
 
 
 class TotalsSchema(BaseModel):
@@ -246,12 +296,12 @@ class TotalsSchema(BaseModel):
 
     model_config = ConfigDict(extra="ignore")
 
-    subtotal: Optional[Decimal] = None
-    taxable_base: Decimal = Field(
+    subtotal: Optional[Money] = None
+    taxable_base: Money = Field(
         ..., description="Base imponible total. Puede ser negativo."
     )
-    vat_percent: Decimal = Field(..., description="Porcentaje de IVA promedio o único")
-    vat_amount: Decimal = Field(..., description="Total IVA. Puede ser negativo.")
+    vat_percent: Percent = Field(..., description="Porcentaje de IVA promedio o único")
+    vat_amount: Money = Field(..., description="Total IVA. Puede ser negativo.")
 
     vat_breakdown: List[VATEntrySchema] = Field(
         ...,  # Obligatorio, no puede ser default vacío
@@ -259,149 +309,44 @@ class TotalsSchema(BaseModel):
         min_length=1,  # Forzar al menos 1 elemento
     )
 
-    discounts: Optional[Decimal] = None
+    discounts: Optional[Money] = None
     discounts_breakdown: List[DiscountEntrySchema] = Field(default_factory=list)
 
-    withholding: Optional[Decimal] = None
-    withholding_percent: Optional[Decimal] = None
+    withholding: Optional[Money] = None
+    withholding_percent: Optional[Percent] = None
     withholdings_breakdown: List[WithholdingEntrySchema] = Field(default_factory=list)
 
     # Percepciones (Argentina) → ADITIVAS
-    perceptions: Optional[Decimal] = None
+    perceptions: Optional[Money] = None
     perceptions_breakdown: List[PerceptionEntrySchema] = Field(default_factory=list)
 
-    other_taxes: Optional[Decimal] = None
-    grand_total: Decimal = Field(..., description="Total factura. Puede ser negativo.")
+    other_taxes: Optional[Money] = None
+    grand_total: Money = Field(..., description="Total factura. Puede ser negativo.")
 
     # Campo para notas de validación
     notes: Optional[str] = Field(
         None, description="Notas sobre discrepancias o ajustes detectados"
     )
 
-    @field_validator(
-        "subtotal",
-        "taxable_base",
-        "vat_percent",
-        "vat_amount",
-        "discounts",
-        "withholding",
-        "withholding_percent",
-        "perceptions",
-        "other_taxes",
-        "grand_total",
-        mode="before",
-    )
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
-
     @model_validator(mode="after")
     def _validate_and_round_totals(self):
         """
-        Validaciones y redondeo de totales:
-        1. Redondeo consistente a 2 decimales
-        2. Validar vat_breakdown no vacío
-        3. Validar sum(vat_breakdown.taxable_base) ≈ taxable_base
-        4. Validar sum(vat_breakdown.amount) ≈ vat_amount
+        Validaciones de totales (los importes y porcentajes, incluidos los de
+        los breakdowns, ya llegan redondeados a 2 decimales por Money/Percent):
+        1. Validar vat_breakdown no vacío
+        2. Validar sum(vat_breakdown.taxable_base) ≈ taxable_base
+        3. Validar sum(vat_breakdown.amount) ≈ vat_amount
+        4. Validar fórmula de grand_total
         """
         validation_notes = []
 
-        # --- Redondeo de campos escalares ---
-        scalar_fields = [
-            "subtotal",
-            "taxable_base",
-            "vat_percent",
-            "vat_amount",
-            "discounts",
-            "withholding",
-            "withholding_percent",
-            "perceptions",
-            "other_taxes",
-            "grand_total",
-        ]
-        for f in scalar_fields:
-            val = getattr(self, f, None)
-            if isinstance(val, Decimal):
-                object.__setattr__(self, f, _q2(val))
-
-        # --- Redondeo en vat_breakdown ---
-        vbd = []
-        for v in self.vat_breakdown:
-            v.percent = _q2(v.percent)
-            v.taxable_base = _q2(v.taxable_base)
-            v.amount = _q2(v.amount)
-            vbd.append(v)
-        object.__setattr__(self, "vat_breakdown", vbd)
-
         # --- Validar vat_breakdown no vacío ---
         if not self.vat_breakdown:
             validation_notes.append(
                 "ADVERTENCIA: vat_breakdown está vacío, debería tener al menos 1 entrada"
             )
 
-        # --- Validar sum(vat_breakdown.taxable_base) ≈ taxable_base ---
-        if self.vat_breakdown:
-            sum_vb_taxable = sum(v.taxable_base for v in self.vat_breakdown)
-            diff_taxable = abs(sum_vb_taxable - self.taxable_base)
-            if diff_taxable > _TOL_TOTALS:
-                validation_notes.append(
-                    f"sum(vat_breakdown.taxable_base)={sum_vb_taxable} ≠ taxable_base={self.taxable_base} "
-                    f"(Δ={_q2(diff_taxable)})"
-                )
-
-        # --- Validar sum(vat_breakdown.amount) ≈ vat_amount ---
-        if self.vat_breakdown:
-            sum_vb_amount = sum(v.amount for v in self.vat_breakdown)
-            diff_vat = abs(sum_vb_amount - self.vat_amount)
-            if diff_vat > _TOL_TOTALS:
-                validation_notes.append(
-                    f"sum(vat_breakdown.amount)={sum_vb_amount} ≠ vat_amount={self.vat_amount} "
-                    f"(Δ={_q2(diff_vat)})"
-                )
-
-        # --- Validar fórmula de grand_total ---
-        try:
-            expected_grand = (
-                self.taxable_base
-                + self.vat_amount
-                + (self.perceptions or Decimal("0"))
-                + (self.other_taxes or Decimal("0"))
-                - (self.discounts or Decimal("0"))
-                - (self.withholding or Decimal("0"))
-            )
-            diff_grand = abs(self.grand_total - expected_grand)
-            if diff_grand > _TOL_TOTALS:
-                validation_notes.append(
-                    f"grand_total={self.grand_total} ≠ calculado={_q2(expected_grand)} "
-                    f"(Δ={_q2(diff_grand)})"
-                )
-        except Exception:
-            pass
-
-        # --- Redondeo en otros breakdowns ---
-        dbd = []
-        for d in self.discounts_breakdown:
-            if d.percent is not None:
-                d.percent = _q2(d.percent)
-            d.amount = _q2(d.amount)
-            dbd.append(d)
-        object.__setattr__(self, "discounts_breakdown", dbd)
-
-        wbd = []
-        for w in self.withholdings_breakdown:
-            if w.percent is not None:
-                w.percent = _q2(w.percent)
-            w.amount = _q2(w.amount)
-            wbd.append(w)
-        object.__setattr__(self, "withholdings_breakdown", wbd)
-
-        pbd = []
-        for p in self.perceptions_breakdown:
-            if p.percent is not None:
-                p.percent = _q2(p.percent)
-            p.amount = _q2(p.amount)
-            pbd.append(p)
-        object.__setattr__(self, "perceptions_breakdown", pbd)
+        validation_notes.extend(d.message for d in _totals_discrepancies(self))
 
         # --- Guardar notas de validación ---
         if validation_notes:
@@ -423,16 +368,11 @@ class SecondaryTotalSchema(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
     currency: Optional[CurrencyEnum] = None
-    amount: Optional[Decimal] = None
-    fx_rate: Optional[Decimal] = Field(
+    amount: Optional[DecimalValue] = None
+    fx_rate: Optional[DecimalValue] = Field(
         None, description="Tipo de cambio si está impreso en el documento"
     )
 
-    @field_validator("amount", "fx_rate", mode="before")
-    @classmethod
-    def _decimals(cls, v):
-        return _to_decimal(v)
-
 
 class InvoiceExtractionSchema(BaseModel):
     """
@@ -466,40 +406,207 @@ class InvoiceExtractionSchema(BaseModel):
         if not self.items:
             return self
 
-        validation_notes = []
+        validation_notes = _document_total_notes(
+            sum(item.line_total for item in self.items),
+            sum(item.vat_amount for item in self.items),
+            self.totals,
+        )
+
+        # Agregar notas de validación al totals (sin revalidarlo)
+        if validation_notes:
+            object.__setattr__(
+                self, "totals", _totals_with_notes(self.totals, validation_notes)
+            )
+
+        return self
 
-        # Suma de line_totals de items
-        sum_line_totals = sum(item.line_total for item in self.items)
-        diff_taxable = abs(sum_line_totals - self.totals.taxable_base)
+    def validation_report(self) -> ValidationReport:
+        """Discrepancias de la factura como registros tipados (ver build_validation_report)."""
+        return build_validation_report(self)
 
+
+def _totals_discrepancies(totals: TotalsSchema, prefix: str = "") -> List[Discrepancy]:
+    """
+    Comprobaciones de TotalsSchema._validate_and_round_totals:
+    - sum(vat_breakdown.taxable_base) ≈ taxable_base
+    - sum(vat_breakdown.amount) ≈ vat_amount
+    - grand_total = taxable_base + vat_amount + perceptions + other_taxes
+      - discounts - withholding
+    """
+    discrepancies = []
+
+    if totals.vat_breakdown:
+        sum_vb_taxable = sum(v.taxable_base for v in totals.vat_breakdown)
+        diff_taxable = abs(sum_vb_taxable - totals.taxable_base)
         if diff_taxable > _TOL_TOTALS:
-            validation_notes.append(
-                f"sum(items.line_total)={_q2(sum_line_totals)} ≠ "
-                f"taxable_base={self.totals.taxable_base} (Δ={_q2(diff_taxable)})"
+            discrepancies.append(
+                Discrepancy(
+                    code="breakdown_taxable_base",
+                    path=f"{prefix}taxable_base",
+                    expected=sum_vb_taxable,
+                    actual=totals.taxable_base,
+                    delta=totals.taxable_base - sum_vb_taxable,
+                    tolerance=_TOL_TOTALS,
+                    message=(
+                        f"sum(vat_breakdown.taxable_base)={sum_vb_taxable} ≠ taxable_base={totals.taxable_base} "
+                        f"(Δ={_q2(diff_taxable)})"
+                    ),
+                )
             )
 
-        # Suma de vat_amounts de items
-        sum_vat_amounts = sum(item.vat_amount for item in self.items)
-        diff_vat = abs(sum_vat_amounts - self.totals.vat_amount)
-
+        sum_vb_amount = sum(v.amount for v in totals.vat_breakdown)
+        diff_vat = abs(sum_vb_amount - totals.vat_amount)
         if diff_vat > _TOL_TOTALS:
-            validation_notes.append(
-                f"sum(items.vat_amount)={_q2(sum_vat_amounts)} ≠ "
-                f"vat_amount={self.totals.vat_amount} (Δ={_q2(diff_vat)})"
+            discrepancies.append(
+                Discrepancy(
+                    code="breakdown_vat_amount",
+                    path=f"{prefix}vat_amount",
+                    expected=sum_vb_amount,
+                    actual=totals.vat_amount,
+                    delta=totals.vat_amount - sum_vb_amount,
+                    tolerance=_TOL_TOTALS,
+                    message=(
+                        f"sum(vat_breakdown.amount)={sum_vb_amount} ≠ vat_amount={totals.vat_amount} "
+                        f"(Δ={_q2(diff_vat)})"
+                    ),
+                )
             )
 
-        # Agregar notas de validación al totals
-        if validation_notes:
-            combined_notes = " | ".join(validation_notes)
-            current_notes = self.totals.notes or ""
-            if current_notes:
-                new_notes = f"{current_notes} | {combined_notes}"
-            else:
-                new_notes = combined_notes
+    try:
+        expected_grand = (
+            totals.taxable_base
+            + totals.vat_amount
+            + (totals.perceptions or Decimal("0"))
+            + (totals.other_taxes or Decimal("0"))
+            - (totals.discounts or Decimal("0"))
+            - (totals.withholding or Decimal("0"))
+        )
+        diff_grand = abs(totals.grand_total - expected_grand)
+        if diff_grand > _TOL_TOTALS:
+            discrepancies.append(
+                Discrepancy(
+                    code="grand_total",
+                    path=f"{prefix}grand_total",
+                    expected=expected_grand,
+                    actual=totals.grand_total,
+                    delta=totals.grand_total - expected_grand,
+                    tolerance=_TOL_TOTALS,
+                    message=(
+                        f"grand_total={totals.grand_total} ≠ calculado={_q2(expected_grand)} "
+                        f"(Δ={_q2(diff_grand)})"
+                    ),
+                )
+            )
+    except Exception:
+        pass
 
-            # Crear nuevo TotalsSchema con las notas actualizadas
-            totals_dict = self.totals.model_dump()
-            totals_dict["notes"] = new_notes
-            object.__setattr__(self, "totals", TotalsSchema(**totals_dict))
+    return discrepancies
 
-        return self
+
+def _document_discrepancies(
+    sum_line_totals, sum_vat_amounts, totals: TotalsSchema
+) -> List[Discrepancy]:
+    """
+    Comprobaciones de InvoiceExtractionSchema._validate_document_totals a
+    partir de las sumas de items (compartido con la validación por lotes y en
+    streaming).
+    """
+    discrepancies = []
+
+    diff_taxable = abs(sum_line_totals - totals.taxable_base)
+    if diff_taxable > _TOL_TOTALS:
+        discrepancies.append(
+            Discrepancy(
+                code="items_line_total",
+                path="totals.taxable_base",
+                expected=sum_line_totals,
+                actual=totals.taxable_base,
+                delta=totals.taxable_base - sum_line_totals,
+                tolerance=_TOL_TOTALS,
+                message=(
+                    f"sum(items.line_total)={_q2(sum_line_totals)} ≠ "
+                    f"taxable_base={totals.taxable_base} (Δ={_q2(diff_taxable)})"
+                ),
+            )
+        )
+
+    diff_vat = abs(sum_vat_amounts - totals.vat_amount)
+    if diff_vat > _TOL_TOTALS:
+        discrepancies.append(
+            Discrepancy(
+                code="items_vat_amount",
+                path="totals.vat_amount",
+                expected=sum_vat_amounts,
+                actual=totals.vat_amount,
+                delta=totals.vat_amount - sum_vat_amounts,
+                tolerance=_TOL_TOTALS,
+                message=(
+                    f"sum(items.vat_amount)={_q2(sum_vat_amounts)} ≠ "
+                    f"vat_amount={totals.vat_amount} (Δ={_q2(diff_vat)})"
+                ),
+            )
+        )
+
+    return discrepancies
+
+
+def _document_total_notes(sum_line_totals, sum_vat_amounts, totals: TotalsSchema) -> List[str]:
+    """Notas de _validate_document_totals (mensajes de _document_discrepancies)."""
+    return [d.message for d in _document_discrepancies(sum_line_totals, sum_vat_amounts, totals)]
+
+
+def _totals_with_notes(totals: TotalsSchema, validation_notes: List[str]) -> TotalsSchema:
+    """
+    Copia de `totals` con las notas añadidas. No se revalida: los importes ya
+    están validados y redondeados, y revalidar volvería a añadir las notas
+    propias de TotalsSchema.
+    """
+    combined_notes = " | ".join(validation_notes)
+    current_notes = totals.notes or ""
+    if current_notes:
+        new_notes = f"{current_notes} | {combined_notes}"
+    else:
+        new_notes = combined_notes
+
+    return totals.model_copy(update={"notes": new_notes})
+
+
+def build_validation_report(invoice: InvoiceExtractionSchema) -> ValidationReport:
+    """
+    Recorre una vez la factura ya validada y devuelve todas las discrepancias
+    (las que generan `notes` y las informativas de vat_breakdown) como
+    registros tipados.
+
+    Args:
+        invoice (InvoiceExtractionSchema): Factura validada (por fila, por
+            lotes o en streaming).
+
+    Returns:
+        ValidationReport: Discrepancias con path, expected, actual y delta.
+    """
+    discrepancies: List[Discrepancy] = []
+    sum_line_totals = Decimal("0")
+    sum_vat_amounts = Decimal("0")
+
+    for i, item in enumerate(invoice.items):
+        sum_line_totals += item.line_total
+        sum_vat_amounts += item.vat_amount
+        try:
+            expected = _expected_vat(item.line_total, item.vat_percent)
+        except Exception:
+            continue
+        discrepancy = _line_vat_discrepancy(expected, item.vat_amount, f"items[{i}].vat_amount")
+        if discrepancy is not None:
+            discrepancies.append(discrepancy)
+
+    totals = invoice.totals
+    for i, entry in enumerate(totals.vat_breakdown):
+        discrepancy = _vat_entry_discrepancy(entry, f"totals.vat_breakdown[{i}].amount")
+        if discrepancy is not None:
+            discrepancies.append(discrepancy)
+
+    discrepancies.extend(_totals_discrepancies(totals, prefix="totals."))
+    if invoice.items:
+        discrepancies.extend(_document_discrepancies(sum_line_totals, sum_vat_amounts, totals))
+
+    return ValidationReport(discrepancies=discrepancies)
@@ -0,0 +1,315 @@
+"""
+Validación por lotes (columnar) de InvoiceExtractionSchema.items.
+
+Para facturas con miles de líneas, validar cada LineItemSchema cuesta nueve
+validadores de campo y un model-validator por fila. Aquí se parsean las columnas
+numéricas de una vez y las comprobaciones de línea (vat_amount esperado,
+net_price) se hacen con enteros escalados; los LineItemSchema se construyen
+sin revalidar, y en LineItemBatch solo al acceder a ellos.
+
+El resultado (valores, notas, model_fields_set) es idéntico al de
+InvoiceExtractionSchema.model_validate. Cualquier fila que se salga del caso
+simple (tipos inesperados, campos obligatorios ausentes, NaN...) hace que se
+use el camino por fila, que produce exactamente los mismos errores.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, getcontext
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from exponential_core.claudeai.schemas.invoice_line_items import (
+    InvoiceExtractionSchema,
+    LineItemSchema,
+    _check_line_item,
+    _document_total_notes,
+    _q2,
+    _totals_with_notes,
+)
+from exponential_core.utils.money import to_decimal
+
+_DECIMAL_FIELDS = (
+    "quantity",
+    "unit_price",
+    "discount_percent",
+    "discount_amount",
+    "net_price",
+    "line_total",
+    "vat_percent",
+    "vat_amount",
+    "weight_kg",
+)
+_REQUIRED_DECIMALS = frozenset({"quantity", "unit_price", "line_total", "vat_percent", "vat_amount"})
+_STR_FIELDS = (
+    "date",
+    "delivery_code",
+    "product_code",
+    "unit",
+    "vat_label",
+    "measurements",
+    "color",
+    "notes",
+)
+_FIELDS = tuple(LineItemSchema.model_fields)
+_FIELD_SET = frozenset(_FIELDS)
+
+# Límites del camino con enteros. Dentro de ellos las operaciones Decimal del
+# camino por fila son exactas con la precisión por defecto (28 dígitos), así
+# que ambos caminos coinciden; fuera de ellos la fila se calcula con Decimal.
+#   importes: |x| < 10**12 con hasta 6 decimales
+#   porcentaje: |x| < 10**4 con hasta 4 decimales
+_AMOUNT_MAX, _AMOUNT_DEN = 10**12, 10**6
+_PERCENT_MAX, _PERCENT_DEN = 10**4, 10**4
+_MAX_FAST_CENTS = 10**14
+
+# _TOL (0.03) en céntimos
+_TOL_CENTS = 3
+
+_ZERO, _NEG_ZERO = Decimal("0.00"), Decimal("-0.00")
+
+
+class _NotColumnar(Exception):
+    """La entrada no admite el camino columnar; se valida fila a fila."""
+
+
+def _parse_column(rows: Sequence[dict], field: str, required: bool) -> list:
+    """Parsea una columna numérica con to_decimal, igual que DecimalValue."""
+    column = []
+    append = column.append
+    for row in rows:
+        raw = row.get(field)
+        if raw is None:
+            if required:
+                raise _NotColumnar
+            append(None)
+        else:
+            append(to_decimal(raw))
+    return column
+
+
+class LineItemBatch(Sequence[LineItemSchema]):
+    """
+    Líneas de factura validadas en forma columnar.
+
+    `columns[campo][i]` contiene el valor final del campo de la fila i (tras
+    las validaciones de línea). Los LineItemSchema se materializan al indexar
+    o iterar y quedan cacheados; las sumas de columnas no los necesitan.
+    """
+
+    def __init__(self, columns: Dict[str, list], fields_set: List[frozenset]):
+        self.columns = columns
+        self._fields_set = fields_set
+        self._items: List[Optional[LineItemSchema]] = [None] * len(fields_set)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "LineItemBatch":
+        """
+        Valida las filas en forma columnar.
+
+        Raises:
+            _NotColumnar: si alguna fila requiere el camino por fila.
+        """
+        fields_set: List[frozenset] = []
+        for row in rows:
+            if type(row) is not dict:
+                raise _NotColumnar
+            fields_set.append(_FIELD_SET.intersection(row))
+
+        columns: Dict[str, list] = {}
+
+        # 1) Campos de texto (str en modo lax solo admite str)
+        for field in _STR_FIELDS:
+            column = [row.get(field) for row in rows]
+            for value in column:
+                if value is not None and type(value) is not str:
+                    raise _NotColumnar
+            columns[field] = column
+        column = [row.get("description") for row in rows]
+        for value in column:
+            if type(value) is not str:
+                raise _NotColumnar
+        columns["description"] = column
+        column = [row.get("tax_id") for row in rows]
+        for value in column:
+            if value is not None and type(value) is not int:
+                raise _NotColumnar
+        columns["tax_id"] = column
+
+        # 2) Columnas numéricas
+        try:
+            for field in _DECIMAL_FIELDS:
+                columns[field] = _parse_column(rows, field, field in _REQUIRED_DECIMALS)
+        except _NotColumnar:
+            raise
+        except ValueError as e:  # p. ej. "abc" o NaN
+            raise _NotColumnar from e
+
+        # 3) Reglas de línea con enteros
+        cls._check_lines(columns)
+        return cls(columns, fields_set)
+
+    @staticmethod
+    def _check_lines(columns: Dict[str, list]):
+        """
+        Aplica _check_line_item a todas las filas. Cada Decimal se convierte a
+        fracción entera exacta (as_integer_ratio, denominador 2**a * 5**b) y
+        el redondeo HALF_UP a céntimos se hace con divmod.
+        """
+        quantity = columns["quantity"]
+        vat_percent = columns["vat_percent"]
+        vat_amount = columns["vat_amount"]
+        net_price = columns["net_price"]
+        notes = columns["notes"]
+        # Decimal redondea lt/qt a `prec` dígitos antes de cuantizar. Con
+        # céntimos < 10**14 quedan al menos prec-14 dígitos tras el céntimo; si
+        # el resto está más cerca que eso de un empate .5, se delega en Decimal
+        tie_scale = 10 ** (getcontext().prec - 14) if getcontext().prec >= 16 else None
+
+        for i, lt in enumerate(columns["line_total"]):
+            ln, ld = lt.as_integer_ratio()
+            pn, pd = vat_percent[i].as_integer_ratio()
+            vn, vd = vat_amount[i].as_integer_ratio()
+            if not (
+                _AMOUNT_DEN % ld == 0
+                and _AMOUNT_DEN % vd == 0
+                and _PERCENT_DEN % pd == 0
+                and abs(ln) < _AMOUNT_MAX * ld
+                and abs(vn) < _AMOUNT_MAX * vd
+                and abs(pn) < _PERCENT_MAX * pd
+            ):
+                vat_amount[i], net_price[i], notes[i] = _check_line_item(
+                    quantity[i], lt, vat_percent[i], vat_amount[i], net_price[i], notes[i]
+                )
+                continue
+
+            # expected = q2(line_total * vat_percent / 100), en céntimos
+            num = ln * pn
+            den = ld * pd
+            expected, r = divmod(abs(num), den)
+            if 2 * r >= den:
+                expected += 1
+            if num < 0:
+                expected = -expected
+
+            # |vat_amount - expected| > _TOL  <=>  |100·vn - expected·vd| > 3·vd
+            if abs(100 * vn - expected * vd) > _TOL_CENTS * vd:
+                # Fila con nota: el texto se genera con Decimal, igual que por fila
+                notes[i] = _check_line_item(
+                    quantity[i], lt, vat_percent[i], vat_amount[i], net_price[i], notes[i]
+                )[2]
+
+            qt = quantity[i]
+            if net_price[i] is not None or not qt:
+                continue
+
+            # net_price = q2(line_total / quantity), en céntimos
+            qn, qd = qt.as_integer_ratio()
+            num = 100 * ln * qd
+            den = ld * qn
+            if den < 0:
+                num, den = -num, -den
+            cents, r = divmod(abs(num), den)
+            if 2 * r >= den:
+                cents += 1
+            if tie_scale is None or cents >= _MAX_FAST_CENTS or (
+                r and abs(2 * r - den) * tie_scale <= 2 * den
+            ):
+                net_price[i] = _q2(lt / qt)
+            elif cents == 0:
+                net_price[i] = _NEG_ZERO if lt.is_signed() != qt.is_signed() else _ZERO
+            else:
+                net_price[i] = Decimal(-cents if num < 0 else cents).scaleb(-2)
+
+    # ------------------------------------------------------------------ #
+    # Sequence
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            columns = self.columns
+            item = LineItemSchema.model_construct(
+                _fields_set=set(self._fields_set[index]),
+                **{field: columns[field][index] for field in _FIELDS},
+            )
+            self._items[index] = item
+        return item
+
+    def __iter__(self) -> Iterator[LineItemSchema]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LineItemBatch)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def materialize(self) -> List[LineItemSchema]:
+        """Construye todos los LineItemSchema y los devuelve como lista."""
+        return list(self)
+
+    @property
+    def sum_line_total(self):
+        return sum(self.columns["line_total"])
+
+    @property
+    def sum_vat_amount(self):
+        return sum(self.columns["vat_amount"])
+
+
+def validate_line_items_batch(rows: Sequence[Any]) -> Sequence[LineItemSchema]:
+    """
+    Valida una lista de líneas. Devuelve un LineItemBatch (materialización
+    perezosa) o, si alguna fila no admite el camino columnar, la lista de
+    LineItemSchema validados fila a fila.
+    """
+    try:
+        return LineItemBatch.from_rows(rows)
+    except _NotColumnar:
+        return [LineItemSchema.model_validate(row) for row in rows]
+
+
+def validate_invoice_extraction_batch(data: Dict[str, Any]) -> InvoiceExtractionSchema:
+    """
+    Equivalente a InvoiceExtractionSchema.model_validate(data) con los items
+    validados en forma columnar. `items` es una lista de LineItemSchema, como
+    en model_validate; para acceder a las líneas de forma perezosa se usa
+    validate_line_items_batch.
+
+    Args:
+        data (dict): Documento tal como lo devuelve el LLM.
+
+    Returns:
+        InvoiceExtractionSchema: Mismo resultado y notas que el camino por fila.
+    """
+    rows = data.get("items") if isinstance(data, dict) else None
+    if type(rows) is not list or not rows:
+        return InvoiceExtractionSchema.model_validate(data)
+
+    try:
+        batch = LineItemBatch.from_rows(rows)
+    except _NotColumnar:
+        return InvoiceExtractionSchema.model_validate(data)
+
+    # Cabecera y totales con la validación normal (sin items, no hay
+    # comprobaciones de documento)
+    header = InvoiceExtractionSchema.model_validate({**data, "items": []})
+
+    totals = header.totals
+    validation_notes = _document_total_notes(batch.sum_line_total, batch.sum_vat_amount, totals)
+    if validation_notes:
+        totals = _totals_with_notes(totals, validation_notes)
+
+    return InvoiceExtractionSchema.model_construct(
+        _fields_set=set(header.model_fields_set),
+        currency=header.currency,
+        secondary_total=header.secondary_total,
+        items=batch.materialize(),
+        totals=totals,
+    )
@@ -0,0 +1,308 @@
+"""
+Parser incremental de InvoiceExtractionSchema para respuestas en streaming.
+
+En lugar de acumular toda la respuesta del LLM y llamar a
+InvoiceExtractionSchema.model_validate_json, se consume el JSON por trozos
+(p. ej. los text_delta de un stream SSE), se valida cada elemento de `items`
+en cuanto se cierra y se entrega al llamador, sin esperar a `totals`. Las
+sumas de line_total y vat_amount se llevan acumuladas para las comprobaciones
+de documento.
+
+Uso:
+    stream = InvoiceExtractionStream(chunks)   # AsyncIterable[bytes | str]
+    async for item in stream:
+        ...                                     # LineItemSchema
+    invoice = stream.result                     # InvoiceExtractionSchema
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from decimal import Decimal
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Union
+
+from exponential_core.claudeai.schemas.invoice_line_items import (
+    InvoiceExtractionSchema,
+    LineItemSchema,
+    _document_total_notes,
+    _totals_with_notes,
+)
+
+_WS = frozenset(b" \t\r\n")
+_STRUCT_OR_QUOTE = re.compile(rb'[\[\]{}"]')
+_QUOTE_OR_ESCAPE = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+
+# Estados del parser de nivel superior
+_START, _KEY, _COLON, _VALUE, _AFTER_VALUE = range(5)
+_ITEM, _AFTER_ITEM, _DONE = range(5, 8)
+
+
+class _ValueScanner:
+    """
+    Localiza el final de un valor JSON en un buffer que va creciendo. Guarda
+    su estado (profundidad, dentro de string) para reanudar sin reescanear.
+    """
+
+    __slots__ = ("start", "pos", "depth", "in_string")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.pos = start
+        self.depth = 0
+        self.in_string = False
+
+    def shift(self, offset: int):
+        self.start -= offset
+        self.pos -= offset
+
+    def scan(self, buf: bytearray) -> Optional[int]:
+        """Índice (exclusivo) del final del valor, o None si aún está incompleto."""
+        if self.pos == self.start:
+            first = buf[self.start]
+            if first not in b'{["':
+                match = _SCALAR_END.search(buf, self.start)
+                return match.start() if match else None
+        while True:
+            if self.in_string:
+                match = _QUOTE_OR_ESCAPE.search(buf, self.pos)
+                if match is None:
+                    self.pos = len(buf)
+                    return None
+                if match.group() == b"\\":
+                    if match.end() >= len(buf):
+                        self.pos = match.start()
+                        return None
+                    self.pos = match.end() + 1
+                    continue
+                self.in_string = False
+                self.pos = match.end()
+                if self.depth == 0:
+                    return self.pos
+                continue
+
+            match = _STRUCT_OR_QUOTE.search(buf, self.pos)
+            if match is None:
+                self.pos = len(buf)
+                return None
+            self.pos = match.end()
+            char = match.group()
+            if char == b'"':
+                self.in_string = True
+            elif char in (b"{", b"["):
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.pos
+
+
+class InvoiceExtractionStream:
+    """
+    Consume un JSON de InvoiceExtractionSchema por trozos y entrega cada
+    LineItemSchema en cuanto su elemento de `items` está completo.
+
+    Al agotar el iterador, `result` contiene el InvoiceExtractionSchema con las
+    mismas notas que model_validate_json (las comprobaciones de documento usan
+    las sumas acumuladas). Se ignora cualquier texto antes de la primera `{`
+    (p. ej. un bloque ```json).
+
+    Args:
+        chunks: AsyncIterable de bytes o str.
+        keep_items (bool): Si es False no se retienen los items ya entregados;
+            `result.items` queda vacío pero las notas de totales se calculan igual.
+    """
+
+    def __init__(self, chunks: AsyncIterable[Union[bytes, str]], keep_items: bool = True):
+        self._chunks = chunks
+        self.keep_items = keep_items
+        self.items: List[LineItemSchema] = []
+        self.item_count = 0
+        self.sum_line_total = Decimal("0")
+        self.sum_vat_amount = Decimal("0")
+        self._result: Optional[InvoiceExtractionSchema] = None
+
+        self._buf = bytearray()
+        self._pos = 0
+        self._state = _START
+        self._key: Optional[str] = None
+        self._scanner: Optional[_ValueScanner] = None
+        self._header: Dict[str, bytes] = {}
+        self._has_items = False
+
+    @property
+    def result(self) -> InvoiceExtractionSchema:
+        if self._result is None:
+            raise RuntimeError("El stream aún no se ha consumido por completo")
+        return self._result
+
+    async def __aiter__(self) -> AsyncIterator[LineItemSchema]:
+        async for chunk in self._chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            self._buf += chunk
+            for raw in self._process():
+                yield self._accept(raw)
+            self._compact()
+
+        if self._state != _DONE:
+            raise ValueError("JSON incompleto: el stream terminó antes de cerrar el objeto raíz")
+        self._result = self._build_result()
+
+    def _accept(self, raw: bytes) -> LineItemSchema:
+        item = LineItemSchema.model_validate_json(raw)
+        self.item_count += 1
+        self.sum_line_total += item.line_total
+        self.sum_vat_amount += item.vat_amount
+        if self.keep_items:
+            self.items.append(item)
+        return item
+
+    # ------------------------------------------------------------------ #
+    # Máquina de estados
+    # ------------------------------------------------------------------ #
+    def _skip_ws(self) -> Optional[int]:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WS:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _scan_value(self) -> Optional[bytes]:
+        if self._scanner is None:
+            self._scanner = _ValueScanner(self._pos)
+        end = self._scanner.scan(self._buf)
+        if end is None:
+            return None
+        raw = bytes(self._buf[self._scanner.start:end])
+        self._scanner = None
+        self._pos = end
+        return raw
+
+    def _process(self):
+        buf = self._buf
+        while True:
+            if self._state == _DONE:
+                return
+            if self._scanner is None:
+                char = self._skip_ws()
+                if char is None:
+                    return
+            else:
+                char = None
+
+            if self._state == _START:
+                start = buf.find(b"{", self._pos)
+                if start < 0:
+                    self._pos = len(buf)
+                    return
+                self._pos = start + 1
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                if char == ord("}"):
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                raw = self._scan_value()
+                if raw is None:
+                    return
+                self._key = json.loads(raw)
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                self._expect(char, b":")
+                self._state = _VALUE
+
+            elif self._state == _VALUE:
+                if self._key == "items" and char == ord("["):
+                    self._pos += 1
+                    self._has_items = True
+                    self._state = _ITEM
+                    continue
+                raw = self._scan_value()
+                if raw is None:
+                    return
+                self._header[self._key] = raw
+                self._state = _AFTER_VALUE
+
+            elif self._state == _AFTER_VALUE:
+                if char == ord("}"):
+                    self._pos += 1
+                    self._state = _DONE
+                else:
+                    self._expect(char, b",")
+                    self._state = _KEY
+
+            elif self._state == _ITEM:
+                if char == ord("]"):
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                raw = self._scan_value()
+                if raw is None:
+                    return
+                self._state = _AFTER_ITEM
+                yield raw
+
+            elif self._state == _AFTER_ITEM:
+                if char == ord("]"):
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                else:
+                    self._expect(char, b",")
+                    self._state = _ITEM
+
+    def _expect(self, char: Optional[int], token: bytes):
+        if char != token[0]:
+            found = chr(char) if char is not None else "EOF"
+            raise ValueError(f"JSON inválido: se esperaba '{token.decode()}' y llegó '{found}'")
+        self._pos += 1
+
+    def _compact(self):
+        """Descarta del buffer lo ya consumido."""
+        keep_from = self._scanner.start if self._scanner is not None else self._pos
+        if keep_from:
+            del self._buf[:keep_from]
+            self._pos -= keep_from
+            if self._scanner is not None:
+                self._scanner.shift(keep_from)
+
+    # ------------------------------------------------------------------ #
+    # Resultado
+    # ------------------------------------------------------------------ #
+    def _build_result(self) -> InvoiceExtractionSchema:
+        header = b"{" + b",".join(
+            json.dumps(key).encode("utf-8") + b":" + raw for key, raw in self._header.items()
+        )
+        if self._has_items:
+            header += (b"," if self._header else b"") + b'"items":[]'
+        header += b"}"
+
+        # Cabecera y totales con la validación normal; sin `items` da el mismo
+        # error que el camino completo
+        model = InvoiceExtractionSchema.model_validate_json(header)
+        if not self.item_count:
+            return model
+
+        totals = model.totals
+        validation_notes = _document_total_notes(self.sum_line_total, self.sum_vat_amount, totals)
+        if validation_notes:
+            totals = _totals_with_notes(totals, validation_notes)
+
+        return InvoiceExtractionSchema.model_construct(
+            _fields_set=set(model.model_fields_set),
+            currency=model.currency,
+            secondary_total=model.secondary_total,
+            items=self.items,
+            totals=totals,
+        )
+
+
+async def stream_invoice_items(
+    chunks: AsyncIterable[Union[bytes, str]],
+) -> AsyncIterator[LineItemSchema]:
+    """Atajo: itera los LineItemSchema de un stream sin conservar el resultado."""
+    async for item in InvoiceExtractionStream(chunks, keep_items=False):
+        yield item
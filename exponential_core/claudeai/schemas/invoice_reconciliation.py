@@ -0,0 +1,604 @@
+"""
+Conciliación aritmética de InvoiceExtractionSchema con auto-reparación.
+
+Los validadores de invoice_line_items solo anotan discrepancias. Aquí se
+intenta encontrar el conjunto de valores coherente más probable a partir de
+los errores típicos de extracción, para no tener que repetir la llamada al LLM:
+
+- Línea: unit_price negativo, line_total con el signo cambiado, unit_price y
+  line_total intercambiados (si el IVA impreso lo confirma), quantity y
+  unit_price intercambiados (según net_price), IVA con el signo cambiado o
+  calculado con otra tasa. Una reparación de línea que aumente las
+  discrepancias entre las sumas de items y los totales no se aplica.
+- Documento: signos contrarios entre items, vat_breakdown y totales (manda la
+  mayoría), tasas de IVA de los items que faltan en vat_breakdown, valores que
+  contradicen a las otras dos fuentes, agregados ausentes que sí tienen
+  breakdown (si con ellos cuadra grand_total) y signos de grand_total / descuentos / retenciones / percepciones.
+
+Todo se hace en pasadas lineales sobre los items, con las tolerancias _TOL
+(línea) y _TOL_TOTALS (totales) de los schemas.
+
+Uso:
+    result = reconcile_invoice(invoice)
+    if result.is_consistent and result.confidence >= 0.7:
+        invoice = result.invoice
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from exponential_core.claudeai.schemas.invoice_line_items import (
+    InvoiceExtractionSchema,
+    ValidationReport,
+    VATEntrySchema,
+    _TOL,
+    _TOL_TOTALS,
+    _expected_vat,
+    _q2,
+    build_validation_report,
+)
+
+_LINE_FIELDS = ("quantity", "unit_price", "line_total", "vat_percent", "vat_amount", "net_price")
+_TOTALS_FIELDS = (
+    "taxable_base",
+    "vat_amount",
+    "discounts",
+    "withholding",
+    "perceptions",
+    "other_taxes",
+    "grand_total",
+)
+_AGGREGATES = (
+    ("discounts", "discounts_breakdown"),
+    ("withholding", "withholdings_breakdown"),
+    ("perceptions", "perceptions_breakdown"),
+)
+
+# Discrepancias que los validadores escriben en `notes`
+_ITEM_NOTE_CODES = frozenset({"line_vat_amount"})
+_TOTALS_NOTE_CODES = frozenset(
+    {"breakdown_taxable_base", "breakdown_vat_amount", "grand_total", "items_line_total", "items_vat_amount"}
+)
+
+# Factor de confianza por cada discrepancia que queda sin resolver
+_UNRESOLVED_FACTOR = 0.5
+
+_ZERO = Decimal("0")
+
+
+class FieldChange(BaseModel):
+    """Cambio de un campo: path (ej: "items[2].vat_amount"), valor anterior y nuevo."""
+
+    path: str
+    old: Optional[Decimal] = None
+    new: Optional[Decimal] = None
+
+
+class Repair(BaseModel):
+    """Reparación aplicada, con la confianza (0-1) de que sea la correcta."""
+
+    code: str = Field(..., description="Tipo de reparación (ej: 'line_vat_sign')")
+    confidence: float = Field(..., ge=0, le=1)
+    message: str
+    changes: List[FieldChange]
+
+
+class ReconciliationResult(BaseModel):
+    """
+    Resultado de reconcile_invoice.
+
+    - invoice: factura reparada (la original si no hubo reparaciones)
+    - repairs: reparaciones aplicadas, en orden
+    - report: discrepancias que quedan tras reparar
+    - confidence: producto de las confianzas de las reparaciones, multiplicado
+      por 0.5 por cada discrepancia pendiente (1.0 = coherente sin reparar)
+    """
+
+    invoice: InvoiceExtractionSchema
+    repairs: List[Repair] = Field(default_factory=list)
+    report: ValidationReport
+    confidence: float
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.repairs)
+
+    @property
+    def is_consistent(self) -> bool:
+        return self.report.is_consistent
+
+
+def _close(a: Decimal, b: Decimal, tol: Decimal) -> bool:
+    return abs(a - b) <= tol
+
+
+def _copy_with(model: BaseModel, fields_set: Optional[set] = None, **values) -> BaseModel:
+    """model_copy sin revalidar que conserva model_fields_set (o el indicado)."""
+    copy = model.model_copy(update=values)
+    if fields_set is None:
+        fields_set = set(model.model_fields_set)
+    object.__setattr__(copy, "__pydantic_fields_set__", fields_set)
+    return copy
+
+
+def _replace_notes(notes: Optional[str], old: List[str], new: List[str]) -> Optional[str]:
+    """Quita de `notes` los mensajes de discrepancias previas y añade los actuales."""
+    parts = [part for part in notes.split(" | ") if part not in old] if notes else []
+    parts.extend(message for message in new if message not in parts)
+    return " | ".join(parts) or None
+
+
+class _Reconciler:
+    """Estado de trabajo de una conciliación (valores numéricos y reparaciones)."""
+
+    def __init__(self, invoice: InvoiceExtractionSchema):
+        self.invoice = invoice
+        self.repairs: List[Repair] = []
+
+        self.lines = [{f: getattr(item, f) for f in _LINE_FIELDS} for item in invoice.items]
+        self.changed_lines: set = set()
+
+        totals = invoice.totals
+        self.totals = {f: getattr(totals, f) for f in _TOTALS_FIELDS}
+        self.breakdown = [
+            {"percent": e.percent, "taxable_base": e.taxable_base, "amount": e.amount}
+            for e in totals.vat_breakdown
+        ]
+        self.original_breakdown_len = len(self.breakdown)
+        self.changed_entries: set = set()
+        self.changed_totals: set = set()
+
+    # ------------------------------------------------------------------ #
+    # Registro de cambios
+    # ------------------------------------------------------------------ #
+    def _record(self, code: str, confidence: float, message: str, changes: List[tuple]):
+        self.repairs.append(
+            Repair(
+                code=code,
+                confidence=confidence,
+                message=message,
+                changes=[FieldChange(path=path, old=old, new=new) for path, old, new in changes],
+            )
+        )
+
+    def _set_line(self, i: int, code: str, confidence: float, message: str, **values) -> bool:
+        """
+        Aplica una reparación de línea salvo que aumente las discrepancias de
+        documento (sumas de items frente a totales y vat_breakdown): los
+        totales impresos son evidencia de que la línea ya era correcta.
+        """
+        line = self.lines[i]
+        sum_lt = self.sum_lt - line["line_total"] + values.get("line_total", line["line_total"])
+        sum_va = self.sum_va - line["vat_amount"] + values.get("vat_amount", line["vat_amount"])
+        if self._line_sum_mismatches(sum_lt, sum_va) > self._line_sum_mismatches(self.sum_lt, self.sum_va):
+            return False
+        self.sum_lt, self.sum_va = sum_lt, sum_va
+
+        changes = [(f"items[{i}].{f}", line[f], v) for f, v in values.items()]
+        line.update(values)
+        self.changed_lines.add(i)
+        self._record(code, confidence, message, changes)
+        return True
+
+    def _set_totals(self, code: str, confidence: float, message: str, **values):
+        changes = [(f"totals.{f}", self.totals[f], v) for f, v in values.items()]
+        self.totals.update(values)
+        self.changed_totals.update(values)
+        self._record(code, confidence, message, changes)
+
+    def _set_entry(self, k: int, code: str, confidence: float, message: str, **values):
+        entry = self.breakdown[k]
+        changes = [(f"totals.vat_breakdown[{k}].{f}", entry[f], v) for f, v in values.items()]
+        entry.update(values)
+        self.changed_entries.add(k)
+        self._record(code, confidence, message, changes)
+
+    # ------------------------------------------------------------------ #
+    # Líneas
+    # ------------------------------------------------------------------ #
+    def _line_sum_mismatches(self, sum_lt: Decimal, sum_va: Decimal) -> int:
+        checks = [(sum_lt, self.totals["taxable_base"]), (sum_va, self.totals["vat_amount"])]
+        if self.breakdown:
+            checks += [(sum_lt, self.vb_taxable), (sum_va, self.vb_amount)]
+        return sum(not _close(a, b, _TOL_TOTALS) for a, b in checks)
+
+    def reconcile_lines(self):
+        # Sumas de la pasada de líneas (vat_breakdown y totales no cambian en ella)
+        self.sum_lt, self.sum_va, self.vb_taxable, self.vb_amount = self._sums()
+        rates = list(dict.fromkeys(e["percent"] for e in self.breakdown))
+        for i, item in enumerate(self.invoice.items):
+            has_discount = bool(item.discount_percent or item.discount_amount)
+            self._reconcile_line(i, rates, has_discount, "net_price" in item.model_fields_set)
+
+    def _reconcile_line(self, i: int, rates: List[Decimal], has_discount: bool, net_price_given: bool):
+        line = self.lines[i]
+
+        # unit_price es siempre positivo: el signo de una devolución va en quantity
+        if line["unit_price"] < 0 and line["quantity"]:
+            self._set_line(
+                i, "unit_price_sign", 0.9, "unit_price negativo: el signo pasa a quantity",
+                unit_price=-line["unit_price"], quantity=-line["quantity"],
+            )
+
+        q, p, lt = line["quantity"], line["unit_price"], line["line_total"]
+        if q and not has_discount and not _close(q * p, lt, _TOL):
+            if _close(q * p, -lt, _TOL):
+                values = {"line_total": -lt}
+                vat_amount = line["vat_amount"]
+                if vat_amount and _close(-vat_amount, _expected_vat(-lt, line["vat_percent"]), _TOL):
+                    values["vat_amount"] = -vat_amount
+                self._set_line(
+                    i, "line_total_sign", 0.9,
+                    "line_total con el signo contrario a quantity × unit_price", **values,
+                )
+            elif _close(q * lt, p, _TOL) and _close(
+                line["vat_amount"], _expected_vat(p, line["vat_percent"]), _TOL
+            ):
+                # Solo si el IVA impreso corresponde al line_total intercambiado
+                self._set_line(
+                    i, "unit_price_line_total_swap", 0.8,
+                    "unit_price y line_total intercambiados", unit_price=lt, line_total=p,
+                )
+
+        # net_price impreso = line_total / quantity; si cuadra con unit_price, están intercambiados
+        q, p, lt, net_price = line["quantity"], line["unit_price"], line["line_total"], line["net_price"]
+        if net_price_given and net_price is not None and q and p and lt:
+            if not _close(_q2(lt / q), net_price, _TOL) and _close(_q2(lt / p), net_price, _TOL):
+                self._set_line(
+                    i, "quantity_unit_price_swap", 0.85,
+                    "quantity y unit_price intercambiados (según net_price)", quantity=p, unit_price=q,
+                )
+
+        # IVA de la línea
+        lt, vat_percent, vat_amount = line["line_total"], line["vat_percent"], line["vat_amount"]
+        try:
+            expected = _expected_vat(lt, vat_percent)
+        except Exception:
+            return
+        if _close(vat_amount, expected, _TOL):
+            return
+        if _close(-vat_amount, expected, _TOL):
+            self._set_line(i, "line_vat_sign", 0.95, "vat_amount con el signo cambiado", vat_amount=-vat_amount)
+            return
+        for rate in rates:
+            if rate != vat_percent and _close(_expected_vat(lt, rate), vat_amount, _TOL):
+                self._set_line(
+                    i, "line_vat_percent", 0.8,
+                    f"vat_amount corresponde a la tasa {rate}% del desglose", vat_percent=rate,
+                )
+                return
+        # Sin tasa del desglose que lo explique: se recalcula solo si las sumas
+        # del documento no lo contradicen (_set_line); si no, queda pendiente
+        self._set_line(
+            i, "line_vat_recomputed", 0.6,
+            "vat_amount recalculado a partir de line_total y vat_percent", vat_amount=expected,
+        )
+
+    # ------------------------------------------------------------------ #
+    # Documento
+    # ------------------------------------------------------------------ #
+    def _sums(self):
+        sum_line_totals = sum((line["line_total"] for line in self.lines), _ZERO)
+        sum_vat_amounts = sum((line["vat_amount"] for line in self.lines), _ZERO)
+        sum_vb_taxable = sum((e["taxable_base"] for e in self.breakdown), _ZERO)
+        sum_vb_amount = sum((e["amount"] for e in self.breakdown), _ZERO)
+        return sum_line_totals, sum_vat_amounts, sum_vb_taxable, sum_vb_amount
+
+    def reconcile_document(self):
+        has_items = bool(self.lines)
+        self._reconcile_signs(has_items)
+        if has_items:
+            self._add_missing_rates()
+            self._vote()
+        self._fill_aggregates()
+        self._reconcile_grand_total()
+
+    def _reconcile_signs(self, has_items: bool):
+        """
+        Compara la base imponible de las tres fuentes (items, vat_breakdown,
+        totales). Si dos coinciden y la tercera coincide con el signo cambiado,
+        se invierte la tercera.
+        """
+        sum_lt, sum_va, sum_vb_taxable, sum_vb_amount = self._sums()
+        taxable_base = self.totals["taxable_base"]
+
+        def flipped(value, reference):
+            return value and not _close(value, reference, _TOL_TOTALS) and _close(-value, reference, _TOL_TOTALS)
+
+        if has_items and _close(sum_vb_taxable, taxable_base, _TOL_TOTALS) and flipped(sum_lt, taxable_base):
+            changes = []
+            for i, line in enumerate(self.lines):
+                for f in ("quantity", "line_total", "vat_amount"):
+                    if line[f]:
+                        changes.append((f"items[{i}].{f}", line[f], -line[f]))
+                        line[f] = -line[f]
+                self.changed_lines.add(i)
+            self._record("items_sign", 0.85, "items con el signo contrario a vat_breakdown y totales", changes)
+        elif flipped(sum_vb_taxable, taxable_base) and (
+            not has_items or _close(sum_lt, taxable_base, _TOL_TOTALS)
+        ):
+            changes = []
+            for k, entry in enumerate(self.breakdown):
+                for f in ("taxable_base", "amount"):
+                    changes.append((f"totals.vat_breakdown[{k}].{f}", entry[f], -entry[f]))
+                    entry[f] = -entry[f]
+                self.changed_entries.add(k)
+            self._record(
+                "vat_breakdown_sign", 0.85 if has_items else 0.75,
+                "vat_breakdown con el signo contrario a los totales", changes,
+            )
+        elif has_items and _close(sum_lt, sum_vb_taxable, _TOL_TOTALS) and flipped(taxable_base, sum_lt):
+            values = {"taxable_base": -taxable_base}
+            vat_amount = self.totals["vat_amount"]
+            if flipped(vat_amount, sum_va):
+                values["vat_amount"] = -vat_amount
+            self._set_totals(
+                "totals_sign", 0.85, "totales con el signo contrario a items y vat_breakdown", **values
+            )
+
+        # Entradas del desglose con la cuota con el signo cambiado
+        for k, entry in enumerate(self.breakdown):
+            expected = _expected_vat(entry["taxable_base"], entry["percent"])
+            amount = entry["amount"]
+            if not _close(amount, expected, _TOL) and _close(-amount, expected, _TOL):
+                self._set_entry(
+                    k, "vat_entry_sign", 0.9, "cuota de IVA con el signo cambiado", amount=-amount
+                )
+
+    def _add_missing_rates(self):
+        """Añade a vat_breakdown las tasas de los items que faltan, si eso lo cuadra."""
+        sum_lt, _, sum_vb_taxable, _ = self._sums()
+        if _close(sum_vb_taxable, sum_lt, _TOL_TOTALS):
+            return
+
+        present = {e["percent"] for e in self.breakdown}
+        groups: Dict[Decimal, list] = {}
+        for line in self.lines:
+            rate = line["vat_percent"]
+            if rate in present:
+                continue
+            group = groups.get(rate)
+            if group is None:
+                groups[rate] = [line["line_total"], line["vat_amount"]]
+            else:
+                group[0] += line["line_total"]
+                group[1] += line["vat_amount"]
+
+        if not groups:
+            return
+        missing_base = sum(base for base, _ in groups.values())
+        if not _close(sum_vb_taxable + missing_base, sum_lt, _TOL_TOTALS):
+            return
+
+        for rate, (base, amount) in groups.items():
+            entry = VATEntrySchema(percent=rate, taxable_base=base, amount=amount)
+            k = len(self.breakdown)
+            self.breakdown.append(
+                {"percent": entry.percent, "taxable_base": entry.taxable_base, "amount": entry.amount}
+            )
+            self.changed_entries.add(k)
+            self._record(
+                "vat_breakdown_missing_rate", 0.85,
+                f"falta la tasa {entry.percent}% en vat_breakdown; se añade desde los items",
+                [(f"totals.vat_breakdown[{k}].taxable_base", None, entry.taxable_base),
+                 (f"totals.vat_breakdown[{k}].amount", None, entry.amount)],
+            )
+
+    def _vote(self):
+        """
+        Si items y vat_breakdown coinciden y los totales no (y grand_total no
+        respalda el valor impreso), se corrige el total; si items y totales
+        coinciden y hay una única entrada de desglose, se corrige la entrada.
+        """
+        sum_lt, sum_va, sum_vb_taxable, sum_vb_amount = self._sums()
+        for field, sum_items, sum_breakdown, entry_field in (
+            ("taxable_base", sum_lt, sum_vb_taxable, "taxable_base"),
+            ("vat_amount", sum_va, sum_vb_amount, "amount"),
+        ):
+            total = self.totals[field]
+            if _close(sum_items, sum_breakdown, _TOL_TOTALS) and not _close(total, sum_items, _TOL_TOTALS):
+                grand_total = self.totals["grand_total"]
+                if _close(grand_total, self._expected_grand_total(), _TOL_TOTALS) and not _close(
+                    grand_total, self._expected_grand_total(**{field: sum_breakdown}), _TOL_TOTALS
+                ):
+                    # grand_total respalda el valor impreso: no se puede decidir
+                    continue
+                self._set_totals(
+                    "totals_vote", 0.8,
+                    f"totals.{field} no cuadra con items ni con vat_breakdown",
+                    **{field: _q2(sum_breakdown)},
+                )
+            elif (
+                len(self.breakdown) == 1
+                and _close(sum_items, total, _TOL_TOTALS)
+                and not _close(sum_breakdown, total, _TOL_TOTALS)
+            ):
+                self._set_entry(
+                    0, "vat_breakdown_vote", 0.8,
+                    f"vat_breakdown[0].{entry_field} no cuadra con items ni con totales",
+                    **{entry_field: total},
+                )
+
+    def _fill_aggregates(self):
+        """
+        Rellena discounts / withholding / perceptions ausentes sumando su
+        breakdown, solo si con ello grand_total cuadra. Si grand_total ya
+        cuadraba sin el agregado, el breakdown es informativo y no se toca.
+        """
+        totals = self.invoice.totals
+        candidates = {}
+        for field, breakdown_field in _AGGREGATES:
+            entries = getattr(totals, breakdown_field)
+            if self.totals[field] is None and entries:
+                candidates[field] = (breakdown_field, sum((e.amount for e in entries), _ZERO))
+        if not candidates:
+            return
+
+        grand_total = self.totals["grand_total"]
+        if _close(grand_total, self._expected_grand_total(), _TOL_TOTALS):
+            return
+
+        # Todos los agregados a la vez o, si no cuadra, el primero que lo haga solo
+        options = [candidates] + [{field: value} for field, value in candidates.items()]
+        for option in options:
+            values = {field: amount for field, (_, amount) in option.items()}
+            if _close(grand_total, self._expected_grand_total(**values), _TOL_TOTALS):
+                for field, (breakdown_field, amount) in option.items():
+                    self._set_totals(
+                        "aggregate_from_breakdown", 0.95,
+                        f"{field} ausente; se suma desde {breakdown_field}",
+                        **{field: amount},
+                    )
+                return
+
+    def _expected_grand_total(self, **override) -> Decimal:
+        values = {**self.totals, **override}
+        return (
+            values["taxable_base"]
+            + values["vat_amount"]
+            + (values["perceptions"] or _ZERO)
+            + (values["other_taxes"] or _ZERO)
+            - (values["discounts"] or _ZERO)
+            - (values["withholding"] or _ZERO)
+        )
+
+    def _reconcile_grand_total(self):
+        grand_total = self.totals["grand_total"]
+        expected = self._expected_grand_total()
+        if _close(grand_total, expected, _TOL_TOTALS):
+            return
+        if _close(-grand_total, expected, _TOL_TOTALS):
+            self._set_totals(
+                "grand_total_sign", 0.9, "grand_total con el signo cambiado", grand_total=-grand_total
+            )
+            return
+        # Descuentos, retenciones y percepciones se expresan en positivo
+        for field in ("discounts", "withholding", "perceptions"):
+            value = self.totals[field]
+            if value is not None and value < 0 and _close(
+                grand_total, self._expected_grand_total(**{field: -value}), _TOL_TOTALS
+            ):
+                self._set_totals(
+                    "adjustment_sign", 0.85, f"{field} negativo: se expresa en positivo", **{field: -value}
+                )
+                return
+
+    # ------------------------------------------------------------------ #
+    # Resultado
+    # ------------------------------------------------------------------ #
+    def build(self) -> InvoiceExtractionSchema:
+        invoice = self.invoice
+        items = list(invoice.items)
+        for i in sorted(self.changed_lines):
+            item = items[i]
+            line = self.lines[i]
+            update = {f: line[f] for f in _LINE_FIELDS if line[f] is not getattr(item, f)}
+            if "net_price" not in item.model_fields_set and line["quantity"]:
+                # net_price derivado: se recalcula como lo haría el validador
+                update["net_price"] = _q2(line["line_total"] / line["quantity"])
+            items[i] = _copy_with(item, **update)
+
+        totals = invoice.totals
+        if self.changed_totals or self.changed_entries:
+            breakdown = list(totals.vat_breakdown)
+            for k in sorted(self.changed_entries):
+                values = self.breakdown[k]
+                if k < self.original_breakdown_len:
+                    breakdown[k] = _copy_with(breakdown[k], **values)
+                else:
+                    breakdown.append(VATEntrySchema.model_construct(**values))
+            update = {f: self.totals[f] for f in self.changed_totals}
+            totals = _copy_with(
+                totals, set(totals.model_fields_set) | set(update), vat_breakdown=breakdown, **update
+            )
+        else:
+            # Copia propia: _refresh_notes puede actualizar sus notas
+            totals = _copy_with(totals)
+
+        return invoice.model_copy(update={"items": items, "totals": totals})
+
+
+def _refresh_notes(
+    invoice: InvoiceExtractionSchema, before: ValidationReport, after: ValidationReport
+) -> InvoiceExtractionSchema:
+    """Sustituye en `notes` los mensajes de las discrepancias resueltas por los actuales."""
+
+    def messages(report: ValidationReport, codes) -> Dict[str, List[str]]:
+        by_scope: Dict[str, List[str]] = {}
+        for d in report.discrepancies:
+            if d.code in codes:
+                scope = d.path.split(".", 1)[0]
+                by_scope.setdefault(scope, []).append(d.message)
+        return by_scope
+
+    old_items, new_items = messages(before, _ITEM_NOTE_CODES), messages(after, _ITEM_NOTE_CODES)
+    old_totals, new_totals = messages(before, _TOTALS_NOTE_CODES), messages(after, _TOTALS_NOTE_CODES)
+
+    # build() ya devuelve copias propias de los items reparados y de totals;
+    # solo cambian mensajes de items reparados (dependen solo de la línea)
+    for scope in old_items.keys() | new_items.keys():
+        old, new = old_items.get(scope, []), new_items.get(scope, [])
+        if old != new:
+            item = invoice.items[int(scope[len("items["):-1])]
+            object.__setattr__(item, "notes", _replace_notes(item.notes, old, new))
+
+    old, new = old_totals.get("totals", []), new_totals.get("totals", [])
+    if old != new:
+        totals = invoice.totals
+        object.__setattr__(totals, "notes", _replace_notes(totals.notes, old, new))
+
+    return invoice
+
+
+def reconcile_invoice(invoice: Union[InvoiceExtractionSchema, Dict[str, Any]]) -> ReconciliationResult:
+    """
+    Busca el conjunto de valores coherente más probable para una factura
+    extraída y devuelve la factura reparada, las reparaciones aplicadas y su
+    confianza. No modifica la factura recibida.
+
+    Args:
+        invoice (InvoiceExtractionSchema | dict): Factura validada o el dict
+            devuelto por el LLM.
+
+    Returns:
+        ReconciliationResult: Factura reparada, reparaciones, discrepancias
+            pendientes y confianza (0-1).
+    """
+    if not isinstance(invoice, InvoiceExtractionSchema):
+        invoice = InvoiceExtractionSchema.model_validate(invoice)
+
+    before = build_validation_report(invoice)
+
+    # Aunque el informe esté limpio se revisan las líneas: quantity/unit_price
+    # intercambiados solo se detectan con net_price
+    reconciler = _Reconciler(invoice)
+    reconciler.reconcile_lines()
+    reconciler.reconcile_document()
+
+    if not reconciler.repairs:
+        confidence = _UNRESOLVED_FACTOR ** len(before.discrepancies)
+        return ReconciliationResult.model_construct(
+            invoice=invoice, repairs=[], report=before, confidence=round(confidence, 4)
+        )
+
+    repaired = reconciler.build()
+    after = build_validation_report(repaired)
+    repaired = _refresh_notes(repaired, before, after)
+
+    confidence = 1.0
+    for repair in reconciler.repairs:
+        confidence *= repair.confidence
+    confidence *= _UNRESOLVED_FACTOR ** len(after.discrepancies)
+
+    # model_construct: validar el campo `invoice` volvería a ejecutar los
+    # model-validators de la factura y a añadir sus notas
+    return ReconciliationResult.model_construct(
+        invoice=repaired,
+        repairs=reconciler.repairs,
+        report=after,
+        confidence=round(confidence, 4),
+    )
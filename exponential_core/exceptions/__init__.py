@@ -1,7 +1,14 @@
 # exponential_core/exceptions/__init__.py
 from exponential_core.exceptions.setup import setup_exception_handlers
 from exponential_core.exceptions.middleware import GlobalExceptionMiddleware
+from exponential_core.exceptions.context_middleware import RequestContextMiddleware
 from exponential_core.exceptions.base import CustomAppException
+from exponential_core.exceptions.analytics import (
+    ErrorAggregator,
+    create_error_analytics_router,
+    get_error_aggregator,
+    set_error_aggregator,
+)
 
 # 👇 Importación explícita solo para autocompletado (VSCode, PyCharm, etc.)
 from exponential_core.exceptions.types import (
@@ -11,9 +18,12 @@ from exponential_core.exceptions.types import (
     OdooException,
     SecretNotFoundError,
     SecretAlreadyExistsError,
+    SecretConflictError,
     SecretsNotFound,
     MissingSecretKey,
     AWSConnectionError,
+    AWSCircuitOpenError,
+    AWSThrottlingError,
     SecretsServiceNotLoaded,
 )
 
@@ -22,7 +32,12 @@ from . import types
 __all__ = [
     "setup_exception_handlers",
     "GlobalExceptionMiddleware",
+    "RequestContextMiddleware",
     "CustomAppException",
+    "ErrorAggregator",
+    "create_error_analytics_router",
+    "get_error_aggregator",
+    "set_error_aggregator",
     # explícitos
     "InvoiceParsingError",
     "TaxIdNotFoundError",
@@ -30,9 +45,12 @@ __all__ = [
     "OdooException",
     "SecretNotFoundError",
     "SecretAlreadyExistsError",
+    "SecretConflictError",
     "SecretsNotFound",
     "MissingSecretKey",
     "AWSConnectionError",
+    "AWSCircuitOpenError",
+    "AWSThrottlingError",
     "SecretsServiceNotLoaded",
 ]
 
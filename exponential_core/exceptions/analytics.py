@@ -0,0 +1,176 @@
+# exponential_core\exceptions\analytics.py
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import APIRouter, Query
+
+from exponential_core.telemetry.recorder import route_of
+
+# Instante de inicio del request (time.perf_counter) que dejan en el scope
+# GlobalExceptionMiddleware y RequestContextMiddleware, para medir la latencia
+# hasta el error.
+REQUEST_START_SCOPE_KEY = "exponential.request_start"
+
+
+class ErrorAggregator:
+    """
+    Contadores en proceso de errores por (ruta, error_type, status_code) en una
+    ventana deslizante, con la latencia hasta el error.
+
+    La ventana se divide en buckets de `bucket_seconds`; cada bucket es un dict
+    propio, de modo que el camino caliente solo toma el lock al rotar de bucket
+    (una vez cada `bucket_seconds`) y el resto son operaciones sobre un dict.
+
+    Args:
+        window_seconds (int): Ventana máxima consultable.
+        bucket_seconds (int): Resolución de la ventana.
+    """
+
+    def __init__(self, window_seconds: int = 300, bucket_seconds: int = 10):
+        if window_seconds < bucket_seconds or bucket_seconds <= 0:
+            raise ValueError("window_seconds debe ser >= bucket_seconds > 0")
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self._size = -(-window_seconds // bucket_seconds)
+        # slot -> [epoch, {key: [count, latency_count, latency_sum_ms, latency_max_ms]}]
+        self._slots: List[list] = [[-1, {}] for _ in range(self._size)]
+        self._lock = threading.Lock()
+
+    def _bucket(self, now: float) -> dict:
+        epoch = int(now // self.bucket_seconds)
+        slot = self._slots[epoch % self._size]
+        if slot[0] != epoch:
+            with self._lock:
+                if slot[0] != epoch:
+                    slot[1] = {}
+                    slot[0] = epoch
+        return slot[1]
+
+    def record(
+        self,
+        route: str,
+        error_type: str,
+        status_code: int,
+        latency_ms: Optional[float] = None,
+        now: Optional[float] = None,
+    ):
+        bucket = self._bucket(time.time() if now is None else now)
+        key = (route, error_type, status_code)
+        stats = bucket.get(key)
+        if stats is None:
+            stats = bucket.setdefault(key, [0, 0, 0.0, 0.0])
+        stats[0] += 1
+        if latency_ms is not None:
+            stats[1] += 1
+            stats[2] += latency_ms
+            if latency_ms > stats[3]:
+                stats[3] = latency_ms
+
+    def snapshot(
+        self, window_seconds: Optional[int] = None, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Agrega los buckets de los últimos `window_seconds` (por defecto toda la
+        ventana), ordenado por número de errores descendente.
+        """
+        window = min(window_seconds or self.window_seconds, self.window_seconds)
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        oldest = current - (-(-window // self.bucket_seconds)) + 1
+
+        totals: Dict[tuple, list] = {}
+        for epoch, bucket in list(self._slots):
+            if not oldest <= epoch <= current:
+                continue
+            for key, (count, lat_count, lat_sum, lat_max) in bucket.copy().items():
+                agg = totals.get(key)
+                if agg is None:
+                    totals[key] = [count, lat_count, lat_sum, lat_max]
+                else:
+                    agg[0] += count
+                    agg[1] += lat_count
+                    agg[2] += lat_sum
+                    agg[3] = max(agg[3], lat_max)
+
+        rows = [
+            {
+                "route": route,
+                "error_type": error_type,
+                "status_code": status_code,
+                "count": count,
+                "per_minute": round(count * 60 / window, 3),
+                "latency_avg_ms": round(lat_sum / lat_count, 3) if lat_count else None,
+                "latency_max_ms": round(lat_max, 3) if lat_count else None,
+            }
+            for (route, error_type, status_code), (count, lat_count, lat_sum, lat_max) in totals.items()
+        ]
+        rows.sort(key=lambda row: row["count"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._slots = [[-1, {}] for _ in range(self._size)]
+
+
+_aggregator: Optional[ErrorAggregator] = ErrorAggregator()
+
+
+def get_error_aggregator() -> Optional[ErrorAggregator]:
+    return _aggregator
+
+
+def set_error_aggregator(aggregator: Optional[ErrorAggregator]):
+    """Sustituye el agregador global; None desactiva la agregación."""
+    global _aggregator
+    _aggregator = aggregator
+
+
+def record_error(scope: dict, status_code: int, error_type: str):
+    """Lo llaman los exception handlers por cada error resuelto."""
+    aggregator = _aggregator
+    if aggregator is None:
+        return
+    start = scope.get(REQUEST_START_SCOPE_KEY)
+    latency_ms = (time.perf_counter() - start) * 1000 if start is not None else None
+    aggregator.record(route_of(scope), error_type, status_code, latency_ms)
+
+
+def create_error_analytics_router(
+    aggregator: Optional[ErrorAggregator] = None,
+    path: str = "/_internal/errors",
+    dependencies: Optional[Sequence[Any]] = None,
+) -> APIRouter:
+    """
+    Router con GET `path` que devuelve los errores agregados.
+
+    Query params:
+        window (int): Segundos a considerar (por defecto toda la ventana).
+        error_type (str): Filtra por tipo de error.
+
+    Args:
+        aggregator (ErrorAggregator): Por defecto el agregador global.
+        dependencies (list): Dependencias de FastAPI (p. ej. autenticación interna).
+
+    Uso:
+        app.include_router(create_error_analytics_router(dependencies=[Depends(require_admin)]))
+    """
+    router = APIRouter(dependencies=list(dependencies or []))
+
+    @router.get(path, include_in_schema=False)
+    def error_analytics(
+        window: Optional[int] = Query(None, gt=0),
+        error_type: Optional[str] = None,
+    ):
+        source = aggregator or _aggregator
+        if source is None:
+            return {"window_seconds": window, "errors": []}
+        rows = source.snapshot(window)
+        if error_type:
+            rows = [row for row in rows if row["error_type"] == error_type]
+        return {
+            "window_seconds": min(window or source.window_seconds, source.window_seconds),
+            "errors": rows,
+        }
+
+    return router
@@ -0,0 +1,78 @@
+# exponential_core\exceptions\context_middleware.py
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from exponential_core.exceptions.analytics import REQUEST_START_SCOPE_KEY
+from exponential_core.logger.context import (
+    REQUEST_ID_HEADER,
+    bind_request_context,
+    reset_request_context,
+)
+
+# Un request_id entrante acaba en logs y cabeceras de respuesta: solo se
+# acepta si es corto y sin caracteres de control ni separadores
+_REQUEST_ID_RE = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI puro que abre un contexto por request con:
+        - request_id: cabecera x-request-id entrante si cumple
+          [A-Za-z0-9._-]{1,128}; si no llega o no la cumple, uno nuevo (uuid4).
+        - tenant_vat: cabecera configurable (por defecto x-tenant-vat), si llega.
+        - route: plantilla de la ruta (/invoices/{invoice_id}) una vez que el
+          router la resuelve; antes, el path del request.
+
+    El contexto lo inyecta en cada log el RequestContextFilter de
+    configure_logging, y el request_id se devuelve en la respuesta para poder
+    seguir una factura entre servicios.
+
+    Uso:
+        app.add_middleware(RequestContextMiddleware)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        request_id_header: str = REQUEST_ID_HEADER,
+        tenant_header: str = "x-tenant-vat",
+    ):
+        self.app = app
+        self.request_id_header = request_id_header.lower().encode("latin-1")
+        self.tenant_header = tenant_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault(REQUEST_START_SCOPE_KEY, time.perf_counter())
+        request_id = tenant_vat = None
+        for name, value in scope.get("headers", []):
+            if name == self.request_id_header:
+                request_id = value.decode("latin-1")
+            elif name == self.tenant_header:
+                tenant_vat = value.decode("latin-1")
+        if request_id is None or not _REQUEST_ID_RE.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+
+        def current_route():
+            return getattr(scope.get("route"), "path", None) or scope.get("path")
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.request_id_header, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = bind_request_context(
+            request_id=request_id, tenant_vat=tenant_vat, route=current_route
+        )
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_context(token)
@@ -2,17 +2,34 @@
 from datetime import datetime, timezone
 import httpx
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from fastapi.encoders import jsonable_encoder  
 from pydantic import ValidationError
-from exponential_core.utils.format_error import format_error_response
+from exponential_core.utils.format_error import error_response, json_response
 from exponential_core.exceptions.base import CustomAppException
 from exponential_core.logger import get_logger
+from exponential_core.telemetry.recorder import record_exception, route_of
+from exponential_core.exceptions.analytics import record_error
 
 logger = get_logger()
 
 
+def _error_event(request: Request, status_code: int, error_type: str) -> dict:
+    """
+    Registra el error en el agregador de errores y en la telemetría (si
+    configure_telemetry() está activo) y devuelve los campos estructurados para
+    `extra=` (los usa el formato JSON del logger).
+    """
+    record_error(request.scope, status_code, error_type)
+    record_exception(request.scope, status_code, error_type)
+    return {
+        "method": request.method,
+        "path": request.url.path,
+        "route": route_of(request.scope),
+        "status_code": status_code,
+        "error_type": error_type,
+    }
+
+
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Se activa automáticamente cuando se lanza una HTTPException (404, 403, etc.).
@@ -20,11 +37,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     timestamp = datetime.now(timezone.utc).isoformat()
 
     logger.error(
-        f"[{timestamp}] HTTPException en {request.method} {request.url} | {repr(exc)}",
+        "[%s] HTTPException en %s %s | %r",
+        timestamp,
+        request.method,
+        request.url,
+        exc,
         exc_info=exc,
+        extra=_error_event(request, exc.status_code, "HttpException"),
     )
 
-    
     detail = exc.detail
 
     if isinstance(detail, dict):
@@ -35,20 +56,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "status_code": exc.status_code,
             "timestamp": timestamp,
         }
-    else:
-        # Caso genérico (404, etc.)
-        content = {
-            "detail": detail,
-            "error_type": "HttpException",
-            "status_code": exc.status_code,
-            "timestamp": timestamp,
-        }
+        # Serializa Decimal, datetime, etc. directamente a JSON
+        return json_response(content, exc.status_code)
 
-    # 🔥 Esto convierte Decimal, datetime, etc. a tipos JSON-safe
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(content),
-    )
+    # Caso genérico (404, etc.)
+    return error_response(detail, "HttpException", exc.status_code, timestamp)
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -62,11 +74,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         -Campos faltantes en un POST
         -Valores con formato incorrecto en query parameters
     """
-    logger.warning(f"RequestValidationError en {request.url.path} | Detalle: {exc}")
-    return JSONResponse(
-        status_code=422,
-        content=format_error_response(str(exc), "ValidationError", 422),
+    logger.warning(
+        "RequestValidationError en %s | Detalle: %s",
+        request.url.path,
+        exc,
+        extra=_error_event(request, 422, "ValidationError"),
     )
+    return error_response(str(exc), "ValidationError", 422)
 
 
 async def pydantic_validation_handler(request: Request, exc: ValidationError):
@@ -79,11 +93,13 @@ async def pydantic_validation_handler(request: Request, exc: ValidationError):
         - Validación manual con modelos Pydantic (MyModel(**data))
         - Conversión y validación de datos internos que no provienen del request
     """
-    logger.warning(f"Pydantic ValidationError en {request.url.path} | Detalle: {exc}")
-    return JSONResponse(
-        status_code=422,
-        content=format_error_response(str(exc), "PydanticValidation", 422),
+    logger.warning(
+        "Pydantic ValidationError en %s | Detalle: %s",
+        request.url.path,
+        exc,
+        extra=_error_event(request, 422, "PydanticValidation"),
     )
+    return error_response(str(exc), "PydanticValidation", 422)
 
 
 async def httpx_error_handler(request: Request, exc: httpx.RequestError):
@@ -101,12 +117,14 @@ async def httpx_error_handler(request: Request, exc: httpx.RequestError):
         except httpx.RequestError as exc:
             raise exc  # Esto activa este handler
     """
-    logger.error(f"Error de red con servicio externo en {request.url} | {repr(exc)}")
-    return JSONResponse(
-        status_code=502,
-        content=format_error_response(
-            "Error al comunicarse con servicio externo", "ExternalServiceError", 502
-        ),
+    logger.error(
+        "Error de red con servicio externo en %s | %r",
+        request.url,
+        exc,
+        extra=_error_event(request, 502, "ExternalServiceError"),
+    )
+    return error_response(
+        "Error al comunicarse con servicio externo", "ExternalServiceError", 502
     )
 
 
@@ -126,22 +144,21 @@ async def custom_app_exception_handler(request: Request, exc: CustomAppException
     timestamp = datetime.now(timezone.utc).isoformat()
 
     logger.error(
-        f"[{timestamp}] [{exc.__class__.__name__}] {exc.status_code} en {request.method} {request.url.path} | "
-        f"{exc.message} | Data: {exc.data}",
+        "[%s] [%s] %s en %s %s | %s | Data: %s",
+        timestamp,
+        exc.__class__.__name__,
+        exc.status_code,
+        request.method,
+        request.url.path,
+        exc.message,
+        exc.data,
         exc_info=exc,
+        extra=_error_event(request, exc.status_code, exc.__class__.__name__),
     )
 
-    response = {
-        "detail": exc.message,
-        "error_type": exc.__class__.__name__,
-        "status_code": exc.status_code,
-        "timestamp": timestamp,
-    }
-
-    if exc.data:
-        response["data"] = exc.data
-
-    return JSONResponse(status_code=exc.status_code, content=response)
+    return error_response(
+        exc.message, exc.__class__.__name__, exc.status_code, timestamp, data=exc.data
+    )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
@@ -160,17 +177,14 @@ async def general_exception_handler(request: Request, exc: Exception):
     timestamp = datetime.now(timezone.utc).isoformat()
 
     logger.critical(
-        f"[{timestamp}] Excepción no controlada en {request.method} {request.url.path} | "
-        f"{type(exc).__name__}: {str(exc)}",
+        "[%s] Excepción no controlada en %s %s | %s: %s",
+        timestamp,
+        request.method,
+        request.url.path,
+        type(exc).__name__,
+        exc,
         exc_info=exc,
+        extra=_error_event(request, 500, "UnhandledException"),
     )
 
-    return JSONResponse(
-        status_code=500,
-        content={
-            "detail": "Internal server error",
-            "error_type": "UnhandledException",
-            "status_code": 500,
-            "timestamp": timestamp,
-        },
-    )
+    return error_response("Internal server error", "UnhandledException", 500, timestamp)
@@ -1,11 +1,16 @@
 # exponential_core\exceptions\middleware.py
+import time
+from typing import Awaitable, Callable, Dict, Tuple, Type
+
 import httpx
 from pydantic import ValidationError
 from fastapi import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from exponential_core.exceptions.analytics import REQUEST_START_SCOPE_KEY
 from exponential_core.exceptions.base import CustomAppException
 from exponential_core.exceptions.handler import (
     http_exception_handler,
@@ -16,22 +21,70 @@ from exponential_core.exceptions.handler import (
     general_exception_handler,
 )
 
-class GlobalExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+ExceptionHandler = Callable[[Request, Exception], Awaitable[Response]]
+
+# Tipo de excepción -> handler. Se elige la entrada más cercana en el MRO de la
+# excepción; cualquier otra cosa cae en general_exception_handler.
+EXCEPTION_HANDLERS: Tuple[Tuple[Type[BaseException], ExceptionHandler], ...] = (
+    (CustomAppException, custom_app_exception_handler),
+    (RequestValidationError, validation_exception_handler),
+    (ValidationError, pydantic_validation_handler),
+    (httpx.RequestError, httpx_error_handler),
+    (HTTPException, http_exception_handler),
+)
+
+
+class GlobalExceptionMiddleware:
+    """
+    Middleware ASGI puro que convierte cualquier excepción que escape de la app
+    en la respuesta JSON uniforme de exceptions/handler.py.
+
+    A diferencia de BaseHTTPMiddleware no envuelve el body en tareas ni memory
+    streams, así que no penaliza el throughput ni rompe StreamingResponse. Si la
+    excepción llega con la respuesta ya empezada, no se puede enviar otra y se
+    relanza.
+
+    El handler de cada tipo de excepción se resuelve una vez por MRO y se cachea.
+
+    Uso:
+        app.add_middleware(GlobalExceptionMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._handlers: Dict[type, ExceptionHandler] = dict(EXCEPTION_HANDLERS)
+        self._resolved: Dict[type, ExceptionHandler] = {}
+
+    def _lookup(self, exc_type: type) -> ExceptionHandler:
+        handler = self._resolved.get(exc_type)
+        if handler is None:
+            handler = general_exception_handler
+            for cls in exc_type.__mro__:
+                if cls in self._handlers:
+                    handler = self._handlers[cls]
+                    break
+            self._resolved[exc_type] = handler
+        return handler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault(REQUEST_START_SCOPE_KEY, time.perf_counter())
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            # Delegar a los handlers específicos si coincide el tipo
-            if isinstance(exc, CustomAppException):
-                return await custom_app_exception_handler(request, exc)
-            elif isinstance(exc, RequestValidationError):
-                return await validation_exception_handler(request, exc)
-            elif isinstance(exc, ValidationError):
-                return await pydantic_validation_handler(request, exc)
-            elif isinstance(exc, httpx.RequestError):
-                return await httpx_error_handler(request, exc)
-            elif isinstance(exc, HTTPException):
-                return await http_exception_handler(request, exc)
-            else:
-                # Fallback para cualquier error no controlado
-                return await general_exception_handler(request, exc)
+            if response_started:
+                raise
+            handler = self._lookup(type(exc))
+            response = await handler(Request(scope, receive), exc)
+            await response(scope, receive, send)
@@ -55,6 +55,18 @@ class SecretAlreadyExistsError(CustomAppException):
         )
 
 
+class SecretConflictError(CustomAppException):
+    def __init__(self, secret_name: str, attempts: int):
+        super().__init__(
+            message=(
+                f"El secreto '{secret_name}' fue modificado concurrentemente; "
+                f"no se pudo aplicar la escritura tras {attempts} intentos."
+            ),
+            status_code=409,
+            data={"secret_name": secret_name, "attempts": attempts},
+        )
+
+
 class SecretsNotFound(CustomAppException):
     def __init__(self, client_vat: str):
         super().__init__(
@@ -78,6 +90,27 @@ class AWSConnectionError(CustomAppException):
         super().__init__(message=detail, status_code=500)
 
 
+class AWSCircuitOpenError(AWSConnectionError):
+    """Circuito abierto: no se llama a AWS hasta que venza reset_timeout."""
+
+    def __init__(self, secret_name: str):
+        CustomAppException.__init__(
+            self,
+            message=f"Circuito abierto para el secreto '{secret_name}': AWS Secrets Manager no disponible.",
+            status_code=503,
+            data={"secret_name": secret_name},
+        )
+
+
+class AWSThrottlingError(CustomAppException):
+    def __init__(self, secret_name: str, error_code: str):
+        super().__init__(
+            message=f"AWS Secrets Manager limitó las peticiones para el secreto '{secret_name}' ({error_code}).",
+            status_code=503,
+            data={"secret_name": secret_name, "error_code": error_code},
+        )
+
+
 class SecretsServiceNotLoaded(CustomAppException):
     def __init__(self):
         super().__init__(
@@ -1,3 +1,20 @@
 # exponential_core\logger\__init__.py
-from exponential_core.logger.configure import configure_logging
+from exponential_core.logger.configure import configure_logging, shutdown_logging
 from exponential_core.logger.core import get_logger
+from exponential_core.logger.rotation import CompressingRotatingFileHandler
+from exponential_core.logger.ratelimit import RateLimitFilter, DEFAULT_RATE_LIMITS
+from exponential_core.logger.context import (
+    RequestContextFilter,
+    bind_request_context,
+    get_request_context,
+    outgoing_headers,
+    reset_request_context,
+    update_request_context,
+)
+from exponential_core.logger.timing import (
+    TimingRegistry,
+    enable_timing,
+    get_timing_snapshot,
+    reset_timings,
+    timed,
+)
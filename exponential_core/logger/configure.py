@@ -1,10 +1,171 @@
-# exponential_core\logger\configure.py
+import atexit
 import logging
+import queue
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Mapping, Optional, Tuple
 from colorlog import ColoredFormatter
 
+from exponential_core.logger.context import RequestContextFilter
+from exponential_core.logger.formatters import JsonFormatter
+from exponential_core.logger.ratelimit import RateLimitFilter
+from exponential_core.logger.rotation import CompressingRotatingFileHandler
+
 _logger_initialized = False  # Protección global
+_queue_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+OVERFLOW_POLICIES = ("block", "drop-debug", "drop-info", "drop-oldest")
+LOG_FORMATS = ("text", "json")
+# Nivel mínimo que se conserva (esperando sitio) con la cola llena
+_DROP_BELOW = {"drop-debug": logging.INFO, "drop-info": logging.WARNING}
+
+_TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(pathname)s:%(lineno)d | %(message)s"
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler con cola acotada y política de desborde configurable.
+
+    Políticas cuando la cola está llena:
+        - "block": espera a que el listener libere espacio (no pierde registros).
+        - "drop-debug": descarta los registros DEBUG; INFO y superiores esperan.
+        - "drop-info": descarta DEBUG e INFO; WARNING y superiores esperan.
+        - "drop-oldest": descarta el registro más antiguo de la cola.
+
+    El número de registros descartados queda en `dropped`.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "block"):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow_policy inválida: '{overflow_policy}'. Opciones: {OVERFLOW_POLICIES}"
+            )
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Solo se resuelve el mensaje; el traceback (exc_info) se formatea en el
+        # hilo del listener para no hacerlo en el hilo del event loop.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow_policy in _DROP_BELOW:
+            if record.levelno < _DROP_BELOW[self.overflow_policy]:
+                self.dropped += 1
+            else:
+                self.queue.put(record)
+            return
+
+        # drop-oldest
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+
+def shutdown_logging():
+    """
+    Detiene el QueueListener (modo async_safe) vaciando la cola pendiente.
+
+    El BoundedQueueHandler se sustituye en el logger "app" por los handlers del
+    listener, que desde ese momento escriben directamente: un log posterior
+    (p. ej. desde otro hook de atexit) no queda esperando una cola que ya nadie
+    consume. Se registra con atexit; es seguro llamarla varias veces.
+    """
+    global _queue_listener
+
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+
+    logger = logging.getLogger("app")
+    for queue_handler in [h for h in logger.handlers if isinstance(h, BoundedQueueHandler)]:
+        logger.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            for log_filter in queue_handler.filters:
+                handler.addFilter(log_filter)
+            logger.addHandler(handler)
+
+    listener.stop()  # procesa lo que quede en la cola antes de terminar
+    for handler in listener.handlers:
+        handler.flush()
+
+
+def _build_file_handler(
+    log_file: str,
+    log_format: str = "text",
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+    rotation_when: Optional[str] = None,
+    rotation_interval: int = 1,
+    compression: Optional[str] = None,
+) -> logging.Handler:
+    log_file_path = Path(log_file).resolve()
+    log_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if rotation_when is None and compression is None:
+        file_handler = RotatingFileHandler(
+            filename=log_file_path,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+    else:
+        file_handler = CompressingRotatingFileHandler(
+            filename=str(log_file_path),
+            max_bytes=max_bytes,
+            when=rotation_when,
+            interval=rotation_interval,
+            backup_count=backup_count,
+            compression=compression,
+        )
+    if log_format == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
+    return file_handler
+
+
+def _build_console_handler(log_format: str = "text") -> logging.Handler:
+    console_handler = logging.StreamHandler()
+    if log_format == "json":
+        console_handler.setFormatter(JsonFormatter())
+        return console_handler
+
+    color_formatter = ColoredFormatter(
+        "%(log_color)s" + _TEXT_FORMAT,
+        log_colors={
+            "DEBUG": "cyan",
+            "INFO": "green",
+            "WARNING": "yellow",
+            "ERROR": "red",
+            "CRITICAL": "bold_red",
+        },
+        style="%",
+    )
+    console_handler.setFormatter(color_formatter)
+    return console_handler
 
 
 def configure_logging(
@@ -13,6 +174,17 @@ def configure_logging(
     force: bool = False,
     log_to_console: bool = True,
     log_to_file: bool = True,
+    async_safe: bool = False,
+    queue_maxsize: int = 10000,
+    overflow_policy: str = "block",
+    log_format: str = "text",
+    request_context: bool = True,
+    rate_limits: Optional[Mapping[str, Tuple[int, float]]] = None,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+    rotation_when: Optional[str] = None,
+    rotation_interval: int = 1,
+    compression: Optional[str] = None,
 ):
     """
     Configura el sistema de logging con consola y/o archivo rotativo.
@@ -23,47 +195,92 @@ def configure_logging(
         force (bool): Forzar reconfiguración si ya está inicializado.
         log_to_console (bool): Habilita logs en la consola.
         log_to_file (bool): Habilita logs en archivo rotativo.
+        async_safe (bool): Envía los registros a una cola consumida por un hilo
+            (QueueListener) dueño de los handlers de archivo y consola, para no
+            hacer I/O en el hilo del event loop.
+        queue_maxsize (int): Tamaño máximo de la cola en modo async_safe.
+        overflow_policy (str): Qué hacer con la cola llena: "block",
+            "drop-debug", "drop-info" o "drop-oldest" (ver BoundedQueueHandler).
+        log_format (str): "text" (formato legible actual) o "json" (un objeto
+            JSON compacto por línea, ver JsonFormatter).
+        request_context (bool): Instala RequestContextFilter para añadir a cada
+            registro request_id, tenant_vat y route del request en curso
+            (ver RequestContextMiddleware).
+        rate_limits (Mapping[str, Tuple[int, float]]): Deduplica registros
+            repetidos por nivel, p. ej. {"ERROR": (5, 60)}: 5 completos por
+            grupo y luego un resumen por minuto (ver RateLimitFilter). None
+            lo desactiva.
+        max_bytes (int): Tamaño máximo del archivo antes de rotar (0 = sin límite).
+        backup_count (int): Archivos rotados que se conservan.
+        rotation_when (str): Rotación por tiempo: "S", "M", "H", "D" o "midnight".
+            Se combina con max_bytes (rota con lo primero que ocurra).
+        rotation_interval (int): Múltiplo de rotation_when.
+        compression (str): "gzip" o "zstd" para comprimir los archivos rotados
+            en un hilo en segundo plano (ver CompressingRotatingFileHandler).
     """
-    global _logger_initialized
+    global _logger_initialized, _atexit_registered, _queue_listener
 
     if _logger_initialized and not force:
         return logging.getLogger("app")
 
+    if overflow_policy not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"overflow_policy inválida: '{overflow_policy}'. Opciones: {OVERFLOW_POLICIES}"
+        )
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"log_format inválido: '{log_format}'. Opciones: {LOG_FORMATS}")
+
     logger = logging.getLogger("app")
     logger.setLevel(log_level)
+    shutdown_logging()
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
 
+    handlers: List[logging.Handler] = []
     if log_to_file:
-        log_file_path = Path(log_file).resolve()
-        log_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        file_handler = RotatingFileHandler(
-            filename=log_file_path,
-            maxBytes=5 * 1024 * 1024,  # 5MB
-            backupCount=3,
-            encoding="utf-8",
-        )
-        file_formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(pathname)s:%(lineno)d | %(message)s"
+        handlers.append(
+            _build_file_handler(
+                log_file,
+                log_format,
+                max_bytes=max_bytes,
+                backup_count=backup_count,
+                rotation_when=rotation_when,
+                rotation_interval=rotation_interval,
+                compression=compression,
+            )
         )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
     if log_to_console:
-        console_handler = logging.StreamHandler()
-        color_formatter = ColoredFormatter(
-            "%(log_color)s%(asctime)s | %(levelname)s | %(name)s | %(pathname)s:%(lineno)d | %(message)s",
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "green",
-                "WARNING": "yellow",
-                "ERROR": "red",
-                "CRITICAL": "bold_red",
-            },
-            style="%",
-        )
-        console_handler.setFormatter(color_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(_build_console_handler(log_format))
+
+    if async_safe and handlers:
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_maxsize)
+        logger.addHandler(BoundedQueueHandler(log_queue, overflow_policy))
+        _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    if request_context:
+        # En los handlers del logger (no en el logger) para cubrir también los
+        # loggers hijos; en modo async_safe corre en el hilo que emite el log,
+        # donde el contextvar del request está disponible.
+        context_filter = RequestContextFilter()
+        for handler in logger.handlers:
+            handler.addFilter(context_filter)
+
+    if rate_limits:
+        # También en los handlers, tras el de contexto (agrupa por su `route`).
+        # Una sola instancia: cada registro se cuenta una vez aunque haya
+        # consola y archivo.
+        rate_filter = RateLimitFilter(rate_limits)
+        for handler in logger.handlers:
+            handler.addFilter(rate_filter)
 
     _logger_initialized = True
     return logger
@@ -0,0 +1,75 @@
+# exponential_core\logger\context.py
+import logging
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Diccionario por request. Se comparte por referencia con las copias de contexto
+# (tareas hijas, endpoints síncronos en el threadpool), de modo que
+# update_request_context() desde el endpoint es visible para todo el request.
+_request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "exponential_request_context", default=None
+)
+
+
+def _resolve(value: Any) -> Any:
+    # Campos perezosos: un callable se evalúa al leerlo (p. ej. route, que el
+    # router solo conoce después de abrir el contexto)
+    return value() if callable(value) else value
+
+
+def get_request_context() -> Dict[str, Any]:
+    """Copia del contexto del request actual (request_id, tenant_vat, route, ...)."""
+    return {key: _resolve(value) for key, value in (_request_context.get() or {}).items()}
+
+
+def bind_request_context(**fields: Any) -> Token:
+    """
+    Abre un contexto nuevo (normalmente uno por request) con los campos dados.
+    Un campo puede ser un callable sin argumentos, que se evalúa cada vez que
+    se lee. Devuelve el token para restaurar el anterior con reset_request_context().
+    """
+    return _request_context.set({k: v for k, v in fields.items() if v is not None})
+
+
+def reset_request_context(token: Token):
+    _request_context.reset(token)
+
+
+def update_request_context(**fields: Any):
+    """
+    Añade campos al contexto del request en curso (p. ej. tenant_vat una vez
+    leído el body). Fuera de un request abre un contexto nuevo.
+    """
+    ctx = _request_context.get()
+    values = {k: v for k, v in fields.items() if v is not None}
+    if ctx is None:
+        _request_context.set(values)
+    else:
+        ctx.update(values)
+
+
+def outgoing_headers() -> Dict[str, str]:
+    """
+    Cabeceras para propagar la correlación a servicios externos (Claude,
+    OpenAI, Odoo...): httpx.post(url, headers={**outgoing_headers(), ...}).
+    """
+    request_id = (_request_context.get() or {}).get("request_id")
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Copia los campos del contexto del request a cada LogRecord (record.request_id,
+    record.tenant_vat, record.route...). configure_logging lo instala en los
+    handlers del logger "app"; el formato JSON los emite como campos propios.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = _request_context.get()
+        if ctx:
+            for key, value in ctx.items():
+                if key not in record.__dict__:
+                    setattr(record, key, _resolve(value))
+        return True
@@ -0,0 +1,63 @@
+# exponential_core\logger\formatters.py
+import json
+import logging
+from datetime import datetime, timezone
+
+try:  # orjson es opcional: ~10x más rápido que json para este uso
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+# Atributos estándar de LogRecord; todo lo demás se considera "extra" y se
+# vuelca como campo del JSON (method, path, status_code, error_type, ...).
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime"}
+
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como un objeto JSON compacto en una sola línea.
+
+    Campos fijos: timestamp (ISO 8601 UTC), level, logger, message, module,
+    line. Se añaden los campos pasados vía `extra=` (p. ej. los que calculan
+    los exception handlers: method, path, status_code, error_type) y, si hay
+    excepción, exc_type, exc_message y traceback.
+
+    El mensaje se resuelve con record.getMessage(), así que los argumentos
+    estilo %-format solo se interpolan si el registro supera el nivel.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info:
+            exc_type, exc_value, _ = record.exc_info
+            payload["exc_type"] = exc_type.__name__ if exc_type else None
+            payload["exc_message"] = str(exc_value)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["traceback"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+
+        return _dumps(payload)
@@ -0,0 +1,133 @@
+# exponential_core\logger\ratelimit.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Mapping, Optional, Tuple, Union
+
+from exponential_core.logger.context import get_request_context
+
+# nivel -> (registros completos por ráfaga, ventana en segundos)
+DEFAULT_RATE_LIMITS = {"ERROR": (5, 60.0), "CRITICAL": (5, 60.0)}
+
+
+def _resolve_level(level: Union[str, int]) -> int:
+    """Número de nivel a partir de un número o un nombre ("ERROR", "error")."""
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"Nivel de log desconocido: {level!r}")
+    return resolved
+
+
+class _KeyState:
+    __slots__ = ("emitted", "suppressed", "last_seen", "last_summary")
+
+    def __init__(self, now: float):
+        self.emitted = 0
+        self.suppressed = 0
+        self.last_seen = now
+        self.last_summary = now
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Deduplica registros repetidos agrupándolos por (clase de excepción, ruta,
+    plantilla del mensaje).
+
+    Para cada grupo se emiten completos (con traceback) los primeros `burst`
+    registros; los siguientes se suprimen y, como mucho una vez por ventana, se
+    deja pasar un resumen sin traceback con el número de repeticiones
+    suprimidas (campo `suppressed_count`). Tras una ventana sin repeticiones el
+    grupo se reinicia; si quedaban repeticiones suprimidas sin resumir, el
+    recuento viaja en el primer registro de la nueva ráfaga.
+
+    La ruta del grupo es la plantilla (/invoices/{invoice_id}): el campo
+    `route` del registro o del contexto del request; el path crudo solo se usa
+    si no hay plantilla, para no crear un grupo por cada id.
+
+    Los niveles no incluidos en `limits` pasan siempre. Una misma instancia
+    puede compartirse entre varios handlers: la decisión se toma una vez por
+    registro y se reutiliza en los demás.
+
+    Args:
+        limits (Mapping): nivel (nombre o número) -> (burst, window_seconds).
+        max_keys (int): Grupos distintos recordados (LRU).
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[Union[str, int], Tuple[int, float]]] = None,
+        max_keys: int = 1024,
+    ):
+        super().__init__()
+        self.limits = {
+            _resolve_level(level): (int(burst), float(window))
+            for level, (burst, window) in (limits or DEFAULT_RATE_LIMITS).items()
+        }
+        self.max_keys = max_keys
+        self._states: "OrderedDict[tuple, _KeyState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> tuple:
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        route = (
+            getattr(record, "route", None)
+            or get_request_context().get("route")
+            or getattr(record, "path", None)
+        )
+        return (record.levelno, exc_type, route, str(record.msg))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # id(self) y no self: el registro debe seguir siendo serializable
+        decided = record.__dict__.get("_rate_limit_decision")
+        if decided is not None and decided[0] == id(self):
+            return decided[1]
+        allowed = self._decide(record)
+        record._rate_limit_decision = (id(self), allowed)
+        return allowed
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        limit = self.limits.get(record.levelno)
+        if limit is None:
+            return True
+        burst, window = limit
+
+        key = self._key(record)
+        now = time.monotonic()
+
+        with self._lock:
+            state = self._states.get(key)
+            pending = 0
+            if state is None or now - state.last_seen > window:
+                if state is not None:
+                    pending = state.suppressed
+                state = _KeyState(now)
+                self._states[key] = state
+                if len(self._states) > self.max_keys:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(key)
+            state.last_seen = now
+
+            if state.emitted < burst:
+                state.emitted += 1
+                if not pending:
+                    return True
+            else:
+                state.suppressed += 1
+                if now - state.last_summary < window:
+                    return False
+
+                pending, state.suppressed = state.suppressed, 0
+                state.last_summary = now
+                # Resumen: el registro actual, sin traceback
+                record.exc_info = None
+                record.exc_text = None
+
+        record.msg = f"{record.getMessage()} [{pending} repeticiones suprimidas]"
+        record.args = None
+        record.suppressed_count = pending
+        return True
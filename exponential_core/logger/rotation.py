@@ -0,0 +1,171 @@
+# exponential_core\logger\rotation.py
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler
+from pathlib import Path
+from typing import Optional
+
+COMPRESSIONS = (None, "gzip", "zstd")
+
+_WHEN_SECONDS = {"S": 1, "M": 60, "H": 3600, "D": 86400, "MIDNIGHT": 86400}
+
+
+class _BackgroundCompressor:
+    """Hilo único que comprime los archivos rotados y aplica la retención."""
+
+    def __init__(self, compression: Optional[str], base_path: Path, backup_count: int):
+        self.compression = compression
+        self.base_path = base_path
+        self.backup_count = backup_count
+        self._queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="log-compressor", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, rotated: Path):
+        self._queue.put(rotated)
+
+    def close(self):
+        """Espera a que terminen las compresiones pendientes."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            rotated = self._queue.get()
+            if rotated is None:
+                return
+            try:
+                self._compress(rotated)
+                self._prune()
+            except Exception:  # nunca romper el logging por un fallo al comprimir
+                logging.getLogger(__name__).exception(
+                    "No se pudo comprimir el log rotado %s", rotated
+                )
+
+    def _compress(self, rotated: Path):
+        if self.compression == "gzip":
+            target = rotated.with_name(rotated.name + ".gz")
+            with open(rotated, "rb") as src, gzip.open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        elif self.compression == "zstd":
+            import zstandard
+
+            target = rotated.with_name(rotated.name + ".zst")
+            with open(rotated, "rb") as src, open(target, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            return
+        rotated.unlink()
+
+    def _prune(self):
+        if self.backup_count <= 0:
+            return
+        prefix = self.base_path.name + "."
+        backups = sorted(
+            (p for p in self.base_path.parent.iterdir() if p.name.startswith(prefix)),
+            key=lambda p: (p.stat().st_mtime, p.name),
+        )
+        for old in backups[: -self.backup_count]:
+            old.unlink(missing_ok=True)
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """
+    Archivo de log con rotación por tamaño, por tiempo o ambas, retención de
+    `backup_count` archivos y compresión gzip/zstd en un hilo en segundo plano
+    (el hilo que escribe el log solo renombra el archivo).
+
+    Los archivos rotados se nombran `<log>.<YYYYmmdd-HHMMSS>[.n][.gz|.zst]`,
+    de modo que no hace falta renombrar los backups anteriores en cada rotación.
+
+    Args:
+        filename (str): Ruta del log activo.
+        max_bytes (int): Rotar al superar este tamaño; 0 lo desactiva.
+        when (str): "S", "M", "H", "D" o "midnight"; None desactiva la rotación por tiempo.
+        interval (int): Múltiplo de `when`.
+        backup_count (int): Archivos rotados a conservar; 0 conserva todos.
+        compression (str): None, "gzip" o "zstd" (requiere `zstandard`).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        when: Optional[str] = None,
+        interval: int = 1,
+        backup_count: int = 0,
+        compression: Optional[str] = None,
+        encoding: Optional[str] = "utf-8",
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression inválida: '{compression}'. Opciones: {COMPRESSIONS}")
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError as e:  # pragma: no cover - depende del entorno
+                raise ImportError("compression='zstd' requiere el paquete 'zstandard'") from e
+        if when is not None and when.upper() not in _WHEN_SECONDS:
+            raise ValueError(f"when inválido: '{when}'. Opciones: {tuple(_WHEN_SECONDS)}")
+
+        super().__init__(filename, "a", encoding=encoding, delay=False)
+        self.max_bytes = max_bytes
+        self.when = when.upper() if when else None
+        self.interval = interval
+        self.backup_count = backup_count
+        self._compressor = _BackgroundCompressor(
+            compression, Path(self.baseFilename), backup_count
+        )
+        self._next_rollover = self._compute_next_rollover(time.time())
+
+    def _compute_next_rollover(self, now: float) -> Optional[float]:
+        if self.when is None:
+            return None
+        if self.when == "MIDNIGHT":
+            today = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+            return (today + timedelta(days=self.interval)).timestamp()
+        return now + _WHEN_SECONDS[self.when] * self.interval
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self._next_rollover is not None and time.time() >= self._next_rollover:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        base = Path(self.baseFilename)
+        if base.exists() and base.stat().st_size > 0:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            rotated = base.with_name(f"{base.name}.{stamp}")
+            n = 1
+            while any(
+                rotated.with_name(rotated.name + ext).exists() for ext in ("", ".gz", ".zst")
+            ):
+                rotated = base.with_name(f"{base.name}.{stamp}.{n}")
+                n += 1
+            os.replace(base, rotated)
+            self._compressor.submit(rotated)
+
+        self._next_rollover = self._compute_next_rollover(time.time())
+        self.stream = self._open()
+
+    def close(self):
+        super().close()
+        compressor, self._compressor = self._compressor, None
+        if compressor is not None:
+            compressor.close()
@@ -0,0 +1,189 @@
+# exponential_core\logger\timing.py
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from exponential_core.logger.core import get_logger
+
+_RESERVOIR_SIZE = 2048
+
+
+class _TimingState:
+    enabled = False
+
+
+_state = _TimingState()
+
+
+class _Series:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=_RESERVOIR_SIZE)
+
+    def add(self, duration_ms: float):
+        self.count += 1
+        self.total += duration_ms
+        if duration_ms > self.max:
+            self.max = duration_ms
+        self.samples.append(duration_ms)
+
+
+class TimingRegistry:
+    """
+    Histogramas en proceso de duraciones por nombre de operación.
+    Los percentiles se calculan sobre las últimas 2048 muestras de cada serie.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float):
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series()
+            series.add(duration_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Devuelve {nombre: {count, mean_ms, max_ms, p50_ms, p95_ms, p99_ms}}.
+        """
+        with self._lock:
+            items = [(name, s.count, s.total, s.max, sorted(s.samples)) for name, s in self._series.items()]
+
+        result = {}
+        for name, count, total, max_ms, samples in items:
+            result[name] = {
+                "count": count,
+                "mean_ms": total / count if count else 0.0,
+                "max_ms": max_ms,
+                "p50_ms": _percentile(samples, 0.50),
+                "p95_ms": _percentile(samples, 0.95),
+                "p99_ms": _percentile(samples, 0.99),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _percentile(sorted_samples, q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[idx]
+
+
+default_registry = TimingRegistry()
+
+
+def enable_timing(enabled: bool = True):
+    """Activa o desactiva globalmente timed(); desactivado solo cuesta un if."""
+    _state.enabled = enabled
+
+
+def get_timing_snapshot() -> Dict[str, Dict[str, float]]:
+    return default_registry.snapshot()
+
+
+def reset_timings():
+    default_registry.reset()
+
+
+class timed:
+    """
+    Mide la duración de una operación y la registra en el histograma `name`.
+
+    Se usa como decorador (funciones síncronas o async) o como context manager
+    (`with` / `async with`):
+
+        @timed("claude.extract", threshold_ms=5000)
+        async def extract(...): ...
+
+        async with timed("odoo.write_invoice"):
+            await odoo.write(...)
+
+    Si la duración supera `threshold_ms` se emite un log estructurado
+    (campos span y duration_ms). Mientras enable_timing() no se llame, no se
+    mide nada.
+
+    Nota: una misma instancia usada como context manager no debe anidarse ni
+    compartirse entre tareas concurrentes; créala en cada `with`.
+    """
+
+    __slots__ = ("name", "threshold_ms", "registry", "_start")
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        threshold_ms: Optional[float] = None,
+        registry: Optional[TimingRegistry] = None,
+    ):
+        self.name = name
+        self.threshold_ms = threshold_ms
+        self.registry = registry or default_registry
+        self._start: Optional[float] = None
+
+    def _finish(self, name: str, start: float):
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.registry.record(name, duration_ms)
+        if self.threshold_ms is not None and duration_ms >= self.threshold_ms:
+            get_logger().warning(
+                "Operación lenta: %s tardó %.1f ms",
+                name,
+                duration_ms,
+                extra={"span": name, "duration_ms": round(duration_ms, 3)},
+            )
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _state.enabled:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._finish(name, start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(name, start)
+
+        return wrapper
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter() if _state.enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            self._finish(self.name or "anonymous", self._start)
+            self._start = None
+
+    async def __aenter__(self) -> "timed":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.__exit__(exc_type, exc, tb)
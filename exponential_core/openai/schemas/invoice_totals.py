@@ -2,10 +2,12 @@ from decimal import Decimal, ROUND_HALF_UP
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
+from exponential_core.utils.money import Money
+
 
 class MoneySchema(BaseModel):
     raw: str = Field(..., description="Texto tal cual aparece (ej: '7.685,38')")
-    value: Decimal = Field(
+    value: Money = Field(
         ..., description="Valor numérico normalizado en punto decimal (ej: 7685.38)"
     )
 
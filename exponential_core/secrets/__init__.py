@@ -1 +1,5 @@
-from .manager import SecretManager  # Exportación explícita
+from .manager import SecretManager, SecretMetadata  # Exportación explícita
+from .registry import SecretRegistry
+from .sync_manager import SyncSecretManager
+from .cache import InMemorySecretCache, SQLiteSecretCache
+from .metrics import SecretMetrics, InMemorySecretMetrics
@@ -1,28 +1,139 @@
+import asyncio
 import functools
-from botocore.exceptions import ClientError
+from typing import Any, Callable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
 from exponential_core.exceptions import (
+    AWSCircuitOpenError,
     AWSConnectionError,
+    AWSThrottlingError,
     SecretNotFoundError,
     SecretAlreadyExistsError,
 )
+from exponential_core.logger import get_logger
+from exponential_core.utils.aws_retry import (
+    THROTTLING_ERROR_CODES,
+    aws_error_code,
+    backoff_delay,
+    get_circuit_breaker,
+    is_transient_error,
+    record_aws_error,
+)
+
+logger = get_logger()
+
 
+def handle_boto3_errors_async(
+    func: Optional[Callable] = None,
+    *,
+    retries: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    circuit_breaker: bool = True,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+    fallback: Optional[Callable[..., Any]] = None,
+    secret_name_of: Optional[Callable[..., str]] = None,
+):
+    """
+    Traduce los ClientError/BotoCoreError de boto3 a excepciones de la app.
+
+    - Los errores transitorios (throttling, 5xx de AWS, errores de red) se
+      reintentan hasta `retries` veces con backoff exponencial y jitter.
+    - Un circuit breaker por secreto deja de llamar a AWS tras
+      `failure_threshold` fallos transitorios seguidos durante `reset_timeout`
+      segundos. Los 4xx no cuentan: AWS respondió.
+    - `fallback(self, *args, **kwargs)` se invoca cuando el circuito está
+      abierto o se agotan los reintentos; si devuelve algo distinto de None se
+      usa como resultado (p. ej. el último valor bueno del caché).
+    - `secret_name_of(self, *args, **kwargs)` da el nombre del secreto para el
+      circuit breaker, las métricas y los errores; por defecto
+      `self.base_secret_name`.
+
+    Se puede usar como @handle_boto3_errors_async o con parámetros:
+    @handle_boto3_errors_async(retries=5, fallback=...).
+    """
+    if func is None:
+        return functools.partial(
+            handle_boto3_errors_async,
+            retries=retries,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            circuit_breaker=circuit_breaker,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            fallback=fallback,
+            secret_name_of=secret_name_of,
+        )
 
-def handle_boto3_errors_async(func):
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code")
-            self_instance = args[0]
+        self_instance = args[0]
+        if secret_name_of is not None:
+            secret_name = secret_name_of(*args, **kwargs)
+        else:
             secret_name = getattr(self_instance, "base_secret_name", "desconocido")
+        breaker = (
+            get_circuit_breaker(secret_name, failure_threshold, reset_timeout)
+            if circuit_breaker
+            else None
+        )
+
+        if breaker is not None and not breaker.allow():
+            value = fallback(*args, **kwargs) if fallback else None
+            if value is not None:
+                return value
+            raise AWSCircuitOpenError(secret_name)
+
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await func(*args, **kwargs)
+                except (ClientError, BotoCoreError) as e:
+                    error_code = aws_error_code(e)
+                    record_aws_error(self_instance, secret_name, error_code)
+                    transient = is_transient_error(e)
+
+                    if transient and attempt < retries:
+                        await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+                        attempt += 1
+                        continue
+
+                    if breaker is not None:
+                        if transient:
+                            breaker.record_failure()
+                        else:
+                            # 4xx: AWS respondió, el servicio está disponible
+                            breaker.record_success()
+
+                    if error_code == "ResourceNotFoundException":
+                        raise SecretNotFoundError(secret_name=secret_name) from e
+
+                    elif error_code == "ResourceExistsException":
+                        raise SecretAlreadyExistsError(secret_name=secret_name) from e
+
+                    value = fallback(*args, **kwargs) if fallback else None
+                    if value is not None:
+                        logger.warning(
+                            f"[SecretsManager] {error_code} en '{secret_name}', "
+                            "se sirve el último valor conocido."
+                        )
+                        return value
 
-            if error_code == "ResourceNotFoundException":
-                raise SecretNotFoundError(secret_name=secret_name) from e
+                    if error_code in THROTTLING_ERROR_CODES:
+                        raise AWSThrottlingError(secret_name, error_code) from e
 
-            elif error_code == "ResourceExistsException":
-                raise SecretAlreadyExistsError(secret_name=secret_name) from e
+                    raise AWSConnectionError(str(e)) from e
 
-            raise AWSConnectionError(str(e)) from e
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+        except BaseException:
+            # Cualquier otra excepción (ValueError, CancelledError...) durante
+            # la llamada de prueba del semiabierto vuelve a abrir el circuito
+            if breaker is not None:
+                breaker.record_aborted()
+            raise
 
     return wrapper
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+# Variable de entorno con la clave Fernet usada para cifrar el caché compartido
+CACHE_KEY_ENV = "EXPONENTIAL_SECRETS_CACHE_KEY"
+
+
+class InMemorySecretCache(dict):
+    """
+    Backend por defecto: diccionario del proceso.
+    Cada entrada es {"value": dict, "timestamp": datetime, "version_id": str | None}.
+    """
+
+
+class SQLiteSecretCache(MutableMapping):
+    """
+    Caché de secretos compartido por todos los procesos de un nodo (p. ej. los
+    workers de uvicorn) mediante un fichero SQLite en modo WAL.
+
+    - El payload se guarda cifrado con Fernet; la clave se lee de la variable de
+      entorno EXPONENTIAL_SECRETS_CACHE_KEY (o se pasa explícitamente).
+    - Los TTL se evalúan igual que en memoria: el timestamp de la entrada es el
+      del momento en que algún worker descargó el secreto.
+    - Cada proceso memoriza la última entrada descifrada: durante
+      `memo_ttl_seconds` la sirve sin consultar SQLite (el camino caliente no
+      hace I/O en el event loop) y después solo vuelve a descifrar si otro
+      worker escribió una versión más reciente.
+    - Si el fichero no existe se crea con permisos 0o600 (SQLite crea los
+      ficheros -wal/-shm con los mismos permisos).
+
+    Requiere el paquete opcional `cryptography` (pip install exponential-core[shared-cache]).
+    """
+
+    def __init__(
+        self,
+        path: str = "/tmp/exponential_secrets_cache.db",
+        key: Optional[str] = None,
+        memo_ttl_seconds: float = 1.0,
+    ):
+        try:
+            from cryptography.fernet import Fernet
+        except ImportError as e:  # pragma: no cover - depende del entorno
+            raise ImportError(
+                "SQLiteSecretCache requiere 'cryptography': pip install exponential-core[shared-cache]"
+            ) from e
+
+        key = key or os.environ.get(CACHE_KEY_ENV)
+        if not key:
+            raise ValueError(
+                f"SQLiteSecretCache requiere una clave de cifrado en la variable de entorno {CACHE_KEY_ENV}."
+            )
+
+        self._fernet = Fernet(key)
+        self._lock = threading.Lock()
+        # name -> (timestamp de la entrada, instante de la última comprobación, entrada)
+        self._memo: Dict[str, Tuple[float, float, dict]] = {}
+        self.memo_ttl_seconds = memo_ttl_seconds
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        except FileExistsError:
+            pass
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS secrets ("
+                " name TEXT PRIMARY KEY,"
+                " payload BLOB NOT NULL,"
+                " timestamp REAL NOT NULL,"
+                " version_id TEXT"
+                ")"
+            )
+
+    def __getitem__(self, name: str) -> dict:
+        now = time.monotonic()
+        memo = self._memo.get(name)
+        if memo is not None and now - memo[1] < self.memo_ttl_seconds:
+            return memo[2]
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT timestamp, version_id FROM secrets WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                self._memo.pop(name, None)
+                raise KeyError(name)
+
+            timestamp, version_id = row
+            if memo is not None and memo[0] == timestamp:
+                self._memo[name] = (timestamp, now, memo[2])
+                return memo[2]
+
+            (payload,) = self._conn.execute(
+                "SELECT payload FROM secrets WHERE name = ?", (name,)
+            ).fetchone()
+
+        entry = {
+            "value": json.loads(self._fernet.decrypt(payload)),
+            "timestamp": datetime.fromtimestamp(timestamp, tz=timezone.utc),
+            "version_id": version_id,
+        }
+        self._memo[name] = (timestamp, now, entry)
+        return entry
+
+    def __setitem__(self, name: str, entry: dict):
+        timestamp = entry["timestamp"].timestamp()
+        payload = self._fernet.encrypt(json.dumps(entry["value"]).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO secrets (name, payload, timestamp, version_id) "
+                "VALUES (?, ?, ?, ?)",
+                (name, payload, timestamp, entry.get("version_id")),
+            )
+        self._memo[name] = (timestamp, time.monotonic(), entry)
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM secrets WHERE name = ?", (name,))
+        self._memo.pop(name, None)
+        if cursor.rowcount == 0:
+            raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            names = [row[0] for row in self._conn.execute("SELECT name FROM secrets")]
+        return iter(names)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM secrets").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM secrets")
+        self._memo.clear()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
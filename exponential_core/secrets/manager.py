@@ -1,9 +1,84 @@
+import asyncio
+import inspect
 import aioboto3
 import json
+import random
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timezone
-from typing import Optional, Dict, List, Any
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Callable,
+    NamedTuple,
+    Union,
+)
 
+from botocore.exceptions import BotoCoreError, ClientError
+
+from exponential_core.exceptions import SecretConflictError
 from exponential_core.secrets.aws_error_handler_async import handle_boto3_errors_async
+from exponential_core.secrets.cache import InMemorySecretCache
+from exponential_core.secrets import metrics as secret_metrics
+from exponential_core.secrets.metrics import NOOP_METRICS, SecretMetrics
+from exponential_core.logger import get_logger
+from exponential_core.utils.aws_retry import aws_error_code
+
+logger = get_logger()
+
+
+class SecretMetadata(NamedTuple):
+    """Registro ligero devuelto por iter_secrets(metadata=True)."""
+
+    name: str
+    arn: Optional[str]
+    last_changed_date: Optional[datetime]
+    tags: Dict[str, str]
+
+
+def _list_filters(
+    prefix: Optional[str], tags: Optional[Mapping[str, Optional[str]]]
+) -> List[dict]:
+    """Filtros de list_secrets: el filtro 'name' de AWS es por prefijo."""
+    filters = []
+    if prefix:
+        filters.append({"Key": "name", "Values": [prefix]})
+    for tag_key, tag_value in (tags or {}).items():
+        filters.append({"Key": "tag-key", "Values": [tag_key]})
+        if tag_value is not None:
+            filters.append({"Key": "tag-value", "Values": [tag_value]})
+    return filters
+
+
+def _awscurrent_version(describe_response: dict) -> Optional[str]:
+    """Versión con la etiqueta AWSCURRENT en una respuesta de describe_secret."""
+    for version_id, stages in (describe_response.get("VersionIdsToStages") or {}).items():
+        if "AWSCURRENT" in stages:
+            return version_id
+    return None
+
+
+def _pending_stage(token: str) -> str:
+    """Etiqueta privada de una escritura de update_many (no choca con la rotación)."""
+    return f"EXPCORE_PENDING_{token.replace('-', '')}"
+
+
+def _parse_secret_payload(secret_name: str, response: dict) -> dict:
+    """Decodifica el JSON de una respuesta de get_secret_value / batch_get_secret_value."""
+    if "SecretString" in response:
+        return json.loads(response["SecretString"])
+    if "SecretBinary" in response:
+        return json.loads(response["SecretBinary"].decode("utf-8"))
+    raise ValueError(
+        f"[SecretsManager] El secreto '{secret_name}' no contiene datos válidos."
+    )
 
 
 class SecretManager:
@@ -12,40 +87,169 @@ class SecretManager:
         base_secret_name: str,
         region_name: str = "eu-west-3",
         default_ttl_seconds: int = 300,
+        stale_grace_seconds: int = 0,
+        session: Optional[aioboto3.Session] = None,
+        cache_backend: Optional[MutableMapping] = None,
+        metrics: Optional[SecretMetrics] = None,
+        inflight: Optional[Dict[str, asyncio.Future]] = None,
     ):
-        self._session = aioboto3.Session()
+        """
+        Args:
+            base_secret_name (str): Nombre del secreto en AWS Secrets Manager.
+            region_name (str): Región de AWS.
+            default_ttl_seconds (int): Tiempo de vida del valor cacheado.
+            stale_grace_seconds (int): Ventana posterior al TTL durante la cual se
+                sirve el valor vencido mientras se refresca en segundo plano.
+                0 desactiva el modo stale-while-revalidate.
+            session (aioboto3.Session): Sesión a reutilizar. Por defecto se crea una.
+            cache_backend (MutableMapping): Almacén de entradas cacheadas. Por
+                defecto InMemorySecretCache; SQLiteSecretCache lo comparte entre
+                procesos del mismo nodo.
+            metrics (SecretMetrics): Destino de contadores e histogramas (aciertos,
+                fallos, stale, latencia, errores). Por defecto no registra nada.
+            inflight (Dict[str, asyncio.Future]): Descargas en curso por secreto;
+                pasar el mismo dict a varios managers (SecretRegistry) hace que
+                compartan la deduplicación de descargas.
+        """
+        self._session = session or aioboto3.Session()
         self.region_name = region_name
-        self._cache: Dict[str, Dict] = {}
+        self._cache: MutableMapping = (
+            cache_backend if cache_backend is not None else InMemorySecretCache()
+        )
+        self._inflight: Dict[str, asyncio.Future] = inflight if inflight is not None else {}
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._subscribers: List[Callable[[str, dict], Any]] = []
+        self._watcher: Optional[asyncio.Task] = None
+        self._last_seen_version: Optional[tuple] = None
+        self._listing_cache: Dict[tuple, Dict] = {}
         self.base_secret_name = base_secret_name
         self.default_ttl_seconds = default_ttl_seconds
+        self.stale_grace_seconds = stale_grace_seconds
+        self.metrics = metrics if metrics is not None else NOOP_METRICS
+        self._metric_labels = {"secret": base_secret_name}
+
+    async def start(self) -> "SecretManager":
+        """
+        Abre un cliente de Secrets Manager de larga vida que se reutiliza en todas
+        las llamadas (y con él su pool de conexiones). Sin start() cada operación
+        crea y cierra su propio cliente.
+        """
+        if self._client is not None:
+            return self
+
+        exit_stack = AsyncExitStack()
+        self._client = await exit_stack.enter_async_context(
+            self._session.client("secretsmanager", region_name=self.region_name)
+        )
+        self._exit_stack = exit_stack
+        return self
+
+    def bind_client(self, client):
+        """
+        Usa un cliente de Secrets Manager ya abierto por otro (p. ej.
+        SecretRegistry.start()), que sigue siendo el responsable de cerrarlo.
+        None vuelve a los clientes efímeros por operación.
+        """
+        self._client = client
+
+    async def aclose(self):
+        """Detiene el watcher y cierra el cliente persistente abierto con start()."""
+        await self.stop_watcher()
+        exit_stack, self._exit_stack = self._exit_stack, None
+        self._client = None
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    async def __aenter__(self) -> "SecretManager":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @asynccontextmanager
+    async def _get_client(self):
+        """Entrega el cliente persistente o, si no se llamó a start(), uno efímero."""
+        if self._client is not None:
+            yield self._client
+            return
+
+        async with self._session.client(
+            "secretsmanager", region_name=self.region_name
+        ) as client:
+            yield client
 
-    @handle_boto3_errors_async
     async def _get_secret_dict(self, ttl_seconds: Optional[int] = None) -> dict:
         now = datetime.now(timezone.utc)
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
 
-        if self.base_secret_name in self._cache:
-            entry = self._cache[self.base_secret_name]
-            if (now - entry["timestamp"]).total_seconds() < ttl:
+        entry = self._cache.get(self.base_secret_name)
+        if entry is not None:
+            age = (now - entry["timestamp"]).total_seconds()
+            if age < ttl:
+                self.metrics.incr(secret_metrics.CACHE_HITS, self._metric_labels)
                 return entry["value"]
-            else:
-                self._cache.pop(self.base_secret_name)
+            if age < ttl + self.stale_grace_seconds:
+                # Servimos el valor vencido y refrescamos en segundo plano
+                self.metrics.incr(secret_metrics.CACHE_STALE, self._metric_labels)
+                self._refresh_secret_dict()
+                return entry["value"]
+            # La entrada vencida se conserva hasta ser reemplazada: es el último
+            # valor bueno que se sirve si el circuit breaker está abierto.
 
-        async with self._session.client(
-            "secretsmanager", region_name=self.region_name
-        ) as client:
-            response = await client.get_secret_value(SecretId=self.base_secret_name)
+        self.metrics.incr(secret_metrics.CACHE_MISSES, self._metric_labels)
+        # asyncio.shield: si un waiter se cancela no cancela la descarga de los demás
+        return await asyncio.shield(self._refresh_secret_dict())
 
-        if "SecretString" in response:
-            secret_dict = json.loads(response["SecretString"])
-        elif "SecretBinary" in response:
-            secret_dict = json.loads(response["SecretBinary"].decode("utf-8"))
-        else:
-            raise ValueError(
-                f"[SecretsManager] El secreto '{self.base_secret_name}' no contiene datos válidos."
-            )
+    def _refresh_secret_dict(self) -> asyncio.Future:
+        """
+        Devuelve la descarga en curso del secreto o lanza una nueva.
+        Todas las corrutinas que encuentran el caché vencido comparten el mismo
+        future, de modo que solo se hace una llamada a AWS por secreto.
+        """
+        name = self.base_secret_name
+        future = self._inflight.get(name)
+        if future is not None:
+            return future
+
+        future = asyncio.ensure_future(self._fetch_secret_dict())
+        self._inflight[name] = future
+
+        def _done(fut: asyncio.Future):
+            if self._inflight.get(name) is fut:
+                self._inflight.pop(name, None)
+            if not fut.cancelled() and fut.exception() is not None:
+                # Si nadie espera el future (refresco en segundo plano) el error
+                # se registra aquí y se mantiene el valor vencido en caché.
+                logger.warning(
+                    f"[SecretsManager] Error refrescando el secreto '{name}': "
+                    f"{fut.exception()!r}"
+                )
+
+        future.add_done_callback(_done)
+        return future
+
+    def _last_good_value(self) -> Optional[dict]:
+        entry = self._cache.get(self.base_secret_name)
+        return entry["value"] if entry else None
 
-        self._cache[self.base_secret_name] = {"value": secret_dict, "timestamp": now}
+    @handle_boto3_errors_async(fallback=lambda self: self._last_good_value())
+    async def _fetch_secret_dict(self) -> dict:
+        now = datetime.now(timezone.utc)
+
+        started = time.perf_counter()
+        async with self._get_client() as client:
+            response = await client.get_secret_value(SecretId=self.base_secret_name)
+        self.metrics.observe(
+            secret_metrics.FETCH_SECONDS, time.perf_counter() - started, self._metric_labels
+        )
+
+        secret_dict = _parse_secret_payload(self.base_secret_name, response)
+        self._cache[self.base_secret_name] = {
+            "value": secret_dict,
+            "timestamp": now,
+            "version_id": response.get("VersionId"),
+        }
         return secret_dict
 
     async def get_secret(
@@ -56,16 +260,103 @@ class SecretManager:
 
     def invalidate(self):
         self._cache.pop(self.base_secret_name, None)
+        self._inflight.pop(self.base_secret_name, None)
+
+    def subscribe(self, callback: Callable[[str, dict], Any]) -> Callable[[], None]:
+        """
+        Registra un callback (síncrono o async) que recibe (base_secret_name, valor)
+        cada vez que el watcher detecta una nueva versión del secreto.
+
+        Returns:
+            Callable: Función que elimina la suscripción.
+        """
+        self._subscribers.append(callback)
+
+        def _unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return _unsubscribe
+
+    def start_watcher(self, interval_seconds: float = 60) -> asyncio.Task:
+        """
+        Lanza una tarea en segundo plano que consulta describe_secret cada
+        `interval_seconds` y solo vuelve a descargar el valor cuando cambia la
+        versión AWSCURRENT o LastChangedDate. Permite usar TTLs largos sin
+        servir credenciales antiguas tras una rotación.
+        """
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.ensure_future(self._watch(interval_seconds))
+        return self._watcher
+
+    async def stop_watcher(self):
+        watcher, self._watcher = self._watcher, None
+        if watcher is None or watcher.done():
+            return
+        watcher.cancel()
+        try:
+            await watcher
+        except asyncio.CancelledError:
+            pass
+
+    async def _watch(self, interval_seconds: float):
+        while True:
+            try:
+                await self.check_for_changes()
+            except Exception as e:
+                logger.warning(
+                    f"[SecretsManager] Error vigilando el secreto '{self.base_secret_name}': {e!r}"
+                )
+            await asyncio.sleep(interval_seconds)
+
+    async def check_for_changes(self) -> bool:
+        """
+        Una iteración del watcher. Devuelve True si el secreto cambió y se
+        recargó el valor (notificando a los suscriptores).
+        """
+        response = await self._describe_secret()
+        seen = (_awscurrent_version(response), response.get("LastChangedDate"))
+        previous, self._last_seen_version = self._last_seen_version, seen
+
+        entry = self._cache.get(self.base_secret_name)
+        cached_version = entry.get("version_id") if entry else None
+
+        if previous is None:
+            # Primera observación: solo hay cambio si el caché tiene otra versión
+            changed = cached_version is not None and cached_version != seen[0]
+        else:
+            # Si el caché ya tiene esa versión (p. ej. escritura propia) no hay que recargar
+            changed = seen != previous and (
+                cached_version is None or cached_version != seen[0]
+            )
+
+        if not changed:
+            return False
+
+        # asyncio.shield: el valor nuevo se guarda aunque se detenga el watcher
+        value = await asyncio.shield(self._refresh_secret_dict())
+        await self._notify(value)
+        return True
+
+    async def _notify(self, value: dict):
+        for callback in list(self._subscribers):
+            try:
+                result = callback(self.base_secret_name, value)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(
+                    f"[SecretsManager] Error en suscriptor del secreto '{self.base_secret_name}': {e!r}",
+                    exc_info=e,
+                )
 
     @handle_boto3_errors_async
     async def create_secret(self, initial_data: dict):
         if not isinstance(initial_data, dict):
             raise ValueError("El dato inicial debe ser un diccionario.")
 
-        async with self._session.client(
-            "secretsmanager", region_name=self.region_name
-        ) as client:
-            await client.create_secret(
+        async with self._get_client() as client:
+            response = await client.create_secret(
                 Name=self.base_secret_name,
                 SecretString=json.dumps(initial_data),
             )
@@ -73,40 +364,157 @@ class SecretManager:
         self._cache[self.base_secret_name] = {
             "value": initial_data,
             "timestamp": datetime.now(timezone.utc),
+            "version_id": response.get("VersionId"),
         }
 
     @handle_boto3_errors_async
-    async def _save_secret_dict(self, data: dict):
-        async with self._session.client(
-            "secretsmanager", region_name=self.region_name
-        ) as client:
-            await client.update_secret(
+    async def _describe_secret(self) -> dict:
+        """Metadatos del secreto (versiones, fechas) sin descargar el payload."""
+        async with self._get_client() as client:
+            return await client.describe_secret(SecretId=self.base_secret_name)
+
+    @handle_boto3_errors_async
+    async def _put_pending_version(self, data: dict, token: str) -> str:
+        """
+        Escribe `data` como nueva versión, aún no visible, con una etiqueta
+        privada de esta escritura (AWSPENDING pertenece a las lambdas de
+        rotación). `token` hace idempotente el reintento de la llamada.
+        """
+        async with self._get_client() as client:
+            response = await client.put_secret_value(
                 SecretId=self.base_secret_name,
                 SecretString=json.dumps(data),
+                ClientRequestToken=token,
+                VersionStages=[_pending_stage(token)],
             )
+        return response["VersionId"]
 
-        self._cache[self.base_secret_name] = {
-            "value": data,
-            "timestamp": datetime.now(timezone.utc),
-        }
+    @handle_boto3_errors_async
+    async def _promote_version(self, version_id: str, base_version: str) -> bool:
+        """
+        Mueve AWSCURRENT de `base_version` a `version_id` en una sola llamada.
+        AWS la rechaza si AWSCURRENT ya no está en `base_version`: en ese caso
+        devuelve False (otro proceso escribió entretanto).
+        """
+        async with self._get_client() as client:
+            try:
+                await client.update_secret_version_stage(
+                    SecretId=self.base_secret_name,
+                    VersionStage="AWSCURRENT",
+                    MoveToVersionId=version_id,
+                    RemoveFromVersionId=base_version,
+                )
+            except ClientError as e:
+                if aws_error_code(e) != "InvalidParameterException":
+                    raise
+                return False
+        return True
+
+    async def _clear_pending(self, version_id: str, token: str):
+        """Quita la etiqueta privada de la versión escrita por update_many (best effort)."""
+        stage = _pending_stage(token)
+        try:
+            async with self._get_client() as client:
+                await client.update_secret_version_stage(
+                    SecretId=self.base_secret_name,
+                    VersionStage=stage,
+                    RemoveFromVersionId=version_id,
+                )
+        except (ClientError, BotoCoreError) as e:
+            logger.warning(
+                f"[SecretsManager] No se pudo quitar {stage} de '{self.base_secret_name}' "
+                f"({version_id}): {e!r}"
+            )
+
+    async def update_many(
+        self,
+        mapping: Optional[Mapping[str, Any]] = None,
+        deletes: Iterable[str] = (),
+        max_retries: int = 3,
+    ) -> dict:
+        """
+        Aplica varios cambios de claves en una sola escritura.
+
+        Control de concurrencia optimista (compare-and-swap): el nuevo valor se
+        escribe como versión nueva con una etiqueta privada (EXPCORE_PENDING_*)
+        y después se mueve AWSCURRENT desde la VersionId sobre la que se
+        calcularon los cambios. Si otro proceso escribió entretanto AWS rechaza
+        el movimiento, y se relee el secreto y se reintenta. El caché local se
+        actualiza con el resultado sin volver a leer de AWS.
+
+        Args:
+            mapping (Mapping[str, Any]): Claves a crear o actualizar.
+            deletes (Iterable[str]): Claves a eliminar.
+            max_retries (int): Reintentos ante conflicto de versión.
+
+        Returns:
+            dict: Contenido del secreto tras la escritura.
+
+        Raises:
+            SecretConflictError: Si el conflicto persiste tras los reintentos.
+        """
+        mapping = dict(mapping or {})
+        deletes = list(deletes)
+
+        for attempt in range(max_retries + 1):
+            current = await self._get_secret_dict()
+            entry = self._cache.get(self.base_secret_name) or {}
+            base_version = entry.get("version_id")
+            if base_version is None:
+                # Caché sin VersionId: se toma AWSCURRENT de AWS y se relee el
+                # valor después, así una escritura intermedia hace fallar el CAS
+                base_version = _awscurrent_version(await self._describe_secret())
+                self.invalidate()
+                current = await self._get_secret_dict()
+                entry = self._cache.get(self.base_secret_name) or {}
+                base_version = entry.get("version_id") or base_version
+
+            data = dict(current)
+            data.update(mapping)
+            for key in deletes:
+                data.pop(key, None)
+
+            if data == current:
+                return current
+
+            token = str(uuid.uuid4())
+            version_id = await self._put_pending_version(data, token)
+            promoted = await self._promote_version(version_id, base_version)
+            await self._clear_pending(version_id, token)
+            if promoted:
+                self._cache[self.base_secret_name] = {
+                    "value": data,
+                    "timestamp": datetime.now(timezone.utc),
+                    "version_id": version_id,
+                }
+                return data
+
+            self.invalidate()
+            if attempt < max_retries:
+                await asyncio.sleep(random.uniform(0, 0.05 * (2**attempt)))
+
+        raise SecretConflictError(self.base_secret_name, attempts=max_retries + 1)
+
+    def transaction(self, max_retries: int = 3) -> "SecretTransaction":
+        """
+        Agrupa cambios y los escribe con update_many() al salir del bloque:
+
+            async with manager.transaction() as tx:
+                tx.set("api_key", "...")
+                tx.delete("old_token")
+        """
+        return SecretTransaction(self, max_retries=max_retries)
 
     async def set_secret(self, key: str, value: Any):
-        data = await self._get_secret_dict()
-        data[key] = value
-        await self._save_secret_dict(data)
+        await self.update_many({key: value})
 
     async def delete_key(self, key: str):
-        data = await self._get_secret_dict()
-        if key in data:
-            del data[key]
-            await self._save_secret_dict(data)
+        await self.update_many(deletes=[key])
 
     @handle_boto3_errors_async
     async def delete_secret(self, force_delete: bool = False, recovery_days: int = 7):
         self.invalidate()
-        async with self._session.client(
-            "secretsmanager", region_name=self.region_name
-        ) as client:
+        async with self._get_client() as client:
             if force_delete:
                 await client.delete_secret(
                     SecretId=self.base_secret_name, ForceDeleteWithoutRecovery=True
@@ -116,14 +524,108 @@ class SecretManager:
                     SecretId=self.base_secret_name, RecoveryWindowInDays=recovery_days
                 )
 
-    @handle_boto3_errors_async
-    async def list_secrets(self) -> List[str]:
-        secrets = []
-        async with self._session.client(
-            "secretsmanager", region_name=self.region_name
-        ) as client:
-            paginator = client.get_paginator("list_secrets")
-            async for page in paginator.paginate():
+    @handle_boto3_errors_async(circuit_breaker=False)
+    async def _list_secrets_page(self, client, request: dict) -> dict:
+        return await client.list_secrets(**request)
+
+    async def iter_secrets(
+        self,
+        prefix: Optional[str] = None,
+        tags: Optional[Mapping[str, Optional[str]]] = None,
+        metadata: bool = False,
+        page_size: int = 100,
+    ) -> AsyncIterator[Union[str, SecretMetadata]]:
+        """
+        Recorre los secretos de la cuenta página a página, sin materializar la
+        lista completa. Los filtros se envían a la API (Filters), no se aplican
+        en local.
+
+        Args:
+            prefix (str): Prefijo del nombre (p. ej. "tenants/").
+            tags (Mapping[str, str | None]): Tags requeridos; None como valor
+                filtra solo por la existencia de la clave.
+            metadata (bool): Si True produce SecretMetadata en vez del nombre.
+            page_size (int): MaxResults por página (máx. 100).
+        """
+        request: Dict[str, Any] = {"MaxResults": page_size}
+        filters = _list_filters(prefix, tags)
+        if filters:
+            request["Filters"] = filters
+
+        async with self._get_client() as client:
+            while True:
+                page = await self._list_secrets_page(client, request)
                 for secret in page.get("SecretList", []):
-                    secrets.append(secret["Name"])
+                    if metadata:
+                        yield SecretMetadata(
+                            name=secret["Name"],
+                            arn=secret.get("ARN"),
+                            last_changed_date=secret.get("LastChangedDate"),
+                            tags={t["Key"]: t["Value"] for t in secret.get("Tags", [])},
+                        )
+                    else:
+                        yield secret["Name"]
+
+                next_token = page.get("NextToken")
+                if not next_token:
+                    break
+                request["NextToken"] = next_token
+
+    async def list_secrets(
+        self,
+        prefix: Optional[str] = None,
+        tags: Optional[Mapping[str, Optional[str]]] = None,
+        ttl_seconds: int = 0,
+    ) -> List[str]:
+        """
+        Lista los nombres de secretos (filtrados en la API por prefijo/tags).
+
+        Con ttl_seconds > 0 el resultado se cachea ese tiempo por combinación de
+        filtros, pensado para endpoints de administración que listan a menudo.
+        """
+        cache_key = (prefix, tuple(sorted((tags or {}).items())))
+        now = datetime.now(timezone.utc)
+
+        if ttl_seconds > 0:
+            entry = self._listing_cache.get(cache_key)
+            if entry and (now - entry["timestamp"]).total_seconds() < ttl_seconds:
+                return list(entry["value"])
+
+        secrets = [name async for name in self.iter_secrets(prefix=prefix, tags=tags)]
+
+        if ttl_seconds > 0:
+            self._listing_cache[cache_key] = {"value": secrets, "timestamp": now}
         return secrets
+
+
+class SecretTransaction:
+    """Cambios pendientes sobre un secreto; se confirman en una única escritura."""
+
+    def __init__(self, manager: SecretManager, max_retries: int = 3):
+        self._manager = manager
+        self._max_retries = max_retries
+        self._updates: Dict[str, Any] = {}
+        self._deletes: Dict[str, None] = {}
+
+    def set(self, key: str, value: Any):
+        self._deletes.pop(key, None)
+        self._updates[key] = value
+
+    def delete(self, key: str):
+        self._updates.pop(key, None)
+        self._deletes[key] = None
+
+    async def commit(self) -> dict:
+        result = await self._manager.update_many(
+            self._updates, self._deletes, max_retries=self._max_retries
+        )
+        self._updates.clear()
+        self._deletes.clear()
+        return result
+
+    async def __aenter__(self) -> "SecretTransaction":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.commit()
@@ -0,0 +1,131 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from exponential_core.utils.aws_retry import AWS_ERRORS_METRIC
+
+# Buckets (segundos) del histograma de latencia de descarga
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Nombres de métricas emitidas por SecretManager / SyncSecretManager
+CACHE_HITS = "exponential_secrets_cache_hits_total"
+CACHE_MISSES = "exponential_secrets_cache_misses_total"
+CACHE_STALE = "exponential_secrets_cache_stale_total"
+FETCH_SECONDS = "exponential_secrets_fetch_seconds"
+ERRORS = AWS_ERRORS_METRIC
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Mapping[str, str]]) -> _LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class SecretMetrics:
+    """
+    Interfaz mínima de métricas del gestor de secretos.
+    La implementación base no hace nada (coste prácticamente nulo).
+    """
+
+    def incr(self, name: str, labels: Optional[Mapping[str, str]] = None, value: float = 1):
+        pass
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None):
+        pass
+
+
+NOOP_METRICS = SecretMetrics()
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        idx = bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+
+class InMemorySecretMetrics(SecretMetrics):
+    """
+    Contadores e histogramas en memoria con exportación en formato de texto
+    de Prometheus (render_prometheus) para exponerlos en un endpoint /metrics.
+    """
+
+    def __init__(self, latency_buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = tuple(sorted(latency_buckets))
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, _Histogram]] = {}
+
+    def incr(self, name: str, labels: Optional[Mapping[str, str]] = None, value: float = 1):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._buckets)
+            histogram.observe(value)
+
+    def counter(self, name: str, labels: Optional[Mapping[str, str]] = None) -> float:
+        """Valor de un contador; sin labels suma todas las series."""
+        series = self._counters.get(name, {})
+        if labels is None:
+            return sum(series.values())
+        return series.get(_label_key(labels), 0)
+
+    def hit_ratio(self, secret: Optional[str] = None) -> Optional[float]:
+        """Proporción de lecturas servidas desde caché (incluye stale)."""
+        labels = {"secret": secret} if secret else None
+        hits = self.counter(CACHE_HITS, labels) + self.counter(CACHE_STALE, labels)
+        total = hits + self.counter(CACHE_MISSES, labels)
+        return hits / total if total else None
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}"
+                        )
+                    lines.append(
+                        f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}"
+                    )
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,294 @@
+import asyncio
+import aioboto3
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Any, Iterable, MutableMapping
+
+from botocore.exceptions import ClientError
+
+from exponential_core.secrets.aws_error_handler_async import handle_boto3_errors_async
+from exponential_core.utils.aws_retry import aws_error_code
+from exponential_core.secrets.cache import InMemorySecretCache
+from exponential_core.secrets.metrics import NOOP_METRICS, SecretMetrics
+from exponential_core.secrets.manager import SecretManager, _parse_secret_payload
+from exponential_core.logger import get_logger
+
+logger = get_logger()
+
+# Límite de SecretIdList en BatchGetSecretValue
+_BATCH_SIZE = 20
+
+# Errores por los que se abandona el batch y se usan get_secret_value en paralelo
+# (p. ej. la política IAM no incluye secretsmanager:BatchGetSecretValue)
+_BATCH_FALLBACK_CODES = {"AccessDeniedException", "InvalidAction", "UnknownOperation"}
+
+
+class _BatchUnavailable(Exception):
+    """BatchGetSecretValue no existe en el cliente o no está permitido."""
+
+
+def _chunk_name(registry, client, chunk: List[str]) -> str:
+    return ", ".join(chunk)
+
+
+class SecretRegistry:
+    """
+    Agrupa varios SecretManager (uno por secreto / tenant) que comparten la
+    misma sesión, el mismo caché, las descargas en curso y, tras start(), el
+    mismo cliente persistente.
+
+    Uso típico:
+        async with SecretRegistry() as registry:
+            await registry.prefetch(["tenant/B12345678", "tenant/B87654321"])
+            api_key = await registry.get_secret("tenant/B12345678", "api_key")
+    """
+
+    def __init__(
+        self,
+        region_name: str = "eu-west-3",
+        default_ttl_seconds: int = 300,
+        stale_grace_seconds: int = 0,
+        max_concurrency: int = 10,
+        cache_backend: Optional[MutableMapping] = None,
+        metrics: Optional[SecretMetrics] = None,
+    ):
+        self._session = aioboto3.Session()
+        self.region_name = region_name
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stale_grace_seconds = stale_grace_seconds
+        self.max_concurrency = max_concurrency
+        self.metrics = metrics if metrics is not None else NOOP_METRICS
+
+        self._cache: MutableMapping = (
+            cache_backend if cache_backend is not None else InMemorySecretCache()
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._managers: Dict[str, SecretManager] = {}
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+
+    def manager(self, secret_name: str) -> SecretManager:
+        """Devuelve (creándolo si hace falta) el SecretManager asociado al secreto."""
+        manager = self._managers.get(secret_name)
+        if manager is None:
+            manager = SecretManager(
+                secret_name,
+                region_name=self.region_name,
+                default_ttl_seconds=self.default_ttl_seconds,
+                stale_grace_seconds=self.stale_grace_seconds,
+                session=self._session,
+                cache_backend=self._cache,
+                metrics=self.metrics,
+                inflight=self._inflight,
+            )
+            manager.bind_client(self._client)
+            self._managers[secret_name] = manager
+        return manager
+
+    async def get_secret(
+        self,
+        secret_name: str,
+        key: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> Any:
+        return await self.manager(secret_name).get_secret(key, ttl_seconds)
+
+    def invalidate(self, secret_name: Optional[str] = None):
+        """
+        Invalida un secreto concreto o, sin argumentos, todos los de este
+        registro. No vacía el caché completo: puede estar compartido con otros
+        procesos (SQLiteSecretCache).
+        """
+        if secret_name is None:
+            for manager in self._managers.values():
+                manager.invalidate()
+        else:
+            self.manager(secret_name).invalidate()
+
+    async def start(self) -> "SecretRegistry":
+        """Abre un cliente persistente compartido por todos los managers."""
+        if self._client is not None:
+            return self
+
+        exit_stack = AsyncExitStack()
+        self._client = await exit_stack.enter_async_context(
+            self._session.client("secretsmanager", region_name=self.region_name)
+        )
+        self._exit_stack = exit_stack
+        for manager in self._managers.values():
+            manager.bind_client(self._client)
+        return self
+
+    async def aclose(self):
+        exit_stack, self._exit_stack = self._exit_stack, None
+        self._client = None
+        for manager in self._managers.values():
+            await manager.stop_watcher()
+            manager.bind_client(None)
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    async def __aenter__(self) -> "SecretRegistry":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def prefetch(
+        self,
+        secret_names: Iterable[str],
+        ttl_seconds: Optional[int] = None,
+        use_batch: bool = True,
+    ) -> Dict[str, dict]:
+        """
+        Precarga en caché los secretos indicados que no estén ya vigentes.
+
+        Usa BatchGetSecretValue (hasta 20 secretos por llamada, cada lote con
+        sus propios reintentos). Si la API no está disponible o no está
+        permitida, o un lote agota sus reintentos, esos secretos se piden con
+        get_secret_value en paralelo limitado por max_concurrency. Los
+        secretos que fallan se registran en el log y se omiten del resultado.
+
+        Returns:
+            Dict[str, dict]: Secretos cargados, indexados por nombre.
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+        now = datetime.now(timezone.utc)
+
+        result: Dict[str, dict] = {}
+        pending: List[str] = []
+        for name in dict.fromkeys(secret_names):
+            self.manager(name)
+            entry = self._cache.get(name)
+            if entry and (now - entry["timestamp"]).total_seconds() < ttl:
+                result[name] = entry["value"]
+            else:
+                pending.append(name)
+
+        if not pending:
+            return result
+
+        if use_batch:
+            result.update(await self._batch_fetch(pending))
+        else:
+            result.update(await self._parallel_fetch(pending))
+        return result
+
+    async def _batch_fetch(self, secret_names: List[str]) -> Dict[str, dict]:
+        """
+        Carga por lotes. Un lote que falla (reintentos agotados) se registra y
+        sus secretos se piden con get_secret_value en paralelo; si la API deja
+        de estar disponible, lo mismo ocurre con los lotes restantes. Lo ya
+        cargado se conserva.
+        """
+        loaded: Dict[str, dict] = {}
+        fallback: List[str] = []
+        requested = set(secret_names)
+
+        async with self.manager(secret_names[0])._get_client() as client:
+            batch_available = hasattr(client, "batch_get_secret_value")
+            if not batch_available:
+                logger.warning(
+                    "[SecretRegistry] El cliente no incluye batch_get_secret_value, "
+                    "usando get_secret_value en paralelo."
+                )
+
+            for i in range(0, len(secret_names), _BATCH_SIZE):
+                chunk = secret_names[i : i + _BATCH_SIZE]
+                if not batch_available:
+                    fallback.extend(chunk)
+                    continue
+
+                try:
+                    pages = await self._batch_get_chunk(client, chunk)
+                except _BatchUnavailable as e:
+                    logger.warning(
+                        f"[SecretRegistry] BatchGetSecretValue no disponible ({e!r}), "
+                        "usando get_secret_value en paralelo."
+                    )
+                    batch_available = False
+                    fallback.extend(chunk)
+                    continue
+                except Exception as e:
+                    logger.warning(
+                        f"[SecretRegistry] Falló el lote ({', '.join(chunk)}): {e!r}, "
+                        "usando get_secret_value en paralelo."
+                    )
+                    fallback.extend(chunk)
+                    continue
+
+                loaded.update(self._store_batch_pages(pages, requested))
+
+        if fallback:
+            loaded.update(await self._parallel_fetch(fallback))
+        return loaded
+
+    def _store_batch_pages(self, pages: List[dict], requested: set) -> Dict[str, dict]:
+        """Guarda en caché los valores de las páginas y registra los errores por secreto."""
+        loaded: Dict[str, dict] = {}
+        now = datetime.now(timezone.utc)
+        for response in pages:
+            for value in response.get("SecretValues", []):
+                name = value.get("Name")
+                if name not in requested:
+                    name = value.get("ARN", name)
+                try:
+                    secret_dict = _parse_secret_payload(name, value)
+                except ValueError as e:
+                    logger.warning(f"[SecretRegistry] No se pudo precargar '{name}': {e!r}")
+                    continue
+                self._cache[name] = {
+                    "value": secret_dict,
+                    "timestamp": now,
+                    "version_id": value.get("VersionId"),
+                }
+                loaded[name] = secret_dict
+
+            for error in response.get("Errors", []):
+                logger.warning(
+                    f"[SecretRegistry] No se pudo precargar '{error.get('SecretId')}': "
+                    f"{error.get('ErrorCode')} {error.get('Message', '')}"
+                )
+        return loaded
+
+    @handle_boto3_errors_async(circuit_breaker=False, secret_name_of=_chunk_name)
+    async def _batch_get_chunk(self, client, chunk: List[str]) -> List[dict]:
+        """Todas las páginas de BatchGetSecretValue para un lote de hasta 20 secretos."""
+        pages: List[dict] = []
+        next_token = None
+        while True:
+            kwargs = {"SecretIdList": chunk}
+            if next_token:
+                kwargs["NextToken"] = next_token
+            try:
+                response = await client.batch_get_secret_value(**kwargs)
+            except ClientError as e:
+                if aws_error_code(e) in _BATCH_FALLBACK_CODES:
+                    raise _BatchUnavailable(repr(e)) from e
+                raise
+            pages.append(response)
+
+            next_token = response.get("NextToken")
+            if not next_token:
+                return pages
+
+    async def _parallel_fetch(self, secret_names: List[str]) -> Dict[str, dict]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _load(name: str):
+            async with semaphore:
+                return await self.manager(name)._get_secret_dict()
+
+        outcomes = await asyncio.gather(
+            *(_load(name) for name in secret_names), return_exceptions=True
+        )
+
+        loaded: Dict[str, dict] = {}
+        for name, outcome in zip(secret_names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    f"[SecretRegistry] No se pudo precargar '{name}': {outcome!r}"
+                )
+            else:
+                loaded[name] = outcome
+        return loaded
@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Any, MutableMapping
+
+import botocore.session
+
+from exponential_core.secrets.cache import InMemorySecretCache
+from exponential_core.secrets import metrics as secret_metrics
+from exponential_core.secrets.metrics import NOOP_METRICS, SecretMetrics
+from exponential_core.secrets.manager import SecretManager, _parse_secret_payload
+from exponential_core.utils.aws_error_handler import handle_boto3_errors
+
+
+class SyncSecretManager:
+    """
+    Lectura síncrona de secretos para código que no puede hacer await
+    (workers tipo Celery, configuración en tiempo de import).
+
+    Mismo formato de caché, TTL y mapeo de errores que SecretManager. Con
+    from_async() comparte el almacén de caché con un SecretManager del mismo
+    proceso, de modo que lo descargado por uno lo aprovecha el otro.
+
+    Las lecturas concurrentes desde varios hilos están protegidas por un lock:
+    solo un hilo descarga el secreto cuando el caché vence.
+    """
+
+    def __init__(
+        self,
+        base_secret_name: str,
+        region_name: str = "eu-west-3",
+        default_ttl_seconds: int = 300,
+        cache_backend: Optional[MutableMapping] = None,
+        metrics: Optional[SecretMetrics] = None,
+    ):
+        self.base_secret_name = base_secret_name
+        self.region_name = region_name
+        self.default_ttl_seconds = default_ttl_seconds
+        self.metrics = metrics if metrics is not None else NOOP_METRICS
+        self._metric_labels = {"secret": base_secret_name}
+        self._cache: MutableMapping = (
+            cache_backend if cache_backend is not None else InMemorySecretCache()
+        )
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._client = None
+
+    @classmethod
+    def from_async(cls, manager: SecretManager) -> "SyncSecretManager":
+        """Crea un gestor síncrono que comparte caché y configuración con `manager`."""
+        return cls(
+            manager.base_secret_name,
+            region_name=manager.region_name,
+            default_ttl_seconds=manager.default_ttl_seconds,
+            cache_backend=manager._cache,
+            metrics=manager.metrics,
+        )
+
+    def _get_client(self):
+        # Los clientes de botocore son thread-safe: uno por gestor y reutilizado
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = botocore.session.get_session().create_client(
+                        "secretsmanager", region_name=self.region_name
+                    )
+        return self._client
+
+    def _cached_value(self, ttl: int) -> Optional[dict]:
+        entry = self._cache.get(self.base_secret_name)
+        if entry is None:
+            return None
+        age = (datetime.now(timezone.utc) - entry["timestamp"]).total_seconds()
+        return entry["value"] if age < ttl else None
+
+    def _get_secret_dict(self, ttl_seconds: Optional[int] = None) -> dict:
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+
+        value = self._cached_value(ttl)
+        if value is not None:
+            self.metrics.incr(secret_metrics.CACHE_HITS, self._metric_labels)
+            return value
+
+        with self._lock:
+            # Otro hilo pudo haberlo descargado mientras esperábamos el lock
+            value = self._cached_value(ttl)
+            if value is not None:
+                self.metrics.incr(secret_metrics.CACHE_HITS, self._metric_labels)
+                return value
+            self.metrics.incr(secret_metrics.CACHE_MISSES, self._metric_labels)
+            return self._fetch_secret_dict()
+
+    def _last_good_value(self) -> Optional[dict]:
+        entry = self._cache.get(self.base_secret_name)
+        return entry["value"] if entry else None
+
+    @handle_boto3_errors(fallback=lambda self: self._last_good_value())
+    def _fetch_secret_dict(self) -> dict:
+        now = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        response = self._get_client().get_secret_value(SecretId=self.base_secret_name)
+        self.metrics.observe(
+            secret_metrics.FETCH_SECONDS, time.perf_counter() - started, self._metric_labels
+        )
+
+        secret_dict = _parse_secret_payload(self.base_secret_name, response)
+        self._cache[self.base_secret_name] = {
+            "value": secret_dict,
+            "timestamp": now,
+            "version_id": response.get("VersionId"),
+        }
+        return secret_dict
+
+    def get_secret(
+        self, key: Optional[str] = None, ttl_seconds: Optional[int] = None
+    ) -> Any:
+        secret_data = self._get_secret_dict(ttl_seconds)
+        return secret_data if key is None else secret_data.get(key)
+
+    def invalidate(self):
+        self._cache.pop(self.base_secret_name, None)
+
+    def close(self):
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
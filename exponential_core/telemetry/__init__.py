@@ -0,0 +1,32 @@
+# exponential_core/telemetry/__init__.py
+from exponential_core.telemetry.exporters import (
+    FileExporter,
+    InMemoryExporter,
+    OTLPHttpExporter,
+    TelemetryExporter,
+)
+from exponential_core.telemetry.recorder import (
+    DURATION_METRIC,
+    ERRORS_METRIC,
+    TelemetryRecorder,
+    configure_telemetry,
+    get_telemetry,
+    record_exception,
+    shutdown_telemetry,
+)
+from exponential_core.telemetry.middleware import TelemetryMiddleware
+
+__all__ = [
+    "configure_telemetry",
+    "shutdown_telemetry",
+    "get_telemetry",
+    "record_exception",
+    "TelemetryRecorder",
+    "TelemetryMiddleware",
+    "TelemetryExporter",
+    "InMemoryExporter",
+    "FileExporter",
+    "OTLPHttpExporter",
+    "ERRORS_METRIC",
+    "DURATION_METRIC",
+]
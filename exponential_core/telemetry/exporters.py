@@ -0,0 +1,129 @@
+# exponential_core\telemetry\exporters.py
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from exponential_core.logger import get_logger
+
+logger = get_logger()
+
+SIGNALS = ("traces", "metrics")
+
+
+class TelemetryExporter(ABC):
+    """
+    Interfaz de los exportadores. `payload` es un documento OTLP/JSON
+    ({"resourceSpans": [...]} o {"resourceMetrics": [...]}).
+    """
+
+    @abstractmethod
+    def export(self, signal: str, payload: dict):
+        pass
+
+    def close(self):
+        pass
+
+
+class InMemoryExporter(TelemetryExporter):
+    """Guarda los payloads en memoria; pensado para tests."""
+
+    def __init__(self):
+        self.exported: Dict[str, List[dict]] = {signal: [] for signal in SIGNALS}
+        self._lock = threading.Lock()
+
+    def export(self, signal: str, payload: dict):
+        with self._lock:
+            self.exported[signal].append(payload)
+
+    @property
+    def spans(self) -> List[dict]:
+        """Todos los spans exportados, aplanados."""
+        return [
+            span
+            for payload in self.exported["traces"]
+            for resource in payload["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def metric(self, name: str) -> Optional[dict]:
+        """
+        Última exportación de la métrica `name`. La temporalidad es delta: solo
+        contiene lo registrado desde el flush anterior.
+        """
+        for payload in reversed(self.exported["metrics"]):
+            for resource in payload["resourceMetrics"]:
+                for scope in resource["scopeMetrics"]:
+                    for metric in scope["metrics"]:
+                        if metric["name"] == name:
+                            return metric
+        return None
+
+
+class FileExporter(TelemetryExporter):
+    """
+    Añade cada payload como una línea JSON, el mismo formato que el
+    `fileexporter` del OpenTelemetry Collector (se puede reenviar con `otlpjsonfile`).
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, signal: str, payload: dict):
+        line = json.dumps(payload, separators=(",", ":"), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OTLPHttpExporter(TelemetryExporter):
+    """
+    Envía los payloads a un endpoint OTLP/HTTP con codificación JSON
+    (<endpoint>/v1/traces y <endpoint>/v1/metrics).
+
+    Args:
+        endpoint (str): Base del collector; por defecto OTEL_EXPORTER_OTLP_ENDPOINT.
+        headers (dict): Cabeceras extra; por defecto OTEL_EXPORTER_OTLP_HEADERS ("k=v,k2=v2").
+        timeout (float): Timeout por envío en segundos.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5.0,
+    ):
+        endpoint = endpoint or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        if not endpoint:
+            raise ValueError("OTLPHttpExporter requiere endpoint u OTEL_EXPORTER_OTLP_ENDPOINT")
+        self.endpoint = endpoint.rstrip("/")
+        if headers is None:
+            headers = _parse_headers(os.getenv("OTEL_EXPORTER_OTLP_HEADERS", ""))
+        self._client = httpx.Client(
+            timeout=timeout, headers={"Content-Type": "application/json", **headers}
+        )
+
+    def export(self, signal: str, payload: dict):
+        try:
+            response = self._client.post(f"{self.endpoint}/v1/{signal}", json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("[Telemetry] No se pudo exportar %s a %s: %s", signal, self.endpoint, e)
+
+    def close(self):
+        self._client.close()
+
+
+def _parse_headers(raw: str) -> Dict[str, str]:
+    headers = {}
+    for item in raw.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            headers[key.strip()] = value.strip()
+    return headers
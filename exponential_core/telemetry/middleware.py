@@ -0,0 +1,43 @@
+# exponential_core\telemetry\middleware.py
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from exponential_core.telemetry import recorder as _telemetry
+
+
+class TelemetryMiddleware:
+    """
+    Middleware ASGI puro que abre un span por request y mide su latencia
+    (http.server.duration por método, ruta y status). Los exception handlers
+    añaden sus eventos "exception" a este span.
+
+    Si configure_telemetry() no se ha llamado, solo delega en la app.
+
+    Uso:
+        app.add_middleware(TelemetryMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        recorder = _telemetry.get_telemetry()
+        if recorder is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        span = recorder.start_span(scope)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            recorder.end_span(span, scope, status_code, (time.perf_counter() - start) * 1000)
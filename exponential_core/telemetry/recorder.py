@@ -0,0 +1,405 @@
+# exponential_core\telemetry\recorder.py
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from exponential_core.logger import get_logger
+from exponential_core.telemetry.exporters import (
+    FileExporter,
+    OTLPHttpExporter,
+    TelemetryExporter,
+)
+
+try:  # si el servicio usa el SDK de OpenTelemetry, el evento también va a su span
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # pragma: no cover - depende del entorno
+    _otel_trace = None
+
+logger = get_logger()
+
+SCOPE_NAME = "exponential_core"
+SPAN_SCOPE_KEY = "exponential.span"
+ERRORS_METRIC = "http.server.errors"
+DURATION_METRIC = "http.server.duration"
+DEFAULT_DURATION_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Ruta de los requests que el router no resolvió (404, errores previos al routing):
+# el path crudo dispararía la cardinalidad de las métricas
+UNMATCHED_ROUTE = "<unmatched>"
+# Serie única a la que van las observaciones que superan max_series
+OVERFLOW_ROUTE = "<overflow>"
+
+_SPAN_KIND_SERVER = 2
+_STATUS_UNSET, _STATUS_ERROR = 0, 2
+_TEMPORALITY_DELTA = 1
+_ERRORS_OVERFLOW_KEY = (None, OVERFLOW_ROUTE, None, None)
+_DURATIONS_OVERFLOW_KEY = (None, OVERFLOW_ROUTE, None)
+
+
+def _any_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: dict) -> List[dict]:
+    return [{"key": k, "value": _any_value(v)} for k, v in values.items() if v is not None]
+
+
+def route_of(scope: dict) -> str:
+    """Plantilla de la ruta (/invoices/{id}) si el router ya resolvió, si no UNMATCHED_ROUTE."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def parse_traceparent(value: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Devuelve (trace_id, parent_span_id) de una cabecera W3C traceparent válida."""
+    if not value:
+        return None, None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    return parts[1], parts[2]
+
+
+class Span:
+    """Span de servidor (uno por request) en formato OTLP."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "start_ns", "end_ns",
+        "attributes", "events", "error",
+    )
+
+    def __init__(self, name: str, attributes: dict, trace_id: Optional[str] = None,
+                 parent_span_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.events: List[dict] = []
+        self.error = False
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _SPAN_KIND_SERVER,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _attributes(self.attributes),
+            "events": self.events,
+            "status": {"code": _STATUS_ERROR if self.error else _STATUS_UNSET},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class TelemetryRecorder:
+    """
+    Acumula spans de request, eventos de excepción y métricas por ruta, y los
+    exporta en formato OTLP/JSON con flush() (o periódicamente con start()).
+
+    Métricas (temporalidad delta: cada flush exporta y reinicia los contadores):
+        - http.server.errors: contador por método, ruta, status y error_type.
+        - http.server.duration: histograma en ms por método, ruta y status.
+
+    La ruta es la plantilla resuelta por el router (UNMATCHED_ROUTE si no la
+    hay) y cada métrica admite como mucho `max_series` series entre flushes;
+    el resto se acumula en una serie con http.route=OVERFLOW_ROUTE.
+
+    Args:
+        exporter (TelemetryExporter): Destino de los payloads.
+        service_name (str): Atributo service.name del recurso.
+        duration_bounds_ms (tuple): Límites de los buckets del histograma.
+        max_pending_spans (int): Spans retenidos entre flushes; el exceso se descarta.
+        max_series (int): Series por métrica entre flushes.
+    """
+
+    def __init__(
+        self,
+        exporter: TelemetryExporter,
+        service_name: str = "exponential-service",
+        duration_bounds_ms: Tuple[float, ...] = DEFAULT_DURATION_BOUNDS_MS,
+        max_pending_spans: int = 10000,
+        max_series: int = 2000,
+    ):
+        self.exporter = exporter
+        self.service_name = service_name
+        self.duration_bounds_ms = tuple(duration_bounds_ms)
+        self.max_pending_spans = max_pending_spans
+        self.max_series = max_series
+        self.dropped_spans = 0
+        self._start_ns = time.time_ns()
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+        self._errors: Dict[tuple, int] = {}
+        self._durations: Dict[tuple, list] = {}  # key -> [bucket_counts, count, sum]
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    # Registro
+    # ------------------------------------------------------------------ #
+    def start_span(self, scope: dict) -> Span:
+        """Abre el span del request y lo deja en el scope para los handlers."""
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        trace_id, parent_span_id = parse_traceparent(traceparent)
+        method = scope.get("method", "")
+        span = Span(
+            f"{method} {scope.get('path', '')}",
+            {"http.request.method": method, "url.path": scope.get("path")},
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+        )
+        scope[SPAN_SCOPE_KEY] = span
+        return span
+
+    def end_span(self, span: Span, scope: dict, status_code: int, duration_ms: float):
+        route = route_of(scope)
+        with self._lock:
+            span.end_ns = time.time_ns()
+            span.name = f"{span.attributes['http.request.method']} {route}"
+            span.attributes["http.route"] = route
+            span.attributes["http.response.status_code"] = status_code
+            span.error = span.error or status_code >= 500
+            self._add_span(span)
+            self._observe(span.attributes["http.request.method"], route, status_code, duration_ms)
+
+    def record_exception(self, scope: dict, status_code: int, error_type: str,
+                         message: Optional[str] = None):
+        """
+        Registra un error resuelto por un exception handler: cuenta en
+        http.server.errors y añade un evento "exception" al span del request
+        (o a un span suelto si no hay TelemetryMiddleware).
+        """
+        method = scope.get("method", "")
+        route = route_of(scope)
+        attributes = {
+            "exception.type": error_type,
+            "exception.message": message,
+            "http.response.status_code": status_code,
+        }
+        event = {
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": _attributes(attributes),
+        }
+
+        with self._lock:
+            key = (method, route, status_code, error_type)
+            if key not in self._errors and len(self._errors) >= self.max_series:
+                key = _ERRORS_OVERFLOW_KEY
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+            span = scope.get(SPAN_SCOPE_KEY)
+            if span is None:
+                span = Span(f"{method} {route}", {
+                    "http.request.method": method,
+                    "http.route": route,
+                    "http.response.status_code": status_code,
+                })
+                span.end_ns = span.start_ns
+                self._add_span(span)
+            span.events.append(event)
+            span.error = span.error or status_code >= 500
+
+        if _otel_trace is not None:
+            _otel_trace.get_current_span().add_event("exception", attributes={
+                k: v for k, v in attributes.items() if v is not None
+            })
+
+    def _add_span(self, span: Span):
+        if len(self._spans) >= self.max_pending_spans:
+            self.dropped_spans += 1
+            return
+        self._spans.append(span)
+
+    def _observe(self, method: str, route: str, status_code: int, duration_ms: float):
+        key = (method, route, status_code)
+        data = self._durations.get(key)
+        if data is None and len(self._durations) >= self.max_series:
+            key = _DURATIONS_OVERFLOW_KEY
+            data = self._durations.get(key)
+        if data is None:
+            data = self._durations[key] = [[0] * (len(self.duration_bounds_ms) + 1), 0, 0.0]
+        data[0][bisect.bisect_left(self.duration_bounds_ms, duration_ms)] += 1
+        data[1] += 1
+        data[2] += duration_ms
+
+    # ------------------------------------------------------------------ #
+    # Exportación
+    # ------------------------------------------------------------------ #
+    def _resource(self) -> dict:
+        return {"attributes": _attributes({"service.name": self.service_name})}
+
+    def flush(self):
+        """Exporta los spans pendientes y las métricas desde el flush anterior, y las reinicia."""
+        now_ns = time.time_ns()
+        now = str(now_ns)
+        with self._lock:
+            start = str(self._start_ns)
+            self._start_ns = now_ns
+            spans = [span.to_otlp() for span in self._spans]
+            self._spans = []
+            errors = list(self._errors.items())
+            durations = [(k, v[0], v[1], v[2]) for k, v in self._durations.items()]
+            self._errors = {}
+            self._durations = {}
+
+        if spans:
+            self.exporter.export("traces", {"resourceSpans": [{
+                "resource": self._resource(),
+                "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+            }]})
+
+        metrics = []
+        if errors:
+            metrics.append({
+                "name": ERRORS_METRIC,
+                "unit": "1",
+                "sum": {
+                    "aggregationTemporality": _TEMPORALITY_DELTA,
+                    "isMonotonic": True,
+                    "dataPoints": [{
+                        "attributes": _attributes({
+                            "http.request.method": method,
+                            "http.route": route,
+                            "http.response.status_code": status_code,
+                            "error.type": error_type,
+                        }),
+                        "startTimeUnixNano": start,
+                        "timeUnixNano": now,
+                        "asInt": str(count),
+                    } for (method, route, status_code, error_type), count in errors],
+                },
+            })
+        if durations:
+            metrics.append({
+                "name": DURATION_METRIC,
+                "unit": "ms",
+                "histogram": {
+                    "aggregationTemporality": _TEMPORALITY_DELTA,
+                    "dataPoints": [{
+                        "attributes": _attributes({
+                            "http.request.method": method,
+                            "http.route": route,
+                            "http.response.status_code": status_code,
+                        }),
+                        "startTimeUnixNano": start,
+                        "timeUnixNano": now,
+                        "count": str(count),
+                        "sum": total,
+                        "bucketCounts": [str(c) for c in buckets],
+                        "explicitBounds": list(self.duration_bounds_ms),
+                    } for (method, route, status_code), buckets, count, total in durations],
+                },
+            })
+        if metrics:
+            self.exporter.export("metrics", {"resourceMetrics": [{
+                "resource": self._resource(),
+                "scopeMetrics": [{"scope": {"name": SCOPE_NAME}, "metrics": metrics}],
+            }]})
+
+    def start(self, interval_seconds: float = 15.0):
+        """Lanza un hilo en segundo plano que hace flush() cada `interval_seconds`."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.flush()
+                except Exception:  # nunca tumbar el hilo por un fallo de exportación
+                    logger.exception("[Telemetry] Error exportando telemetría")
+
+        self._thread = threading.Thread(target=_run, name="telemetry-exporter", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Detiene el hilo, hace un último flush y cierra el exportador."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self.exporter.close()
+
+
+_recorder: Optional[TelemetryRecorder] = None
+
+
+def get_telemetry() -> Optional[TelemetryRecorder]:
+    return _recorder
+
+
+def configure_telemetry(
+    exporter: Optional[TelemetryExporter] = None,
+    service_name: Optional[str] = None,
+    file_path: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    export_interval_seconds: Optional[float] = 15.0,
+    **recorder_kwargs,
+) -> TelemetryRecorder:
+    """
+    Activa la telemetría de los exception handlers y de TelemetryMiddleware.
+
+    El exportador se elige en este orden: `exporter`, `file_path` (FileExporter),
+    `endpoint` u OTEL_EXPORTER_OTLP_ENDPOINT (OTLPHttpExporter).
+
+    Args:
+        service_name (str): Por defecto OTEL_SERVICE_NAME o "exponential-service".
+        export_interval_seconds (float): Periodo del flush automático; None lo desactiva.
+
+    Returns:
+        TelemetryRecorder: El recorder global.
+    """
+    global _recorder
+
+    if exporter is None:
+        if file_path:
+            exporter = FileExporter(file_path)
+        elif endpoint or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            exporter = OTLPHttpExporter(endpoint)
+        else:
+            raise ValueError(
+                "configure_telemetry requiere exporter, file_path, endpoint u OTEL_EXPORTER_OTLP_ENDPOINT"
+            )
+
+    shutdown_telemetry()
+    _recorder = TelemetryRecorder(
+        exporter,
+        service_name=service_name or os.getenv("OTEL_SERVICE_NAME", "exponential-service"),
+        **recorder_kwargs,
+    )
+    if export_interval_seconds:
+        _recorder.start(export_interval_seconds)
+    return _recorder
+
+
+def shutdown_telemetry():
+    """Exporta lo pendiente y desactiva la telemetría."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.shutdown()
+
+
+def record_exception(scope: dict, status_code: int, error_type: str, message: Optional[str] = None):
+    """Atajo para los exception handlers; no hace nada si la telemetría no está configurada."""
+    if _recorder is not None:
+        _recorder.record_exception(scope, status_code, error_type, message)
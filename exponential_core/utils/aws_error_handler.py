@@ -1,33 +1,113 @@
 # exponential_core\utils\aws_error_handler.py
-from functools import wraps
-from botocore.exceptions import ClientError
+import time
+from functools import partial, wraps
+from typing import Any, Callable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
 
 from exponential_core.exceptions.types import (
+    AWSCircuitOpenError,
+    AWSThrottlingError,
     SecretNotFoundError,
     SecretAlreadyExistsError,
     CustomAppException,
 )
+from exponential_core.utils.aws_retry import (
+    THROTTLING_ERROR_CODES,
+    aws_error_code,
+    backoff_delay,
+    get_circuit_breaker,
+    is_transient_error,
+    record_aws_error,
+)
+
 
+def handle_boto3_errors(
+    func: Optional[Callable] = None,
+    *,
+    retries: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    circuit_breaker: bool = True,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+    fallback: Optional[Callable[..., Any]] = None,
+):
+    """Versión síncrona de handle_boto3_errors_async (mismos parámetros)."""
+    if func is None:
+        return partial(
+            handle_boto3_errors,
+            retries=retries,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            circuit_breaker=circuit_breaker,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            fallback=fallback,
+        )
 
-def handle_boto3_errors(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        name = getattr(self, "base_secret_name", "desconocido")
+        breaker = (
+            get_circuit_breaker(name, failure_threshold, reset_timeout)
+            if circuit_breaker
+            else None
+        )
+
+        if breaker is not None and not breaker.allow():
+            value = fallback(self, *args, **kwargs) if fallback else None
+            if value is not None:
+                return value
+            raise AWSCircuitOpenError(name)
+
+        attempt = 0
         try:
-            return func(self, *args, **kwargs)
-        except ClientError as e:
-            code = e.response["Error"]["Code"]
-            name = getattr(self, "base_secret_name", "desconocido")
-
-            if code == "ResourceNotFoundException":
-                raise SecretNotFoundError(secret_name=name) from e
-            elif code == "ResourceExistsException":
-                raise SecretAlreadyExistsError(secret_name=name) from e
-
-            # Cualquier otro error de boto3
-            raise CustomAppException(
-                message=f"Error inesperado de AWS Secrets Manager ({code})",
-                status_code=500,
-                data={"secret_name": name, "raw_error": str(e)},
-            ) from e
+            while True:
+                try:
+                    result = func(self, *args, **kwargs)
+                except (ClientError, BotoCoreError) as e:
+                    code = aws_error_code(e)
+                    record_aws_error(self, name, code)
+                    transient = is_transient_error(e)
+
+                    if transient and attempt < retries:
+                        time.sleep(backoff_delay(attempt, base_delay, max_delay))
+                        attempt += 1
+                        continue
+
+                    if breaker is not None:
+                        if transient:
+                            breaker.record_failure()
+                        else:
+                            # 4xx: AWS respondió, el servicio está disponible
+                            breaker.record_success()
+
+                    if code == "ResourceNotFoundException":
+                        raise SecretNotFoundError(secret_name=name) from e
+                    elif code == "ResourceExistsException":
+                        raise SecretAlreadyExistsError(secret_name=name) from e
+
+                    value = fallback(self, *args, **kwargs) if fallback else None
+                    if value is not None:
+                        return value
+
+                    if code in THROTTLING_ERROR_CODES:
+                        raise AWSThrottlingError(name, code) from e
+
+                    # Cualquier otro error de boto3/botocore
+                    raise CustomAppException(
+                        message=f"Error inesperado de AWS Secrets Manager ({code})",
+                        status_code=500,
+                        data={"secret_name": name, "raw_error": str(e)},
+                    ) from e
+
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+        except BaseException:
+            if breaker is not None:
+                breaker.record_aborted()
+            raise
 
     return wrapper
@@ -0,0 +1,150 @@
+# exponential_core\utils\aws_retry.py
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Errores transitorios de AWS que se reintentan con backoff
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "Throttling",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+    }
+)
+RETRYABLE_ERROR_CODES = THROTTLING_ERROR_CODES | frozenset(
+    {
+        "InternalServiceError",
+        "InternalFailure",
+        "ServiceUnavailable",
+        "RequestTimeout",
+    }
+)
+
+# Contador de errores de AWS por código (ver exponential_core.secrets.metrics)
+AWS_ERRORS_METRIC = "exponential_secrets_errors_total"
+
+
+def record_aws_error(instance, secret_name: str, error_code: Optional[str]):
+    """Cuenta el error en `instance.metrics` si el objeto decorado expone métricas."""
+    metrics = getattr(instance, "metrics", None)
+    if metrics is not None:
+        metrics.incr(
+            AWS_ERRORS_METRIC, {"secret": secret_name, "code": error_code or "Unknown"}
+        )
+
+
+def client_error_code(exc: ClientError) -> Optional[str]:
+    return exc.response.get("Error", {}).get("Code")
+
+
+def aws_error_code(exc: Exception) -> Optional[str]:
+    """Código de un ClientError, o el nombre de la clase para errores de botocore (red)."""
+    if isinstance(exc, ClientError):
+        return client_error_code(exc)
+    return type(exc).__name__
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """
+    Throttling, 5xx de AWS o errores de red/botocore (EndpointConnectionError,
+    timeouts...). Son los únicos que se reintentan y cuentan para el circuit
+    breaker; un 4xx significa que AWS respondió.
+    """
+    if isinstance(exc, BotoCoreError):
+        return True
+    if isinstance(exc, ClientError):
+        if client_error_code(exc) in RETRYABLE_ERROR_CODES:
+            return True
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return isinstance(status, int) and status >= 500
+    return False
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Backoff exponencial con jitter completo: uniforme en [0, min(max, base·2^n)]."""
+    return random.uniform(0, min(max_delay, base_delay * (2**attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clásico (cerrado → abierto → semiabierto).
+
+    - Cerrado: las llamadas pasan; cada fallo consecutivo suma.
+    - Abierto: tras `failure_threshold` fallos seguidos se rechazan las llamadas
+      durante `reset_timeout` segundos.
+    - Semiabierto: pasado ese tiempo se deja pasar una única llamada de prueba;
+      si tiene éxito se cierra, si falla (o lanza cualquier otra excepción) se
+      vuelve a abrir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and (
+                time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_aborted(self):
+        """
+        La llamada terminó sin resultado de AWS (otra excepción, cancelación).
+        Si era la llamada de prueba del semiabierto se vuelve a abrir; si no,
+        quedaría semiabierto para siempre rechazando todas las llamadas.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+) -> CircuitBreaker:
+    """Circuit breaker compartido por nombre de secreto dentro del proceso."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                name, CircuitBreaker(failure_threshold, reset_timeout)
+            )
+    return breaker
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
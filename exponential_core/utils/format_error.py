@@ -1,5 +1,17 @@
 # exponential_core\utils\format_error.py
+import json
 from datetime import datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+from fastapi.encoders import decimal_encoder, jsonable_encoder
+from starlette.responses import Response
+
+try:  # orjson es opcional: serializa varias veces más rápido que json
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
 
 
 def format_error_response(
@@ -25,3 +37,103 @@ def format_error_response(
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
+
+def _default(obj: Any) -> Any:
+    # Mismo criterio que jsonable_encoder: Decimal -> int/float, el resto
+    # (modelos pydantic, sets, enums...) se delega en él
+    if isinstance(obj, Decimal):
+        return decimal_encoder(obj)
+    return jsonable_encoder(obj)
+
+
+def _json_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serializa a JSON (bytes UTF-8) con orjson si está disponible.
+
+    Lo que orjson no admite (claves no primitivas, enteros de más de 64 bits...)
+    se resuelve con json + jsonable_encoder, igual que antes de orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError hereda de TypeError
+            return _json_dumps(jsonable_encoder(content))
+    return _json_dumps(content)
+
+
+class JSONBytesResponse(Response):
+    """Respuesta JSON cuyo body ya viene serializado (no se vuelve a codificar)."""
+
+    media_type = "application/json"
+
+
+_DETAIL_PREFIX = b'{"detail":'
+
+
+@lru_cache(maxsize=512)
+def _static_parts(error_type: str, status_code: int) -> Tuple[bytes, bytes]:
+    """
+    Partes fijas del body estándar para (error_type, status_code): lo que va
+    entre el valor de detail y el de timestamp, y el cierre tras timestamp.
+    `detail` se serializa en cada request para no cachear textos arbitrarios.
+    """
+    body = dumps_json(
+        {"detail": "", "error_type": error_type, "status_code": status_code, "timestamp": ""}
+    )
+    middle, suffix = body[len(_DETAIL_PREFIX) + 2 :].rsplit(b'""', 1)
+    return middle + b'"', b'"' + suffix
+
+
+def error_response(
+    detail: Any,
+    error_type: str,
+    status_code: int,
+    timestamp: Optional[str] = None,
+    data: Any = None,
+) -> JSONBytesResponse:
+    """
+    Construye la respuesta de error estándar
+    ({"detail", "error_type", "status_code", "timestamp"[, "data"]}).
+
+    Cuando `detail` es un texto y no hay `data` (404, 422, 500...), el body se
+    arma con las partes fijas cacheadas por (error_type, status_code) y solo se
+    serializan detail y timestamp.
+
+    Args:
+        detail: Mensaje para el cliente.
+        error_type (str): Tipo o categoría del error.
+        status_code (int): Código HTTP.
+        timestamp (str): ISO 8601; por defecto ahora en UTC.
+        data: Payload adicional opcional (admite Decimal, datetime, modelos...).
+
+    Returns:
+        JSONBytesResponse: Respuesta lista para devolver desde un handler.
+    """
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+
+    if isinstance(detail, str) and not data:
+        middle, suffix = _static_parts(error_type, status_code)
+        body = _DETAIL_PREFIX + dumps_json(detail) + middle + timestamp.encode("ascii") + suffix
+    else:
+        content = {
+            "detail": detail,
+            "error_type": error_type,
+            "status_code": status_code,
+            "timestamp": timestamp,
+        }
+        if data:
+            content["data"] = data
+        body = dumps_json(content)
+
+    return JSONBytesResponse(content=body, status_code=status_code)
+
+
+def json_response(content: Any, status_code: int) -> JSONBytesResponse:
+    """Respuesta JSON para payloads arbitrarios, sin pasar por jsonable_encoder."""
+    return JSONBytesResponse(content=dumps_json(content), status_code=status_code)
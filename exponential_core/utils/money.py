@@ -0,0 +1,163 @@
+# exponential_core\utils\money.py
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Annotated, Any, Optional
+
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic_core import core_schema
+
+# Espacios (incl. no separables), apóstrofo suizo y símbolos de moneda
+_STRIP = str.maketrans("", "", " \t  '’€$£")
+_CURRENCY_CODES = ("EUR", "USD", "GBP", "ARS", "MXN", "COP", "CLP")
+_QUANTS = {places: Decimal(1).scaleb(-places) for places in range(0, 9)}
+
+
+def _ungroup(digits: str, separator: str, text: str) -> str:
+    """Quita el separador de miles exigiendo grupos de 3 cifras tras el primero."""
+    groups = digits.split(separator)
+    if not 1 <= len(groups[0]) <= 3 or any(len(group) != 3 for group in groups[1:]):
+        raise ValueError(f"Importe inválido: {text!r}")
+    return "".join(groups)
+
+
+def parse_decimal(text: str) -> Decimal:
+    """
+    Convierte un importe escrito en formato europeo o estadounidense a Decimal.
+
+    - "1.234,56", "1 234,56", "1'234.56", "1,234.56" -> 1234.56
+    - "7,50" / "7.50" -> 7.50 (un único separador es siempre el decimal)
+    - "1.234.567" / "1,234,567" -> 1234567 (separador repetido = miles)
+    - "-5,00", "5,00-", "(5,00)", "€ 5,00", "5,00 EUR" -> con signo y sin moneda
+
+    Los separadores de miles deben agrupar de 3 en 3 ("1.2.3,4" o "1..2" no son
+    importes) y no se admite "_" (Decimal sí lo acepta: "1_000").
+
+    Raises:
+        ValueError: si el texto no es un número finito.
+    """
+    if "_" in text:
+        raise ValueError(f"Importe inválido: {text!r}")
+
+    # Caso común: "1234.56", "-7", "1e3" (Decimal ya admite espacios alrededor)
+    if "," not in text:
+        try:
+            value = Decimal(text)
+        except InvalidOperation:
+            pass
+        else:
+            if not value.is_finite():
+                raise ValueError(f"Importe inválido: {text!r}")
+            return value
+
+    s = text.translate(_STRIP)
+    if s[-3:].upper() in _CURRENCY_CODES:
+        s = s[:-3]
+    elif s[:3].upper() in _CURRENCY_CODES:
+        s = s[3:]
+
+    negative = False
+    if s[:1] == "(" and s[-1:] == ")":
+        negative, s = True, s[1:-1]
+    if s[-1:] == "-":
+        negative, s = not negative, s[:-1]
+    if s[:1] in ("-", "+"):
+        negative, s = negative != (s[0] == "-"), s[1:]
+
+    if "e" in s or "E" in s:
+        s = s.replace(",", ".")
+    else:
+        comma = s.rfind(",")
+        dot = s.rfind(".")
+        if comma >= 0 and dot >= 0:
+            # El último separador es el decimal y el otro el de miles
+            decimal, thousands = (",", ".") if comma > dot else (".", ",")
+            integer, fraction = s.rsplit(decimal, 1)
+            if decimal in integer:
+                raise ValueError(f"Importe inválido: {text!r}")
+            s = _ungroup(integer, thousands, text) + "." + fraction
+        elif comma >= 0:
+            s = s.replace(",", ".") if s.count(",") == 1 else _ungroup(s, ",", text)
+        elif dot >= 0 and s.count(".") > 1:
+            s = _ungroup(s, ".", text)
+
+    try:
+        value = Decimal("-" + s if negative else s)
+    except InvalidOperation:
+        raise ValueError(f"Importe inválido: {text!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"Importe inválido: {text!r}")
+    return value
+
+
+def to_decimal(value: Any, places: Optional[int] = None) -> Decimal:
+    """
+    Coerción de int/float/str/Decimal a Decimal, cuantizando a `places`
+    decimales (ROUND_HALF_UP) si se indica.
+
+    Raises:
+        ValueError: si el valor no es numérico o no es finito.
+    """
+    if isinstance(value, str):
+        value = parse_decimal(value)
+    elif isinstance(value, bool):  # antes que int: bool es subclase de int
+        raise ValueError(f"Se esperaba un número, llegó {value!r}")
+    elif isinstance(value, int):
+        value = Decimal(value)
+    elif isinstance(value, float):
+        # str() evita los artefactos binarios (0.1 -> 0.1, no 0.1000000000000000055...)
+        value = Decimal(str(float(value)))
+        if not value.is_finite():
+            raise ValueError(f"Importe inválido: {value!r}")
+    elif isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"Importe inválido: {value!r}")
+    else:
+        raise ValueError(f"Se esperaba un número, llegó {type(value).__name__}")
+
+    if places is not None:
+        try:
+            return value.quantize(_QUANTS[places], rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            # Más dígitos de los que admite la precisión del contexto
+            raise ValueError(f"Importe fuera de rango: {value!r}") from None
+    return value
+
+
+@dataclass(frozen=True)
+class DecimalField:
+    """
+    Metadato de Annotated[Decimal, ...] que valida con to_decimal a nivel de
+    core schema (un único validador por campo, sin before-validators).
+
+    Args:
+        places (int): Decimales a los que se cuantiza; None conserva el valor.
+    """
+
+    places: Optional[int] = None
+
+    def __get_pydantic_core_schema__(self, source: Any, handler: GetCoreSchemaHandler):
+        places = self.places
+        if places is None:
+            function = to_decimal
+        else:
+
+            def function(value):
+                return to_decimal(value, places)
+
+        return core_schema.no_info_plain_validator_function(
+            function,
+            serialization=core_schema.to_string_ser_schema(when_used="json-unless-none"),
+        )
+
+    def __get_pydantic_json_schema__(self, schema, handler: GetJsonSchemaHandler):
+        return {"anyOf": [{"type": "number"}, {"type": "string"}]}
+
+
+# Importe monetario: admite formatos EU/US y se cuantiza a 2 decimales una sola vez
+Money = Annotated[Decimal, DecimalField(places=2)]
+
+# Porcentaje con 2 decimales (IVA, retenciones...)
+Percent = Annotated[Decimal, DecimalField(places=2)]
+
+# Cantidad o precio sin cuantizar (cantidades fraccionarias, precios unitarios)
+DecimalValue = Annotated[Decimal, DecimalField()]
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from exponential_core.claudeai import (
+    InvoiceExtractionSchema,
+    LineItemBatch,
+    validate_invoice_extraction_batch,
+    validate_line_items_batch,
+)
+
+
+def _document(items):
+    return {
+        "currency": "EUR",
+        "items": items,
+        "totals": {
+            "taxable_base": "100,00",
+            "vat_percent": 21,
+            "vat_amount": "21.00",
+            "vat_breakdown": [{"percent": 21, "taxable_base": 100, "amount": 21}],
+            "grand_total": 121,
+        },
+    }
+
+
+ITEMS = [
+    {"description": "Tornillos", "quantity": "3", "unit_price": "10", "line_total": "30,00",
+     "vat_percent": 21, "vat_amount": "6.30", "unit": "ud"},
+    {"description": "Abono", "quantity": -1, "unit_price": 5.5, "line_total": -5.5,
+     "vat_percent": "21", "vat_amount": "-1.00", "notes": "devolución"},
+    {"description": "Servicio", "quantity": "7", "unit_price": "10", "line_total": "70.01",
+     "vat_percent": Decimal("10.5"), "vat_amount": Decimal("7.35"), "net_price": None},
+    {"description": "Sin cantidad", "quantity": 0, "unit_price": 0, "line_total": 0,
+     "vat_percent": 0, "vat_amount": 0, "extra_field": "ignorado"},
+]
+
+
+def _snapshot(model):
+    return (
+        repr(model.model_dump()),
+        sorted(model.model_fields_set),
+        [sorted(item.model_fields_set) for item in model.items],
+    )
+
+
+def test_batch_validation_matches_per_row_path():
+    """Verifica que la validación columnar produzca los mismos valores, notas y campos que la validación por fila."""
+    data = _document(ITEMS)
+    expected = InvoiceExtractionSchema.model_validate(data)
+    result = validate_invoice_extraction_batch(data)
+
+    # items es una lista real, como en model_validate
+    assert type(result.items) is list
+    assert _snapshot(result) == _snapshot(expected)
+    assert result == expected
+    assert result.model_dump_json() == expected.model_dump_json()
+    assert type(result.items[0].model_fields_set) is set
+    assert "IVA línea difiere" in result.items[1].notes
+    assert result.items[2].net_price == Decimal("10.00")
+    assert "sum(items.line_total)" in result.totals.notes
+
+
+def test_batch_is_lazy_and_falls_back_per_row():
+    """Verifica que LineItemBatch materialice bajo demanda y que las filas atípicas usen el camino por fila."""
+    batch = validate_line_items_batch(ITEMS)
+    assert isinstance(batch, LineItemBatch)
+    assert batch._items == [None] * len(ITEMS)
+    assert batch.sum_line_total == Decimal("94.51")
+    assert batch[0].vat_amount == Decimal("6.30")
+    assert batch._items[1] is None
+
+    odd = [dict(ITEMS[0], tax_id="7")]
+    fallback = validate_line_items_batch(odd)
+    assert not isinstance(fallback, LineItemBatch)
+    assert fallback[0].tax_id == 7
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from exponential_core.claudeai.schemas.invoice_line_items import InvoiceExtractionSchema
+from exponential_core.claudeai.schemas.invoice_line_items_stream import InvoiceExtractionStream
+
+DOCUMENT = {
+    "currency": "EUR",
+    "items": [
+        {"description": "Tornillos \"M8\" {caja}", "quantity": 3, "unit_price": 10,
+         "line_total": 30.0, "vat_percent": 21, "vat_amount": 6.3},
+        {"description": "Abono", "quantity": -1, "unit_price": "5,50", "line_total": -5.5,
+         "vat_percent": 21, "vat_amount": -1.0, "notes": "devolución\\ parcial"},
+        {"description": "Servicio", "quantity": 7, "unit_price": 10, "line_total": 70.01,
+         "vat_percent": 10.5, "vat_amount": 7.35},
+    ],
+    "totals": {
+        "taxable_base": 100,
+        "vat_percent": 21,
+        "vat_amount": 21,
+        "vat_breakdown": [{"percent": 21, "taxable_base": 100, "amount": 21}],
+        "grand_total": 121,
+    },
+}
+
+
+async def _chunks(payload: bytes, size: int):
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 7, 64, 10_000])
+async def test_stream_matches_model_validate_json(size):
+    """Verifica que el parser incremental produzca el mismo resultado que model_validate_json para cualquier troceado."""
+    payload = b"```json\n" + json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8") + b"\n```"
+    expected = InvoiceExtractionSchema.model_validate_json(json.dumps(DOCUMENT))
+
+    stream = InvoiceExtractionStream(_chunks(payload, size))
+    items = [item async for item in stream]
+
+    assert len(items) == 3
+    assert repr(stream.result.model_dump()) == repr(expected.model_dump())
+    assert stream.result.model_fields_set == expected.model_fields_set
+    assert "sum(items.line_total)" in stream.result.totals.notes
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_items_before_totals():
+    """Verifica que los items se entreguen antes de recibir totals."""
+    payload = json.dumps(DOCUMENT).encode("utf-8")
+    cut = payload.index(b'"totals"')
+    received_totals = False
+
+    async def chunks():
+        nonlocal received_totals
+        yield payload[:cut]
+        received_totals = True
+        yield payload[cut:]
+
+    stream = InvoiceExtractionStream(chunks())
+    seen_before_totals = 0
+    async for _ in stream:
+        if not received_totals:
+            seen_before_totals += 1
+
+    assert seen_before_totals == 3
+    assert stream.sum_line_total == sum(i.line_total for i in stream.result.items)
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_truncated_json():
+    """Verifica que un stream cortado antes de cerrar el objeto raíz falle."""
+    payload = json.dumps(DOCUMENT).encode("utf-8")[:-20]
+    stream = InvoiceExtractionStream(_chunks(payload, 16))
+    with pytest.raises(ValueError):
+        async for _ in stream:
+            pass
@@ -0,0 +1,197 @@
+import copy
+from decimal import Decimal
+
+from exponential_core.claudeai import InvoiceExtractionSchema, reconcile_invoice
+
+ITEMS = [
+    {"description": "Tornillos", "quantity": 2, "unit_price": "10.00", "line_total": "20.00",
+     "vat_percent": 21, "vat_amount": "4.20"},
+    {"description": "Libros", "quantity": 1, "unit_price": "50.00", "line_total": "50.00",
+     "vat_percent": 10, "vat_amount": "5.00"},
+]
+TOTALS = {
+    "taxable_base": "70.00",
+    "vat_percent": 21,
+    "vat_amount": "9.20",
+    "vat_breakdown": [
+        {"percent": 21, "taxable_base": "20.00", "amount": "4.20"},
+        {"percent": 10, "taxable_base": "50.00", "amount": "5.00"},
+    ],
+    "grand_total": "79.20",
+}
+
+
+def _document():
+    return {"items": copy.deepcopy(ITEMS), "totals": copy.deepcopy(TOTALS)}
+
+
+def test_factura_coherente_no_se_repara():
+    """Verifica que una factura coherente se devuelva tal cual con confianza 1."""
+    invoice = InvoiceExtractionSchema.model_validate(_document())
+    result = reconcile_invoice(invoice)
+
+    assert result.is_consistent
+    assert not result.repaired
+    assert result.confidence == 1.0
+    assert result.invoice is invoice
+
+
+def test_repara_errores_de_linea_sin_modificar_la_original():
+    """Verifica que se reparen signo de IVA y unit_price/line_total intercambiados, limpiando las notas."""
+    data = _document()
+    data["items"][0].update(vat_amount="-4.20", notes="revisar")
+    data["items"][1].update(unit_price="50.00", line_total="50.00")
+    data["items"].append(
+        {"description": "Cable", "quantity": 4, "unit_price": "12.00", "line_total": "3.00",
+         "vat_percent": 21, "vat_amount": "2.52"}
+    )
+    data["totals"].update(taxable_base="82.00", vat_amount="11.72", grand_total="93.72")
+    data["totals"]["vat_breakdown"][0].update(taxable_base="32.00", amount="6.72")
+    invoice = InvoiceExtractionSchema.model_validate(data)
+    snapshot = invoice.model_dump()
+
+    result = reconcile_invoice(invoice)
+
+    assert [r.code for r in result.repairs] == ["line_vat_sign", "unit_price_line_total_swap"]
+    assert result.is_consistent
+    assert result.confidence == round(0.95 * 0.8, 4)
+    items = result.invoice.items
+    assert items[0].vat_amount == Decimal("4.20")
+    assert items[0].notes == "revisar"
+    assert (items[2].unit_price, items[2].line_total, items[2].net_price) == (
+        Decimal("3.00"), Decimal("12.00"), Decimal("3.00")
+    )
+    change = result.repairs[0].changes[0]
+    assert (change.path, change.old, change.new) == ("items[0].vat_amount", Decimal("-4.20"), Decimal("4.20"))
+    assert invoice.model_dump() == snapshot
+
+
+def test_repara_tasa_de_iva_ausente_en_el_desglose():
+    """Verifica que se añada a vat_breakdown la tasa de IVA de los items que falta."""
+    data = _document()
+    data["totals"]["vat_breakdown"].pop()
+
+    result = reconcile_invoice(data)
+
+    assert [r.code for r in result.repairs] == ["vat_breakdown_missing_rate"]
+    entry = result.invoice.totals.vat_breakdown[-1]
+    assert (entry.percent, entry.taxable_base, entry.amount) == (
+        Decimal("10.00"), Decimal("50.00"), Decimal("5.00")
+    )
+    assert result.invoice.totals.notes is None
+    assert result.is_consistent
+
+
+def test_repara_signos_de_nota_de_credito():
+    """Verifica que en una nota de crédito se corrijan items con signo contrario y grand_total."""
+    data = _document()
+    totals = data["totals"]
+    totals.update(taxable_base="-70.00", vat_amount="-9.20", grand_total="79.20")
+    for entry in totals["vat_breakdown"]:
+        entry.update(taxable_base=f"-{entry['taxable_base']}", amount=f"-{entry['amount']}")
+
+    result = reconcile_invoice(data)
+
+    assert [r.code for r in result.repairs] == ["items_sign", "grand_total_sign"]
+    assert all(item.line_total < 0 and item.quantity < 0 for item in result.invoice.items)
+    assert result.invoice.totals.grand_total == Decimal("-79.20")
+    assert result.is_consistent
+
+
+def test_discrepancia_irresoluble_baja_la_confianza():
+    """Verifica que lo que no se puede reparar quede en el informe y reduzca la confianza."""
+    data = _document()
+    data["totals"]["grand_total"] = "500.00"
+
+    result = reconcile_invoice(data)
+
+    assert not result.repaired
+    assert not result.is_consistent
+    assert [d.code for d in result.report.discrepancies] == ["grand_total"]
+    assert result.confidence == 0.5
+
+
+def test_no_rellena_agregado_si_la_factura_ya_cuadra():
+    """Verifica que un breakdown sin agregado no se sume si grand_total ya cuadra sin él."""
+    data = {
+        "items": [],
+        "totals": {
+            "taxable_base": "90.00",
+            "vat_percent": 21,
+            "vat_amount": "18.90",
+            "vat_breakdown": [{"percent": 21, "taxable_base": "90.00", "amount": "18.90"}],
+            "discounts_breakdown": [{"label": "Pronto pago", "amount": "10.00"}],
+            "grand_total": "108.90",
+        },
+    }
+
+    result = reconcile_invoice(data)
+
+    assert not result.repaired
+    assert result.is_consistent
+    assert result.confidence == 1.0
+    assert result.invoice.totals.discounts is None
+    assert result.invoice.totals.notes is None
+
+
+def test_rellena_agregado_si_cuadra_grand_total():
+    """Verifica que el agregado ausente se sume desde el breakdown cuando eso cuadra grand_total."""
+    data = _document()
+    data["totals"].update(
+        withholdings_breakdown=[{"label": "IRPF", "amount": "7.00"}], grand_total="72.20"
+    )
+
+    result = reconcile_invoice(data)
+
+    assert [r.code for r in result.repairs] == ["aggregate_from_breakdown"]
+    assert result.invoice.totals.withholding == Decimal("7.00")
+    assert result.is_consistent
+
+
+def _single_line_document(line, vat_amount):
+    base = line["line_total"]
+    return {
+        "items": [line],
+        "totals": {
+            "taxable_base": base,
+            "vat_percent": 21,
+            "vat_amount": vat_amount,
+            "vat_breakdown": [{"percent": 21, "taxable_base": base, "amount": vat_amount}],
+            "grand_total": str(Decimal(base) + Decimal(vat_amount)),
+        },
+    }
+
+
+def test_no_intercambia_line_total_si_los_totales_lo_confirman():
+    """Verifica que no se intercambien unit_price y line_total cuando el IVA y los totales confirman line_total."""
+    data = _single_line_document(
+        {"description": "Caja", "quantity": 3, "unit_price": "30.00", "line_total": "10.00",
+         "vat_percent": 21, "vat_amount": "2.10"},
+        "2.10",
+    )
+    invoice = InvoiceExtractionSchema.model_validate(data)
+    before = {d.code for d in invoice.validation_report().discrepancies}
+
+    result = reconcile_invoice(invoice)
+
+    assert not result.repaired
+    assert result.invoice.items[0].line_total == Decimal("10.00")
+    assert {d.code for d in result.report.discrepancies} == before
+    assert not {"items_line_total", "items_vat_amount"} & before
+
+
+def test_no_recalcula_iva_de_linea_contra_los_totales():
+    """Verifica que no se recalcule el IVA de una línea si los totales respaldan el valor impreso."""
+    data = _single_line_document(
+        {"description": "Servicio", "quantity": 1, "unit_price": "100.00", "line_total": "100.00",
+         "vat_percent": 21, "vat_amount": "10.00"},
+        "10.00",
+    )
+
+    result = reconcile_invoice(data)
+
+    assert not result.repaired
+    assert result.invoice.items[0].vat_amount == Decimal("10.00")
+    codes = {d.code for d in result.report.discrepancies}
+    assert "line_vat_amount" in codes
+    assert "items_vat_amount" not in codes
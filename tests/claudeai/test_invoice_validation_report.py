@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from exponential_core.claudeai import (
+    Discrepancy,
+    InvoiceExtractionSchema,
+    ValidationReport,
+    validate_invoice_extraction_batch,
+)
+
+DATA = {
+    "items": [
+        {"description": "Tornillos", "quantity": 3, "unit_price": 10, "line_total": "30.00",
+         "vat_percent": 21, "vat_amount": "7.00"},
+        {"description": "Tuercas", "quantity": 1, "unit_price": 50, "line_total": "50.00",
+         "vat_percent": 21, "vat_amount": "10.50"},
+    ],
+    "totals": {
+        "taxable_base": "100.00",
+        "vat_percent": 21,
+        "vat_amount": "17.80",
+        "vat_breakdown": [{"percent": 21, "taxable_base": "100.00", "amount": "20.00"}],
+        "grand_total": "117.80",
+        "notes": "pre",
+    },
+}
+
+
+def test_document_notes_no_revalidan_totals():
+    """Verifica que las notas de documento se añadan una sola vez, sin repetir las propias de TotalsSchema."""
+    invoice = InvoiceExtractionSchema.model_validate(DATA)
+    notes = invoice.totals.notes.split(" | ")
+
+    assert notes[0] == "pre"
+    assert notes.count("sum(vat_breakdown.amount)=20.00 ≠ vat_amount=17.80 (Δ=2.20)") == 1
+    assert any(note.startswith("sum(items.line_total)=80.00") for note in notes)
+    assert invoice.totals.model_fields_set == set(DATA["totals"])
+    assert validate_invoice_extraction_batch(DATA).totals.notes == invoice.totals.notes
+
+
+def test_validation_report_registros_tipados():
+    """Verifica que validation_report() devuelva path, expected, actual y delta de cada discrepancia."""
+    report = InvoiceExtractionSchema.model_validate(DATA).validation_report()
+
+    assert isinstance(report, ValidationReport)
+    assert not report.is_consistent
+    by_code = {d.code: d for d in report.discrepancies}
+    assert set(by_code) == {
+        "line_vat_amount",
+        "vat_entry_amount",
+        "breakdown_vat_amount",
+        "items_line_total",
+        "items_vat_amount",
+    }
+
+    line = by_code["line_vat_amount"]
+    assert isinstance(line, Discrepancy)
+    assert line.path == "items[0].vat_amount"
+    assert (line.expected, line.actual, line.delta) == (Decimal("6.30"), Decimal("7.00"), Decimal("0.70"))
+    assert line.tolerance == Decimal("0.03")
+
+    taxable = by_code["items_line_total"]
+    assert taxable.path == "totals.taxable_base"
+    assert (taxable.expected, taxable.actual, taxable.delta) == (
+        Decimal("80.00"), Decimal("100.00"), Decimal("20.00")
+    )
+    assert [d.code for d in report.for_path("totals.vat_breakdown")] == ["vat_entry_amount"]
+
+    # Los mensajes son los mismos que acaban en notes
+    assert by_code["breakdown_vat_amount"].message in InvoiceExtractionSchema.model_validate(DATA).totals.notes
+    assert report.model_dump(mode="json")["discrepancies"][0]["expected"] == "6.30"
+
+
+def test_validation_report_factura_coherente():
+    """Verifica que una factura cuadrada no tenga discrepancias."""
+    data = {
+        "items": [{"description": "x", "quantity": 1, "unit_price": 100, "line_total": 100,
+                   "vat_percent": 21, "vat_amount": 21}],
+        "totals": {"taxable_base": 100, "vat_percent": 21, "vat_amount": 21,
+                   "vat_breakdown": [{"percent": 21, "taxable_base": 100, "amount": 21}],
+                   "grand_total": 121},
+    }
+    report = InvoiceExtractionSchema.model_validate(data).validation_report()
+    assert report.is_consistent
+    assert report.discrepancies == []
@@ -0,0 +1,60 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from exponential_core.exceptions import (
+    ErrorAggregator,
+    GlobalExceptionMiddleware,
+    create_error_analytics_router,
+    set_error_aggregator,
+    setup_exception_handlers,
+)
+from exponential_core.exceptions.types import TaxIdNotFoundError
+
+app = FastAPI()
+setup_exception_handlers(app)
+app.add_middleware(GlobalExceptionMiddleware)
+app.include_router(create_error_analytics_router())
+
+
+@app.get("/invoices/{invoice_id}/tax-id")
+def find_tax_id(invoice_id: str):
+    raise TaxIdNotFoundError(invoice_id, [])
+
+
+client = TestClient(app)
+
+
+def test_handlers_feed_error_analytics_endpoint():
+    """Verifica que los handlers alimenten el agregador y /_internal/errors lo exponga por ruta y tipo."""
+    set_error_aggregator(ErrorAggregator())
+    try:
+        for i in range(3):
+            client.get(f"/invoices/F-{i}/tax-id")
+        client.get("/missing")
+
+        body = client.get("/_internal/errors", params={"window": 60}).json()
+    finally:
+        set_error_aggregator(ErrorAggregator())
+
+    assert body["window_seconds"] == 60
+    top = body["errors"][0]
+    assert top["route"] == "/invoices/{invoice_id}/tax-id"
+    assert top["error_type"] == "TaxIdNotFoundError"
+    assert top["count"] == 3
+    assert top["latency_avg_ms"] is not None
+    assert {row["error_type"] for row in body["errors"]} == {"TaxIdNotFoundError", "HttpException"}
+
+
+def test_error_aggregator_rolling_window():
+    """Verifica que los errores fuera de la ventana deslizante dejen de contarse."""
+    aggregator = ErrorAggregator(window_seconds=60, bucket_seconds=10)
+    aggregator.record("/a", "ValidationError", 422, 5.0, now=1000.0)
+    aggregator.record("/a", "ValidationError", 422, 15.0, now=1055.0)
+
+    rows = aggregator.snapshot(now=1055.0)
+    assert rows[0]["count"] == 2
+    assert rows[0]["latency_avg_ms"] == 10.0
+    assert rows[0]["latency_max_ms"] == 15.0
+
+    assert aggregator.snapshot(window_seconds=30, now=1055.0)[0]["count"] == 1
+    assert aggregator.snapshot(now=1130.0) == []
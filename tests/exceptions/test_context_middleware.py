@@ -0,0 +1,86 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from exponential_core.exceptions import RequestContextMiddleware
+from exponential_core.logger import (
+    RequestContextFilter,
+    get_request_context,
+    outgoing_headers,
+    update_request_context,
+)
+
+app = FastAPI()
+app.add_middleware(RequestContextMiddleware)
+logger = logging.getLogger("app.test_context")
+
+
+@app.get("/invoices/{invoice_id}")
+def read_invoice(invoice_id: str):
+    update_request_context(invoice_id=invoice_id)
+    logger.warning("Procesando factura")
+    return {"context": get_request_context(), "headers": outgoing_headers()}
+
+
+client = TestClient(app)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_request_context_propagates_to_logs_and_response():
+    """Verifica que request_id, tenant_vat y route lleguen al log, a la respuesta y a las cabeceras salientes."""
+    handler = _ListHandler()
+    handler.addFilter(RequestContextFilter())
+    logger.addHandler(handler)
+    try:
+        res = client.get(
+            "/invoices/F-001",
+            headers={"x-request-id": "abc123", "x-tenant-vat": "B12345678"},
+        )
+    finally:
+        logger.removeHandler(handler)
+
+    assert res.status_code == 200
+    assert res.headers["x-request-id"] == "abc123"
+    body = res.json()
+    assert body["context"] == {
+        "request_id": "abc123",
+        "tenant_vat": "B12345678",
+        "route": "/invoices/{invoice_id}",
+        "invoice_id": "F-001",
+    }
+    assert body["headers"] == {"x-request-id": "abc123"}
+
+    record = handler.records[0]
+    assert record.request_id == "abc123"
+    assert record.tenant_vat == "B12345678"
+    assert record.invoice_id == "F-001"
+    assert record.route == "/invoices/{invoice_id}"
+
+
+def test_request_id_generated_when_missing():
+    """Verifica que se genere un request_id cuando el cliente no lo envía."""
+    res = client.get("/invoices/F-002")
+    assert len(res.headers["x-request-id"]) == 32
+    assert res.json()["context"]["request_id"] == res.headers["x-request-id"]
+    assert get_request_context() == {}
+
+
+def test_request_id_invalido_se_reemplaza():
+    """Verifica que un x-request-id con caracteres no permitidos o demasiado largo se sustituya por uno nuevo."""
+    for bad in ("abcéé".encode("utf-8"), b"a" * 129, b"id con espacios", b"x;y"):
+        res = client.get("/invoices/F-003", headers={"x-request-id": bad})
+        request_id = res.headers["x-request-id"]
+        assert request_id.encode() != bad and len(request_id) == 32
+        assert res.json()["context"]["request_id"] == request_id
+
+    ok = "req-1.2_A"
+    assert client.get("/invoices/F-003", headers={"x-request-id": ok}).headers["x-request-id"] == ok
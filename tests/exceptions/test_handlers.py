@@ -67,3 +67,53 @@ def test_unhandled_exception_handler():
     assert body["detail"] == "Internal server error"
     assert body["status_code"] == 500
     assert "timestamp" in body
+
+
+@app.get("/decimal-error")
+def raise_decimal_error():
+    from decimal import Decimal
+
+    raise HTTPException(status_code=409, detail={"detail": "Total no cuadra", "total": Decimal("10.50")})
+
+
+def test_http_exception_with_decimal_payload():
+    """Verifica que un detail con Decimal se serialice sin jsonable_encoder manteniendo el formato."""
+    body = client.get("/decimal-error").json()
+    assert body["total"] == 10.5
+    assert body["error_type"] == "HttpException"
+    assert body["status_code"] == 409
+
+
+def test_error_response_reuses_static_parts():
+    """Verifica que error_response cachee las partes fijas y solo cambie el timestamp."""
+    import json
+
+    from exponential_core.utils.format_error import _static_parts, error_response
+
+    _static_parts.cache_clear()
+    first = error_response("No encontrado", "HttpException", 404, "2026-01-01T00:00:00+00:00")
+    second = error_response("Otro recurso", "HttpException", 404, "2026-01-02T00:00:00+00:00")
+
+    # La caché va por (error_type, status_code): el detail no crea entradas nuevas
+    assert _static_parts.cache_info().hits == 1
+    assert _static_parts.cache_info().currsize == 1
+    assert json.loads(first.body) == {
+        "detail": "No encontrado",
+        "error_type": "HttpException",
+        "status_code": 404,
+        "timestamp": "2026-01-01T00:00:00+00:00",
+    }
+    assert json.loads(second.body)["detail"] == "Otro recurso"
+    assert json.loads(second.body)["timestamp"] == "2026-01-02T00:00:00+00:00"
+    assert first.headers["content-type"] == "application/json"
+
+
+def test_dumps_json_claves_no_str_y_enteros_grandes():
+    """Verifica que dumps_json admita claves no str y enteros de más de 64 bits."""
+    import json
+    from decimal import Decimal
+
+    from exponential_core.utils.format_error import dumps_json
+
+    assert json.loads(dumps_json({1: "a", "b": Decimal("2.50")})) == {"1": "a", "b": 2.5}
+    assert json.loads(dumps_json({"big": 2**70, 3: [Decimal("1")]})) == {"big": 2**70, "3": [1]}
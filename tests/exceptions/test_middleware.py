@@ -22,3 +22,34 @@ def test_odoo_exception_middleware():
     body = res.json()
     assert body["error_type"] == "OdooException"
     assert body["data"]["env"] == "dev"
+
+
+@app.get("/stream")
+def stream():
+    from fastapi.responses import StreamingResponse
+
+    return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+
+@app.get("/boom")
+def boom():
+    raise KeyError("x")
+
+
+def test_streaming_and_unhandled_errors_through_pure_asgi_middleware():
+    """Verifica que el middleware deje pasar StreamingResponse y convierta errores no controlados en 500."""
+    assert client.get("/stream").text == "abc"
+
+    res = client.get("/boom")
+    assert res.status_code == 500
+    assert res.json()["error_type"] == "UnhandledException"
+
+
+def test_handler_lookup_resolved_by_mro_and_cached():
+    """Verifica que el handler se resuelva por MRO y quede cacheado por tipo."""
+    from exponential_core.exceptions import handler
+
+    middleware = GlobalExceptionMiddleware(app)
+    assert middleware._lookup(OdooException) is handler.custom_app_exception_handler
+    assert middleware._lookup(KeyError) is handler.general_exception_handler
+    assert set(middleware._resolved) == {OdooException, KeyError}
@@ -53,3 +53,328 @@ def test_log_file_created_and_contains_message():
             os.remove(log_path)
         if os.path.exists(log_dir) and not os.listdir(log_dir):
             os.rmdir(log_dir)
+
+
+def test_async_safe_mode_writes_through_queue_listener():
+    """Verifica que en modo async_safe los registros lleguen al archivo vía QueueListener."""
+    from logging.handlers import QueueHandler
+    from exponential_core.logger import shutdown_logging
+
+    configure_logging(
+        log_file=log_path,
+        log_to_console=False,
+        force=True,
+        async_safe=True,
+    )
+    try:
+        app_logger = logging.getLogger("app")
+        assert len(app_logger.handlers) == 1
+        assert isinstance(app_logger.handlers[0], QueueHandler)
+
+        try:
+            raise ValueError("fallo de prueba")
+        except ValueError as exc:
+            app_logger.error("Mensaje %s", "asíncrono", exc_info=exc)
+
+        shutdown_logging()  # vacía la cola y cierra los handlers
+
+        with open(log_path, encoding="utf-8") as f:
+            content = f.read()
+        assert "Mensaje asíncrono" in content
+        assert "ValueError: fallo de prueba" in content
+    finally:
+        shutdown_logging()
+        logging.getLogger("app").handlers.clear()
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        if os.path.exists(log_dir) and not os.listdir(log_dir):
+            os.rmdir(log_dir)
+
+
+def test_bounded_queue_overflow_policies():
+    """Verifica las políticas drop-oldest y drop-debug con la cola llena."""
+    import queue
+    from exponential_core.logger.configure import BoundedQueueHandler
+
+    def record(level, msg):
+        return logging.LogRecord("app", level, __file__, 1, msg, None, None)
+
+    q = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(q, overflow_policy="drop-oldest")
+    for i in range(4):
+        handler.emit(record(logging.INFO, f"m{i}"))
+    assert [q.get_nowait().msg for _ in range(2)] == ["m2", "m3"]
+    assert handler.dropped == 2
+
+    q = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(q, overflow_policy="drop-debug")
+    handler.emit(record(logging.INFO, "primero"))
+    handler.emit(record(logging.DEBUG, "descartado"))
+    assert handler.dropped == 1
+    assert q.get_nowait().msg == "primero"
+
+    q = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(q, overflow_policy="drop-info")
+    handler.emit(record(logging.WARNING, "primero"))
+    handler.emit(record(logging.DEBUG, "descartado"))
+    handler.emit(record(logging.INFO, "descartado"))
+    assert handler.dropped == 2
+    assert q.get_nowait().msg == "primero"
+
+
+def test_shutdown_logging_escribe_directo_sin_bloquear():
+    """Verifica que tras shutdown_logging los logs se escriban directamente aunque la cola estuviera llena."""
+    import threading
+    from logging.handlers import QueueHandler
+    from exponential_core.logger import shutdown_logging
+
+    configure_logging(
+        log_file=log_path,
+        log_to_console=False,
+        force=True,
+        async_safe=True,
+        queue_maxsize=1,
+        overflow_policy="block",
+    )
+    try:
+        shutdown_logging()
+        app_logger = logging.getLogger("app")
+        assert not any(isinstance(h, QueueHandler) for h in app_logger.handlers)
+
+        writer = threading.Thread(
+            target=lambda: [app_logger.warning("tras shutdown %d", i) for i in range(5)]
+        )
+        writer.start()
+        writer.join(timeout=2)
+        assert not writer.is_alive()
+
+        for handler in app_logger.handlers:
+            handler.flush()
+        with open(log_path, encoding="utf-8") as f:
+            assert "tras shutdown 4" in f.read()
+    finally:
+        for handler in logging.getLogger("app").handlers:
+            handler.close()
+        logging.getLogger("app").handlers.clear()
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        if os.path.exists(log_dir) and not os.listdir(log_dir):
+            os.rmdir(log_dir)
+
+
+def test_json_formatter_includes_extra_fields_and_exception():
+    """Verifica que JsonFormatter emita una línea JSON con campos extra y datos de la excepción."""
+    import json
+    import sys
+    from exponential_core.logger.formatters import JsonFormatter
+
+    try:
+        raise KeyError("tenant")
+    except KeyError:
+        exc_info = sys.exc_info()
+
+    record = logging.LogRecord(
+        "app", logging.ERROR, __file__, 10, "Fallo en %s", ("/invoices",), exc_info
+    )
+    record.method = "POST"
+    record.status_code = 500
+    record.error_type = "UnhandledException"
+
+    line = JsonFormatter().format(record)
+    assert "\n" not in line
+    payload = json.loads(line)
+    assert payload["message"] == "Fallo en /invoices"
+    assert payload["level"] == "ERROR"
+    assert payload["method"] == "POST"
+    assert payload["status_code"] == 500
+    assert payload["error_type"] == "UnhandledException"
+    assert payload["exc_type"] == "KeyError"
+    assert "Traceback" in payload["traceback"]
+
+
+def test_rate_limit_filter_emits_burst_then_summary():
+    """Verifica que RateLimitFilter deje pasar la ráfaga inicial y luego solo resúmenes con recuento."""
+    import sys
+    from unittest.mock import patch
+    from exponential_core.logger import RateLimitFilter
+
+    try:
+        raise ConnectionError("Odoo caído")
+    except ConnectionError:
+        exc_info = sys.exc_info()
+
+    def record():
+        rec = logging.LogRecord(
+            "app", logging.ERROR, __file__, 1, "Fallo en %s", ("/odoo",), exc_info
+        )
+        rec.path = "/odoo"
+        return rec
+
+    rate_filter = RateLimitFilter({"ERROR": (2, 60)})
+    clock = [1000.0]
+
+    with patch("exponential_core.logger.ratelimit.time.monotonic", lambda: clock[0]):
+        results = [rate_filter.filter(record()) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+
+        # La caída continúa: una repetición cada 10s hasta cumplir la ventana
+        for _ in range(5):
+            clock[0] += 10
+            assert rate_filter.filter(record()) is False
+
+        clock[0] += 10
+        summary = record()
+        assert rate_filter.filter(summary) is True
+        assert summary.exc_info is None
+        assert summary.suppressed_count == 9
+        assert "9 repeticiones suprimidas" in summary.getMessage()
+
+        # Tras una ventana sin repeticiones vuelve a emitirse completo
+        clock[0] += 120
+        fresh = record()
+        assert rate_filter.filter(fresh) is True
+        assert fresh.exc_info is not None
+
+        info = logging.LogRecord("app", logging.INFO, __file__, 1, "ok", None, None)
+        assert all(rate_filter.filter(info) for _ in range(10))
+
+
+def test_rate_limit_filter_agrupa_por_ruta_y_arrastra_suprimidos():
+    """Verifica que RateLimitFilter agrupe por plantilla de ruta y emita los suprimidos al reiniciar el grupo."""
+    from unittest.mock import patch
+    from exponential_core.logger import RateLimitFilter
+
+    def record(path):
+        rec = logging.LogRecord("app", logging.ERROR, __file__, 1, "No encontrada", None, None)
+        rec.path = path
+        rec.route = "/invoices/{invoice_id}"
+        return rec
+
+    rate_filter = RateLimitFilter({"ERROR": (1, 60)})
+    clock = [1000.0]
+
+    with patch("exponential_core.logger.ratelimit.time.monotonic", lambda: clock[0]):
+        # Cada id es un path distinto pero la misma plantilla: un solo grupo
+        results = [rate_filter.filter(record(f"/invoices/{i}")) for i in range(4)]
+        assert results == [True, False, False, False]
+        assert len(rate_filter._states) == 1
+
+        clock[0] += 120
+        fresh = record("/invoices/99")
+        assert rate_filter.filter(fresh) is True
+        assert fresh.suppressed_count == 3
+        assert "3 repeticiones suprimidas" in fresh.getMessage()
+
+
+def test_rate_limit_en_handlers_cubre_loggers_hijos(tmp_path):
+    """Verifica que configure_logging aplique RateLimitFilter en los handlers, una vez por registro y también a loggers hijos."""
+    import pytest
+    from exponential_core.logger import RateLimitFilter
+
+    with pytest.raises(ValueError):
+        RateLimitFilter({"ERRORR": (1, 60)})
+    assert RateLimitFilter({"error": (1, 60), 40: (1, 60)}).limits == {logging.ERROR: (1, 60.0)}
+
+    log_path = tmp_path / "errors.log"
+    logger = configure_logging(
+        log_file=str(log_path),
+        log_to_console=True,
+        force=True,
+        rate_limits={"ERROR": (2, 60)},
+    )
+    try:
+        assert not [f for f in logger.filters if isinstance(f, RateLimitFilter)]
+        filters = {
+            id(f) for h in logger.handlers for f in h.filters if isinstance(f, RateLimitFilter)
+        }
+        assert len(logger.handlers) == 2 and len(filters) == 1
+
+        child = logging.getLogger("app.odoo")
+        for _ in range(5):
+            child.error("Odoo caído")
+        for handler in logger.handlers:
+            handler.flush()
+        assert log_path.read_text(encoding="utf-8").count("Odoo caído") == 2
+    finally:
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+
+def test_compressing_rotation_by_size_and_time(tmp_path):
+    """Verifica la rotación por tamaño y por tiempo con compresión gzip y retención."""
+    import gzip
+    from exponential_core.logger import CompressingRotatingFileHandler
+
+    log_file = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(
+        str(log_file), max_bytes=200, when="H", backup_count=2, compression="gzip"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def emit(msg):
+        handler.handle(logging.LogRecord("app", logging.INFO, __file__, 1, msg, None, None))
+
+    for i in range(20):
+        emit(f"linea {i:02d} " + "x" * 40)
+
+    # Forzar la rotación por tiempo
+    handler._next_rollover = 0
+    emit("tras rotación horaria")
+    handler.close()  # espera a las compresiones pendientes
+
+    rotated = sorted(p.name for p in tmp_path.iterdir() if p.name != "app.log")
+    assert len(rotated) == 2
+    assert all(name.endswith(".gz") for name in rotated)
+
+    newest = max(
+        (p for p in tmp_path.iterdir() if p.name.endswith(".gz")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    with gzip.open(newest, "rt", encoding="utf-8") as f:
+        assert "linea 19" in f.read()
+    assert log_file.read_text(encoding="utf-8").strip() == "tras rotación horaria"
+
+
+def test_timed_records_percentiles_and_logs_slow_spans():
+    """Verifica que timed() registre duraciones, calcule percentiles y loguee las operaciones lentas."""
+    import asyncio
+    from unittest.mock import patch
+    from exponential_core.logger import (
+        enable_timing,
+        get_timing_snapshot,
+        reset_timings,
+        timed,
+    )
+
+    @timed("test.sync")
+    def work():
+        return 42
+
+    reset_timings()
+    enable_timing(False)
+    assert work() == 42
+    assert get_timing_snapshot() == {}
+
+    enable_timing(True)
+    try:
+        for _ in range(10):
+            work()
+
+        async def run():
+            async with timed("test.async", threshold_ms=0):
+                await asyncio.sleep(0)
+
+        with patch("exponential_core.logger.timing.get_logger") as get_logger_mock:
+            asyncio.run(run())
+            warning = get_logger_mock.return_value.warning
+            assert warning.call_count == 1
+            assert warning.call_args[1]["extra"]["span"] == "test.async"
+
+        snapshot = get_timing_snapshot()
+        assert snapshot["test.sync"]["count"] == 10
+        assert snapshot["test.sync"]["p50_ms"] <= snapshot["test.sync"]["p99_ms"]
+        assert snapshot["test.async"]["count"] == 1
+    finally:
+        enable_timing(False)
+        reset_timings()
@@ -0,0 +1,186 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from exponential_core.exceptions import (
+    AWSCircuitOpenError,
+    AWSConnectionError,
+    AWSThrottlingError,
+)
+from exponential_core.secrets.aws_error_handler_async import handle_boto3_errors_async
+from exponential_core.secrets.manager import SecretManager
+from exponential_core.utils.aws_error_handler import handle_boto3_errors
+from exponential_core.utils.aws_retry import get_circuit_breaker, reset_circuit_breakers
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "GetSecretValue")
+
+
+@pytest.fixture(autouse=True)
+def _reset_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+class FakeAsyncService:
+    base_secret_name = "tenant/async"
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    @handle_boto3_errors_async(retries=2, base_delay=0, failure_threshold=2)
+    async def call(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class FakeSyncService:
+    base_secret_name = "tenant/sync"
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    @handle_boto3_errors(retries=2, base_delay=0)
+    def call(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_async_throttling_is_retried():
+    """Verifica que ThrottlingException se reintente y la llamada termine con éxito."""
+    service = FakeAsyncService([client_error("ThrottlingException")] * 2)
+    assert await service.call() == "ok"
+    assert service.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_async_throttling_exhausted_maps_to_503():
+    """Verifica que agotar los reintentos por throttling devuelva AWSThrottlingError (503)."""
+    service = FakeAsyncService([client_error("TooManyRequestsException")] * 3)
+    with pytest.raises(AWSThrottlingError) as exc_info:
+        await service.call()
+    assert exc_info.value.status_code == 503
+    assert service.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_async_circuit_opens_after_failures():
+    """Verifica que el circuito se abra tras fallos transitorios seguidos y deje de llamar a AWS."""
+    service = FakeAsyncService([client_error("ServiceUnavailable")] * 6)
+    for _ in range(2):
+        with pytest.raises(AWSConnectionError):
+            await service.call()
+
+    assert get_circuit_breaker("tenant/async").state == "open"
+    with pytest.raises(AWSCircuitOpenError) as exc_info:
+        await service.call()
+    assert service.calls == 6
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.data == {"secret_name": "tenant/async"}
+
+
+@pytest.mark.asyncio
+async def test_async_client_errors_4xx_do_not_open_circuit():
+    """Verifica que los 4xx no reintentables no cuenten para abrir el circuito."""
+    service = FakeAsyncService([client_error("ValidationException")] * 3)
+    for _ in range(3):
+        with pytest.raises(AWSConnectionError):
+            await service.call()
+
+    assert get_circuit_breaker("tenant/async").state == "closed"
+    assert service.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_async_network_errors_are_retried_and_counted():
+    """Verifica que los errores de red de botocore se reintenten y abran el circuito."""
+    network_error = EndpointConnectionError(endpoint_url="https://secretsmanager")
+    service = FakeAsyncService([network_error] * 6)
+    for _ in range(2):
+        with pytest.raises(AWSConnectionError):
+            await service.call()
+
+    assert service.calls == 6
+    assert get_circuit_breaker("tenant/async").state == "open"
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_with_unexpected_error_reopens_circuit():
+    """Verifica que una prueba semiabierta que lanza algo distinto de ClientError vuelva a abrir el circuito."""
+    breaker = get_circuit_breaker("tenant/async", failure_threshold=2)
+    breaker.state = breaker.OPEN
+    breaker._opened_at = 0.0  # reset_timeout ya vencido
+
+    service = FakeAsyncService([ValueError("JSON inválido")])
+    with pytest.raises(ValueError):
+        await service.call()
+    assert breaker.state == "open"
+
+    # Pasado de nuevo el timeout, la siguiente prueba puede cerrar el circuito
+    breaker._opened_at = 0.0
+    assert await service.call() == "ok"
+    assert breaker.state == "closed"
+
+
+def test_sync_half_open_probe_with_unexpected_error_reopens_circuit():
+    """Verifica lo mismo con el decorador síncrono."""
+    breaker = get_circuit_breaker("tenant/sync")
+    breaker.state = breaker.OPEN
+    breaker._opened_at = 0.0
+
+    service = FakeSyncService([KeyError("SecretString")])
+    with pytest.raises(KeyError):
+        service.call()
+    assert breaker.state == "open"
+
+
+def test_sync_open_circuit_raises_same_error_as_async():
+    """Verifica que el decorador síncrono use AWSCircuitOpenError (503) con el circuito abierto."""
+    breaker = get_circuit_breaker("tenant/sync")
+    breaker.state = breaker.OPEN
+    breaker._opened_at = float("inf")
+
+    service = FakeSyncService([])
+    with pytest.raises(AWSCircuitOpenError) as exc_info:
+        service.call()
+    assert service.calls == 0
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.data == {"secret_name": "tenant/sync"}
+
+
+def test_sync_throttling_is_retried():
+    """Verifica los reintentos del decorador síncrono ante throttling."""
+    service = FakeSyncService([client_error("ThrottlingException")])
+    assert service.call() == "ok"
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_last_good_value_when_circuit_open():
+    """Verifica que SecretManager sirva el último valor cacheado con el circuito abierto."""
+    context_client = AsyncMock()
+    context_client.get_secret_value.return_value = {"SecretString": '{"api_key": "1234"}'}
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = context_client
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core", default_ttl_seconds=1)
+        await manager.get_secret()
+
+        get_circuit_breaker("exponentialit/core").state = "open"
+        get_circuit_breaker("exponentialit/core")._opened_at = float("inf")
+        manager._cache["exponentialit/core"]["timestamp"] -= timedelta(seconds=2)
+
+        assert await manager.get_secret("api_key") == "1234"
+        assert context_client.get_secret_value.call_count == 1
@@ -0,0 +1,89 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from exponential_core.secrets import SecretManager, SQLiteSecretCache
+
+Fernet = pytest.importorskip("cryptography.fernet").Fernet
+
+
+def mock_aioboto3_client():
+    mock_context_client = AsyncMock()
+    mock_context_client.get_secret_value.return_value = {
+        "SecretString": '{"api_key": "1234"}',
+        "VersionId": "v1",
+    }
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = mock_context_client
+    return mock_client_instance, mock_context_client
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_shared_between_managers(tmp_path):
+    """Verifica que dos managers (como dos workers) compartan una única descarga vía SQLite."""
+    key = Fernet.generate_key().decode()
+    db_path = tmp_path / "secrets.db"
+    mock_client_instance, context_client = mock_aioboto3_client()
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        worker_1 = SecretManager(
+            "exponentialit/core", cache_backend=SQLiteSecretCache(db_path, key=key)
+        )
+        worker_2 = SecretManager(
+            "exponentialit/core", cache_backend=SQLiteSecretCache(db_path, key=key)
+        )
+
+        assert await worker_1.get_secret("api_key") == "1234"
+        assert await worker_2.get_secret("api_key") == "1234"
+        assert context_client.get_secret_value.call_count == 1
+
+        assert b"1234" not in db_path.read_bytes()
+
+
+def test_sqlite_cache_entry_roundtrip(tmp_path):
+    """Verifica que SQLiteSecretCache conserve valor, timestamp y versión, y respete pop/clear."""
+    cache = SQLiteSecretCache(tmp_path / "secrets.db", key=Fernet.generate_key())
+
+    now = datetime.now(timezone.utc)
+    cache["a"] = {"value": {"k": 1}, "timestamp": now, "version_id": "v1"}
+
+    entry = cache["a"]
+    assert entry["value"] == {"k": 1}
+    assert entry["version_id"] == "v1"
+    assert abs(entry["timestamp"] - now) < timedelta(milliseconds=1)
+    assert "a" in cache and len(cache) == 1
+
+    assert cache.pop("a")["value"] == {"k": 1}
+    assert cache.get("a") is None
+
+    cache["b"] = {"value": {}, "timestamp": now}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_requires_key(tmp_path, monkeypatch):
+    """Verifica que el caché compartido exija una clave de cifrado."""
+    monkeypatch.delenv("EXPONENTIAL_SECRETS_CACHE_KEY", raising=False)
+    with pytest.raises(ValueError):
+        SQLiteSecretCache(tmp_path / "secrets.db")
+
+
+def test_sqlite_cache_memo_y_permisos(tmp_path):
+    """Verifica que el fichero se cree con permisos 0o600 y que el memo evite consultar SQLite durante su TTL."""
+    key = Fernet.generate_key()
+    db_path = tmp_path / "secrets.db"
+    worker_1 = SQLiteSecretCache(db_path, key=key, memo_ttl_seconds=5)
+    worker_2 = SQLiteSecretCache(db_path, key=key)
+    assert db_path.stat().st_mode & 0o777 == 0o600
+
+    now = datetime.now(timezone.utc)
+    clock = [1000.0]
+    with patch("exponential_core.secrets.cache.time.monotonic", lambda: clock[0]):
+        worker_1["a"] = {"value": {"k": 1}, "timestamp": now, "version_id": "v1"}
+        worker_2["a"] = {"value": {"k": 2}, "timestamp": now + timedelta(seconds=1), "version_id": "v2"}
+
+        # Dentro del TTL del memo no se consulta SQLite
+        assert worker_1["a"]["version_id"] == "v1"
+
+        clock[0] += 10
+        assert worker_1["a"]["version_id"] == "v2"
@@ -1,8 +1,12 @@
+import asyncio
 import json
 import pytest
 from datetime import timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
 
+from botocore.exceptions import ClientError
+
+from exponential_core.exceptions import SecretConflictError
 from exponential_core.secrets.manager import SecretManager
 
 
@@ -16,6 +20,11 @@ def mock_aioboto3_client(get_secret_response):
     mock_context_client = AsyncMock()
     mock_context_client.get_secret_value.return_value = get_secret_response
     mock_context_client.update_secret.return_value = {}
+    mock_context_client.describe_secret.return_value = {
+        "VersionIdsToStages": {"v1": ["AWSCURRENT"]}
+    }
+    mock_context_client.put_secret_value.return_value = {"VersionId": "v2"}
+    mock_context_client.update_secret_version_stage.return_value = {}
     mock_context_client.create_secret.return_value = {}
     mock_context_client.delete_secret.return_value = {}
 
@@ -81,7 +90,7 @@ async def test_set_secret_adds_new_key(fake_secret_dict):
         manager = SecretManager("exponentialit/core")
         await manager.set_secret("new_key", "XYZ")
 
-        update_args = context_client.update_secret.call_args[1]
+        update_args = context_client.put_secret_value.call_args[1]
         updated_data = json.loads(update_args["SecretString"])
         assert updated_data["new_key"] == "XYZ"
         assert updated_data["api_key"] == "1234"
@@ -95,7 +104,7 @@ async def test_delete_key_removes_field(fake_secret_dict):
         manager = SecretManager("exponentialit/core")
         await manager.delete_key("token")
 
-        update_args = context_client.update_secret.call_args[1]
+        update_args = context_client.put_secret_value.call_args[1]
         updated_data = json.loads(update_args["SecretString"])
         assert "token" not in updated_data
         assert "api_key" in updated_data
@@ -141,3 +150,285 @@ async def test_delete_secret_force(fake_secret_dict):
             SecretId="exponentialit/core", ForceDeleteWithoutRecovery=True
         )
         assert "exponentialit/core" not in manager._cache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_single_fetch(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(fake_secret_dict)
+
+    async def slow_get_secret_value(**kwargs):
+        await asyncio.sleep(0.01)
+        return fake_secret_dict
+
+    context_client.get_secret_value.side_effect = slow_get_secret_value
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        results = await asyncio.gather(*(manager.get_secret() for _ in range(20)))
+
+        assert all(r == {"api_key": "1234", "token": "abcd"} for r in results)
+        assert context_client.get_secret_value.call_count == 1
+        assert manager._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_refreshing(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(fake_secret_dict)
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager(
+            "exponentialit/core", default_ttl_seconds=1, stale_grace_seconds=60
+        )
+        first = await manager.get_secret()
+        manager._cache["exponentialit/core"]["timestamp"] -= timedelta(seconds=2)
+        context_client.get_secret_value.return_value = {
+            "SecretString": '{"api_key": "5678"}'
+        }
+
+        stale = await manager.get_secret()
+        assert stale is first
+
+        # Dejar que termine el refresco en segundo plano
+        await manager._inflight["exponentialit/core"]
+        assert await manager.get_secret("api_key") == "5678"
+        assert context_client.get_secret_value.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_persistent_client_reused_across_calls(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(fake_secret_dict)
+
+    with patch(
+        "aioboto3.Session.client", return_value=mock_client_instance
+    ) as session_client:
+        async with SecretManager("exponentialit/core") as manager:
+            await manager.get_secret()
+            await manager.set_secret("new_key", "XYZ")
+            await manager.delete_key("token")
+            assert manager._client is context_client
+
+        assert session_client.call_count == 1
+        assert context_client.put_secret_value.call_count == 2
+        assert manager._client is None
+        mock_client_instance.__aexit__.assert_called_once()
+
+
+def _version_conflict():
+    return ClientError(
+        {"Error": {"Code": "InvalidParameterException", "Message": "AWSCURRENT no está en v1"}},
+        "UpdateSecretVersionStage",
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_many_writes_once(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(
+        {**fake_secret_dict, "VersionId": "v1"}
+    )
+    context_client.put_secret_value.return_value = {"VersionId": "v2"}
+    context_client.update_secret_version_stage.return_value = {}
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        async with manager.transaction() as tx:
+            tx.set("a", 1)
+            tx.set("b", 2)
+            tx.delete("token")
+
+        assert context_client.get_secret_value.call_count == 1
+        put_args = context_client.put_secret_value.call_args[1]
+        updated_data = json.loads(put_args["SecretString"])
+        assert updated_data == {"api_key": "1234", "a": 1, "b": 2}
+        stage = put_args["VersionStages"][0]
+        assert stage.startswith("EXPCORE_PENDING_")
+        assert stage == "EXPCORE_PENDING_" + put_args["ClientRequestToken"].replace("-", "")
+
+        promote, clear = context_client.update_secret_version_stage.call_args_list
+        assert promote[1] == {
+            "SecretId": "exponentialit/core",
+            "VersionStage": "AWSCURRENT",
+            "MoveToVersionId": "v2",
+            "RemoveFromVersionId": "v1",
+        }
+        assert clear[1] == {
+            "SecretId": "exponentialit/core",
+            "VersionStage": stage,
+            "RemoveFromVersionId": "v2",
+        }
+        context_client.update_secret.assert_not_called()
+        context_client.describe_secret.assert_not_called()
+
+        entry = manager._cache["exponentialit/core"]
+        assert entry["value"] == updated_data
+        assert entry["version_id"] == "v2"
+
+
+@pytest.mark.asyncio
+async def test_update_many_retries_on_version_conflict(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(
+        {**fake_secret_dict, "VersionId": "v1"}
+    )
+    context_client.get_secret_value.side_effect = [
+        {**fake_secret_dict, "VersionId": "v1"},
+        {"SecretString": '{"api_key": "9999", "token": "abcd"}', "VersionId": "v2"},
+    ]
+    context_client.put_secret_value.side_effect = [{"VersionId": "v3"}, {"VersionId": "v4"}]
+    context_client.update_secret_version_stage.side_effect = [_version_conflict(), {}, {}, {}]
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        await manager.update_many({"new_key": "XYZ"})
+
+        assert context_client.get_secret_value.call_count == 2
+        updated_data = json.loads(context_client.put_secret_value.call_args[1]["SecretString"])
+        assert updated_data["api_key"] == "9999"
+        assert updated_data["new_key"] == "XYZ"
+
+        promote = context_client.update_secret_version_stage.call_args_list[2][1]
+        assert (promote["MoveToVersionId"], promote["RemoveFromVersionId"]) == ("v4", "v2")
+        assert manager._cache["exponentialit/core"]["version_id"] == "v4"
+
+
+@pytest.mark.asyncio
+async def test_update_many_raises_conflict_after_retries(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(
+        {**fake_secret_dict, "VersionId": "v1"}
+    )
+    context_client.put_secret_value.return_value = {"VersionId": "v9"}
+
+    async def _stage(**kwargs):
+        if kwargs["VersionStage"] == "AWSCURRENT":
+            raise _version_conflict()
+        return {}
+
+    context_client.update_secret_version_stage.side_effect = _stage
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        with pytest.raises(SecretConflictError):
+            await manager.update_many({"new_key": "XYZ"}, max_retries=1)
+        context_client.update_secret.assert_not_called()
+        # La versión pendiente de cada intento fallido se libera
+        stages = [c[1]["VersionStage"] for c in context_client.update_secret_version_stage.call_args_list]
+        assert stages[0::2] == ["AWSCURRENT"] * 2
+        assert all(stage.startswith("EXPCORE_PENDING_") for stage in stages[1::2])
+        assert "AWSPENDING" not in stages
+
+
+@pytest.mark.asyncio
+async def test_update_many_uses_describe_when_cache_has_no_version(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(fake_secret_dict)
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        await manager.update_many({"new_key": "XYZ"})
+
+        context_client.update_secret.assert_not_called()
+        context_client.describe_secret.assert_called_once()
+        # El valor se relee tras obtener la versión base
+        assert context_client.get_secret_value.call_count == 2
+        promote = context_client.update_secret_version_stage.call_args_list[0][1]
+        assert (promote["MoveToVersionId"], promote["RemoveFromVersionId"]) == ("v2", "v1")
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_and_notifies_on_rotation(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(
+        {**fake_secret_dict, "VersionId": "v1"}
+    )
+    context_client.describe_secret.return_value = {
+        "VersionIdsToStages": {"v1": ["AWSCURRENT"]},
+        "LastChangedDate": "2026-01-01",
+    }
+    received = []
+
+    async def on_change(name, value):
+        received.append((name, value))
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core", default_ttl_seconds=86400)
+        manager.subscribe(on_change)
+        await manager.get_secret()
+
+        assert await manager.check_for_changes() is False
+        assert context_client.get_secret_value.call_count == 1
+
+        context_client.describe_secret.return_value = {
+            "VersionIdsToStages": {"v1": ["AWSPREVIOUS"], "v2": ["AWSCURRENT"]},
+            "LastChangedDate": "2026-01-02",
+        }
+        context_client.get_secret_value.return_value = {
+            "SecretString": '{"api_key": "rotated"}',
+            "VersionId": "v2",
+        }
+
+        assert await manager.check_for_changes() is True
+        assert await manager.get_secret("api_key") == "rotated"
+        assert received == [("exponentialit/core", {"api_key": "rotated"})]
+
+        assert await manager.check_for_changes() is False
+        assert context_client.get_secret_value.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_watcher_task_lifecycle(fake_secret_dict):
+    mock_client_instance, context_client = mock_aioboto3_client(fake_secret_dict)
+    context_client.describe_secret.return_value = {"VersionIdsToStages": {}}
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        async with SecretManager("exponentialit/core") as manager:
+            watcher = manager.start_watcher(interval_seconds=0.01)
+            await asyncio.sleep(0.05)
+            assert context_client.describe_secret.call_count >= 2
+
+        assert watcher.done()
+        assert manager._watcher is None
+
+
+@pytest.mark.asyncio
+async def test_iter_secrets_streams_pages_with_filters():
+    mock_client_instance, context_client = mock_aioboto3_client({})
+    context_client.list_secrets.side_effect = [
+        {
+            "SecretList": [
+                {"Name": "tenants/A", "ARN": "arn:a", "Tags": [{"Key": "env", "Value": "prod"}]}
+            ],
+            "NextToken": "page-2",
+        },
+        {"SecretList": [{"Name": "tenants/B", "ARN": "arn:b"}]},
+    ]
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        records = [
+            r
+            async for r in manager.iter_secrets(
+                prefix="tenants/", tags={"env": "prod"}, metadata=True
+            )
+        ]
+
+        assert [r.name for r in records] == ["tenants/A", "tenants/B"]
+        assert records[0].tags == {"env": "prod"}
+
+        first_call = context_client.list_secrets.call_args_list[0][1]
+        assert first_call["Filters"] == [
+            {"Key": "name", "Values": ["tenants/"]},
+            {"Key": "tag-key", "Values": ["env"]},
+            {"Key": "tag-value", "Values": ["prod"]},
+        ]
+        assert context_client.list_secrets.call_args_list[1][1]["NextToken"] == "page-2"
+
+
+@pytest.mark.asyncio
+async def test_list_secrets_listing_cache():
+    mock_client_instance, context_client = mock_aioboto3_client({})
+    context_client.list_secrets.return_value = {"SecretList": [{"Name": "tenants/A"}]}
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("exponentialit/core")
+        assert await manager.list_secrets(prefix="tenants/", ttl_seconds=30) == ["tenants/A"]
+        assert await manager.list_secrets(prefix="tenants/", ttl_seconds=30) == ["tenants/A"]
+        assert context_client.list_secrets.call_count == 1
+
+        await manager.list_secrets(prefix="tenants/")
+        assert context_client.list_secrets.call_count == 2
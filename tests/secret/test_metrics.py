@@ -0,0 +1,73 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from botocore.exceptions import ClientError
+
+from exponential_core.exceptions import SecretNotFoundError
+from exponential_core.secrets import SecretManager, InMemorySecretMetrics
+from exponential_core.secrets import metrics as secret_metrics
+
+
+def mock_aioboto3_client():
+    context_client = AsyncMock()
+    context_client.get_secret_value.return_value = {"SecretString": '{"api_key": "1234"}'}
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = context_client
+    return mock_client_instance, context_client
+
+
+@pytest.mark.asyncio
+async def test_manager_records_hits_misses_and_latency():
+    """Verifica que SecretManager cuente aciertos, fallos, stale y latencia de descarga."""
+    metrics = InMemorySecretMetrics()
+    mock_client_instance, _ = mock_aioboto3_client()
+    labels = {"secret": "exponentialit/core"}
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager(
+            "exponentialit/core",
+            default_ttl_seconds=1,
+            stale_grace_seconds=60,
+            metrics=metrics,
+        )
+        await manager.get_secret()
+        await manager.get_secret()
+        await manager.get_secret()
+        manager._cache["exponentialit/core"]["timestamp"] -= timedelta(seconds=2)
+        await manager.get_secret()
+        await manager._inflight["exponentialit/core"]
+
+    assert metrics.counter(secret_metrics.CACHE_MISSES, labels) == 1
+    assert metrics.counter(secret_metrics.CACHE_HITS, labels) == 2
+    assert metrics.counter(secret_metrics.CACHE_STALE, labels) == 1
+    assert metrics.hit_ratio("exponentialit/core") == 0.75
+
+    text = metrics.render_prometheus()
+    assert 'exponential_secrets_cache_hits_total{secret="exponentialit/core"} 2' in text
+    assert 'exponential_secrets_fetch_seconds_count{secret="exponentialit/core"} 2' in text
+    assert 'exponential_secrets_fetch_seconds_bucket{secret="exponentialit/core",le="+Inf"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_manager_records_errors_by_aws_code():
+    """Verifica que los errores de AWS se cuenten por código."""
+    metrics = InMemorySecretMetrics()
+    mock_client_instance, context_client = mock_aioboto3_client()
+    context_client.get_secret_value.side_effect = ClientError(
+        {"Error": {"Code": "ResourceNotFoundException", "Message": "missing"}},
+        "GetSecretValue",
+    )
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        manager = SecretManager("tenant/missing", metrics=metrics)
+        with pytest.raises(SecretNotFoundError):
+            await manager.get_secret()
+
+    assert (
+        metrics.counter(
+            secret_metrics.ERRORS,
+            {"secret": "tenant/missing", "code": "ResourceNotFoundException"},
+        )
+        == 1
+    )
@@ -0,0 +1,163 @@
+import json
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from botocore.exceptions import ClientError
+
+from exponential_core.secrets import SecretRegistry
+
+
+def mock_aioboto3_client():
+    mock_context_client = AsyncMock()
+
+    async def batch_get_secret_value(SecretIdList, NextToken=None):
+        return {
+            "SecretValues": [
+                {"Name": name, "SecretString": json.dumps({"tenant": name})}
+                for name in SecretIdList
+            ],
+            "Errors": [],
+        }
+
+    async def get_secret_value(SecretId):
+        return {"SecretString": json.dumps({"tenant": SecretId})}
+
+    mock_context_client.batch_get_secret_value.side_effect = batch_get_secret_value
+    mock_context_client.get_secret_value.side_effect = get_secret_value
+
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = mock_context_client
+    return mock_client_instance, mock_context_client
+
+
+@pytest.mark.asyncio
+async def test_prefetch_uses_batch_calls():
+    """Verifica que prefetch agrupe los secretos en lotes de 20 con BatchGetSecretValue."""
+    mock_client_instance, context_client = mock_aioboto3_client()
+    names = [f"tenant/{i}" for i in range(45)]
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        async with SecretRegistry() as registry:
+            loaded = await registry.prefetch(names)
+            assert len(loaded) == 45
+            assert context_client.batch_get_secret_value.call_count == 3
+
+            value = await registry.get_secret("tenant/7", "tenant")
+            assert value == "tenant/7"
+            assert context_client.get_secret_value.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_falls_back_to_parallel_gets():
+    """Verifica el fallback a get_secret_value cuando BatchGetSecretValue está denegado."""
+    mock_client_instance, context_client = mock_aioboto3_client()
+    context_client.batch_get_secret_value.side_effect = ClientError(
+        {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+        "BatchGetSecretValue",
+    )
+    names = [f"tenant/{i}" for i in range(5)]
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        registry = SecretRegistry(max_concurrency=2)
+        loaded = await registry.prefetch(names)
+
+        assert set(loaded) == set(names)
+        assert context_client.get_secret_value.call_count == 5
+
+        # Los secretos ya vigentes no se vuelven a pedir
+        await registry.prefetch(names)
+        assert context_client.get_secret_value.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reintenta_por_lote_y_nombra_los_secretos():
+    """Verifica que los errores transitorios se reintenten por lote y que el error final nombre los secretos."""
+    mock_client_instance, context_client = mock_aioboto3_client()
+    throttled = ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+        "BatchGetSecretValue",
+    )
+    page = {
+        "SecretValues": [
+            {"Name": name, "SecretString": json.dumps({"tenant": name})}
+            for name in ("tenant/1", "tenant/2")
+        ],
+    }
+    context_client.batch_get_secret_value.side_effect = [throttled, page]
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance), patch(
+        "exponential_core.secrets.aws_error_handler_async.asyncio.sleep", AsyncMock()
+    ):
+        registry = SecretRegistry()
+        loaded = await registry.prefetch(["tenant/1", "tenant/2"])
+        assert set(loaded) == {"tenant/1", "tenant/2"}
+        assert context_client.batch_get_secret_value.call_count == 2
+
+        # Reintentos agotados: el lote se registra y se piden sus secretos uno a uno
+        context_client.batch_get_secret_value.side_effect = throttled
+        with patch("exponential_core.secrets.registry.logger") as logger:
+            loaded = await registry.prefetch(["tenant/3", "tenant/4"])
+        assert set(loaded) == {"tenant/3", "tenant/4"}
+        assert context_client.get_secret_value.call_count == 2
+        message = logger.warning.call_args_list[0][0][0]
+        assert "tenant/3, tenant/4" in message
+        assert "AWSThrottlingError" in message
+
+
+@pytest.mark.asyncio
+async def test_prefetch_sin_batch_en_el_cliente_usa_gets():
+    """Verifica el fallback a get_secret_value si el cliente no incluye batch_get_secret_value."""
+    mock_client_instance, context_client = mock_aioboto3_client()
+    del context_client.batch_get_secret_value
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        registry = SecretRegistry()
+        loaded = await registry.prefetch(["tenant/1", "tenant/2"])
+
+        assert set(loaded) == {"tenant/1", "tenant/2"}
+        assert context_client.get_secret_value.call_count == 2
+        assert registry.manager("tenant/1")._cache is registry._cache
+
+
+@pytest.mark.asyncio
+async def test_prefetch_conserva_lotes_cargados_si_un_lote_falla():
+    """Verifica que un lote fallido o un payload inválido no descarten lo ya cargado ni repitan otros lotes."""
+    mock_client_instance, context_client = mock_aioboto3_client()
+    names = [f"tenant/{i}" for i in range(45)]
+    batch_get = context_client.batch_get_secret_value.side_effect
+
+    async def batch_get_secret_value(SecretIdList, NextToken=None):
+        if "tenant/20" in SecretIdList:
+            raise ClientError(
+                {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+                "BatchGetSecretValue",
+            )
+        response = await batch_get(SecretIdList, NextToken)
+        response["SecretValues"][0]["SecretString"] = "{no es json"
+        return response
+
+    context_client.batch_get_secret_value.side_effect = batch_get_secret_value
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        registry = SecretRegistry()
+        loaded = await registry.prefetch(names)
+
+        # Lote 1 por batch (salvo el payload inválido); lotes 2 y 3 uno a uno
+        assert context_client.batch_get_secret_value.call_count == 2
+        assert context_client.get_secret_value.call_count == 25
+        assert set(loaded) == set(names) - {"tenant/0"}
+
+
+@pytest.mark.asyncio
+async def test_invalidate_solo_borra_los_secretos_del_registro():
+    """Verifica que invalidate() sin argumentos no vacíe entradas del caché compartido ajenas al registro."""
+    mock_client_instance, _ = mock_aioboto3_client()
+    shared_cache = {"otro/proceso": {"value": {}, "timestamp": None}}
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance):
+        registry = SecretRegistry(cache_backend=shared_cache)
+        await registry.prefetch(["tenant/1", "tenant/2"])
+        assert set(shared_cache) == {"otro/proceso", "tenant/1", "tenant/2"}
+
+        registry.invalidate()
+        assert set(shared_cache) == {"otro/proceso"}
@@ -0,0 +1,69 @@
+import threading
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from exponential_core.secrets import SecretManager, SyncSecretManager
+
+
+def mock_botocore_client(response):
+    client = MagicMock()
+    client.get_secret_value.return_value = response
+    return client
+
+
+def test_sync_get_secret_caches_result():
+    """Verifica que SyncSecretManager cachee el secreto y respete el TTL."""
+    client = mock_botocore_client({"SecretString": '{"api_key": "1234"}'})
+
+    with patch("botocore.session.Session.create_client", return_value=client):
+        manager = SyncSecretManager("exponentialit/core", default_ttl_seconds=1)
+        assert manager.get_secret("api_key") == "1234"
+        assert manager.get_secret("api_key") == "1234"
+        assert client.get_secret_value.call_count == 1
+
+        manager._cache["exponentialit/core"]["timestamp"] -= timedelta(seconds=2)
+        manager.get_secret()
+        assert client.get_secret_value.call_count == 2
+
+
+def test_sync_concurrent_threads_fetch_once():
+    """Verifica que varios hilos con caché vacío provoquen una única descarga."""
+    client = mock_botocore_client(None)
+
+    def slow_get_secret_value(**kwargs):
+        time.sleep(0.02)
+        return {"SecretString": '{"api_key": "1234"}'}
+
+    client.get_secret_value.side_effect = slow_get_secret_value
+
+    with patch("botocore.session.Session.create_client", return_value=client):
+        manager = SyncSecretManager("exponentialit/core")
+        threads = [threading.Thread(target=manager.get_secret) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client.get_secret_value.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_manager_shares_cache_with_async_manager():
+    """Verifica que from_async() reutilice lo ya descargado por el SecretManager async."""
+    context_client = AsyncMock()
+    context_client.get_secret_value.return_value = {"SecretString": '{"api_key": "1234"}'}
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = context_client
+    sync_client = mock_botocore_client({})
+
+    with patch("aioboto3.Session.client", return_value=mock_client_instance), patch(
+        "botocore.session.Session.create_client", return_value=sync_client
+    ):
+        async_manager = SecretManager("exponentialit/core")
+        await async_manager.get_secret()
+
+        sync_manager = SyncSecretManager.from_async(async_manager)
+        assert sync_manager.get_secret("api_key") == "1234"
+        sync_client.get_secret_value.assert_not_called()
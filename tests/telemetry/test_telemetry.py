@@ -0,0 +1,116 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from exponential_core.exceptions import setup
+from exponential_core.exceptions.types import InvoiceParsingError
+from exponential_core.telemetry import (
+    DURATION_METRIC,
+    ERRORS_METRIC,
+    InMemoryExporter,
+    TelemetryMiddleware,
+    configure_telemetry,
+    shutdown_telemetry,
+)
+
+app = FastAPI()
+setup.setup_exception_handlers(app)
+app.add_middleware(TelemetryMiddleware)
+
+
+@app.get("/invoices/{invoice_id}")
+def read_invoice(invoice_id: str):
+    if invoice_id == "bad":
+        raise InvoiceParsingError("No se pudo extraer el NIT")
+    return {"id": invoice_id}
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    configure_telemetry(exporter, service_name="test-service", export_interval_seconds=None)
+    yield exporter
+    shutdown_telemetry()
+
+
+def _attrs(item):
+    return {a["key"]: next(iter(a["value"].values())) for a in item["attributes"]}
+
+
+def test_exception_handlers_emit_span_events_and_metrics(exporter):
+    """Verifica que los errores de los handlers generen eventos en el span del request y métricas por ruta."""
+    traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    assert client.get("/invoices/bad", headers={"traceparent": traceparent}).status_code == 422
+    assert client.get("/invoices/F-1").status_code == 200
+    shutdown_telemetry()
+
+    error_span, ok_span = exporter.spans
+    assert error_span["name"] == "GET /invoices/{invoice_id}"
+    assert error_span["traceId"] == "a" * 32
+    assert error_span["parentSpanId"] == "b" * 16
+    event = error_span["events"][0]
+    assert event["name"] == "exception"
+    assert _attrs(event)["exception.type"] == "InvoiceParsingError"
+    assert ok_span["events"] == []
+
+    errors = exporter.metric(ERRORS_METRIC)["sum"]["dataPoints"]
+    assert len(errors) == 1
+    assert errors[0]["asInt"] == "1"
+    assert _attrs(errors[0])["http.route"] == "/invoices/{invoice_id}"
+
+    durations = exporter.metric(DURATION_METRIC)["histogram"]["dataPoints"]
+    assert sorted(_attrs(p)["http.response.status_code"] for p in durations) == ["200", "422"]
+    assert all(p["count"] == "1" for p in durations)
+
+
+def test_file_exporter_writes_otlp_json_lines(tmp_path):
+    """Verifica que el FileExporter escriba un payload OTLP/JSON por línea."""
+    path = tmp_path / "otlp.jsonl"
+    configure_telemetry(file_path=str(path), export_interval_seconds=None)
+    try:
+        client.get("/invoices/bad")
+    finally:
+        shutdown_telemetry()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert "resourceSpans" in lines[0]
+    assert "resourceMetrics" in lines[1]
+
+
+def test_telemetry_disabled_is_passthrough():
+    """Verifica que sin configure_telemetry el middleware y los handlers funcionen igual."""
+    shutdown_telemetry()
+    assert client.get("/invoices/bad").status_code == 422
+
+
+def test_metricas_acotadas_y_delta(exporter):
+    """Verifica que las rutas no resueltas compartan serie, que se respete max_series y que cada flush reinicie."""
+    from exponential_core.telemetry import TelemetryExporter, get_telemetry
+
+    recorder = get_telemetry()
+    recorder.max_series = 2
+    for path in ("/scan/a", "/scan/b", "/scan/c"):
+        assert client.get(path).status_code == 404
+    assert client.get("/invoices/bad").status_code == 422
+    assert client.get("/invoices/F-1").status_code == 200
+    recorder.flush()
+
+    routes = {
+        (_attrs(p)["http.route"], p["count"])
+        for p in exporter.metric(DURATION_METRIC)["histogram"]["dataPoints"]
+    }
+    assert routes == {("<unmatched>", "3"), ("/invoices/{invoice_id}", "1"), ("<overflow>", "1")}
+    assert exporter.metric(DURATION_METRIC)["histogram"]["aggregationTemporality"] == 1
+
+    client.get("/invoices/F-2")
+    recorder.flush()
+    points = exporter.metric(DURATION_METRIC)["histogram"]["dataPoints"]
+    assert [(_attrs(p)["http.route"], p["count"]) for p in points] == [("/invoices/{invoice_id}", "1")]
+
+    with pytest.raises(TypeError):
+        TelemetryExporter()
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from exponential_core.claudeai import InvoiceExtractionSchema
+from exponential_core.utils.money import Money, Percent, parse_decimal, to_decimal
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1.234,56", "1234.56"),
+        ("1 234,56", "1234.56"),
+        ("1,234.56", "1234.56"),
+        ("1'234.56", "1234.56"),
+        ("7,50", "7.50"),
+        ("1.234.567", "1234567"),
+        ("-5,00", "-5.00"),
+        ("5,00-", "-5.00"),
+        ("(5,00)", "-5.00"),
+        ("€ 12,30", "12.30"),
+        ("12,30 EUR", "12.30"),
+        (" 42 ", "42"),
+    ],
+)
+def test_parse_decimal_formatos(text, expected):
+    """Verifica que parse_decimal interprete importes en formato europeo y estadounidense."""
+    assert parse_decimal(text) == Decimal(expected)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "abc", "", "NaN", "Infinity", "1.234,56,7", "1..2", "1.2.3,4", "1,2,3", "12.34.567",
+        "1_000", "_", "1.23,5.6", True, None, float("inf"),
+    ],
+)
+def test_to_decimal_rechaza_valores_invalidos(value):
+    """Verifica que to_decimal lance ValueError con valores no numéricos o no finitos."""
+    with pytest.raises(ValueError):
+        to_decimal(value)
+
+
+def test_money_cuantiza_y_serializa():
+    """Verifica que Money/Percent cuanticen a 2 decimales (HALF_UP) y se serialicen como texto en JSON."""
+
+    class Importe(BaseModel):
+        amount: Money
+        percent: Optional[Percent] = None
+
+    model = Importe(amount="1.234,565", percent=21)
+    assert model.amount == Decimal("1234.57")
+    assert model.percent == Decimal("21.00")
+    assert model.model_dump() == {"amount": Decimal("1234.57"), "percent": Decimal("21.00")}
+    assert model.model_dump_json() == '{"amount":"1234.57","percent":"21.00"}'
+    assert Importe(amount=2.675).amount == Decimal("2.68")
+    assert Importe(amount="5").percent is None
+
+    with pytest.raises(ValidationError):
+        Importe(amount="no es un número")
+
+    schema = Importe.model_json_schema()["properties"]["amount"]
+    assert {"type": "string"} in schema["anyOf"]
+
+
+def test_schemas_factura_aceptan_formato_europeo():
+    """Verifica que los schemas de factura acepten importes con separador de miles europeo."""
+    invoice = InvoiceExtractionSchema.model_validate(
+        {
+            "items": [
+                {"description": "Licencia", "quantity": "1", "unit_price": "1.234,56",
+                 "line_total": "1.234,56", "vat_percent": 21, "vat_amount": "259,26"},
+            ],
+            "totals": {
+                "taxable_base": "1.234,56",
+                "vat_percent": "21",
+                "vat_amount": "259,257",
+                "vat_breakdown": [{"percent": 21, "taxable_base": "1.234,56", "amount": "259,26"}],
+                "grand_total": "1.493,82 €",
+            },
+        }
+    )
+    assert invoice.items[0].line_total == Decimal("1234.56")
+    assert invoice.totals.vat_amount == Decimal("259.26")
+    assert invoice.totals.grand_total == Decimal("1493.82")
+    assert invoice.totals.notes is None